@@ -1,27 +1,18 @@
-from pathlib import Path
-
 from langchain.schema import AIMessage, HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
-
-import config
-
 
-def load_prompt(filename: str) -> str:
-    """Load prompt from prompts directory"""
-    prompt_path = Path(__file__).parent.parent / "prompts" / filename
-    return prompt_path.read_text().strip()
+from lib.context import ContextManager
+from lib.llm import get_chat_model
+from lib.llm_cache import maybe_cached
+from lib.prompts import load_prompt
 
 
 class ConversationAgent:
-    def __init__(self, opik_tracer=None):
-        self.llm = ChatOpenAI(
-            model=config.MODEL_NAME,
-            openai_api_key=config.OPENROUTER_API_KEY,
-            openai_api_base=config.OPENROUTER_BASE_URL,
-            temperature=0.7
-        )
+    def __init__(self, opik_tracer=None, use_cache=None, context=None):
+        llm = get_chat_model("conversation", temperature=0.7)
+        self.llm = maybe_cached(llm, "conversation", use_cache)
         self.system_prompt = load_prompt("v1_conversation_system.txt")
         self.opik_tracer = opik_tracer
+        self.context = context or ContextManager()
 
     def get_opening_message(self) -> str:
         """Extract and return the hardcoded opening question"""
@@ -29,9 +20,18 @@ class ConversationAgent:
 
     def generate_response(self, conversation_history: list, next_prompt: str = None) -> str:
         """Generate next response based on conversation history"""
+        messages = self._build_messages(conversation_history, next_prompt)
+        callbacks = [self.opik_tracer] if self.opik_tracer else []
+        response = self.llm.invoke(messages, config={"callbacks": callbacks})
+        return response.content
+
+    def _build_messages(self, conversation_history: list, next_prompt: str = None) -> list:
         messages = [SystemMessage(content=self.system_prompt)]
 
-        for msg in conversation_history:
+        window = self.context.fit(conversation_history, "conversation")
+        if window.summary:
+            messages.append(SystemMessage(content=window.summary))
+        for msg in window.messages:
             if msg["role"] == "user":
                 messages.append(HumanMessage(content=msg["content"]))
             else:
@@ -39,8 +39,5 @@ class ConversationAgent:
 
         if next_prompt:
             messages.append(HumanMessage(content=f"[INSTRUCTION: {next_prompt}]"))
-
-        callbacks = [self.opik_tracer] if self.opik_tracer else []
-        response = self.llm.invoke(messages, config={"callbacks": callbacks})
-        return response.content
+        return messages
 
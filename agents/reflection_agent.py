@@ -1,64 +1,177 @@
 import json
-from pathlib import Path
+import time
+from typing import Optional
 
 from langchain.schema import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 import config
-from agents import ReflectionOutput
+from agents import IssueConfidence, ReflectionOutput
+from lib.context import ContextManager
+from lib.llm import get_chat_model
+from lib.llm_cache import maybe_cached
+from lib.partial_json import StreamingJSONParser, repair_json
+from lib.prompts import load_prompt
 
+# Reflection fields the flow needs to pick its branch and prompt the router
+ROUTING_FIELDS = {"is_confident", "confident_issues", "uncertain_issues"}
 
-def load_prompt(filename: str) -> str:
-    prompt_path = Path(__file__).parent.parent / "prompts" / filename
-    return prompt_path.read_text().strip()
+
+def _extract_json(raw: str) -> str:
+    # Extract JSON from markdown code blocks if present
+    content = raw.strip()
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0].strip()
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0].strip()
+    return content
+
+
+def _format_messages(messages: list) -> str:
+    return "\n".join([f"{msg['role']}: {msg['content']}" for msg in messages])
 
 
 class ReflectionAgent:
-    def __init__(self, opik_tracer=None):
-        self.llm = ChatOpenAI(
-            model=config.MODEL_NAME,
-            openai_api_key=config.OPENROUTER_API_KEY,
-            openai_api_base=config.OPENROUTER_BASE_URL,
-            temperature=0.3
-        )
+    def __init__(self, opik_tracer=None, use_cache=None, context=None):
+        llm = get_chat_model("reflection", temperature=0.3)
+        self.llm = maybe_cached(llm, "reflection", use_cache)
         self.system_prompt = load_prompt("v1_reflection_system.txt")
+        self.delta_prompt = load_prompt("v2_reflection_delta_system.txt")
         self.opik_tracer = opik_tracer
+        self.context = context or ContextManager()
+        # Mode, latency and prompt size of the most recent call, for per-turn reporting
+        self.last_call_stats = None
 
     def analyze(self, conversation_history: list, turn_count: int) -> ReflectionOutput:
         """Analyze conversation and return reflection output"""
-        conversation_text = "\n".join([
-            f"{msg['role']}: {msg['content']}" for msg in conversation_history
-        ])
+        messages = self._build_messages(conversation_history, turn_count)
+        response = self._invoke("full", messages)
+        return self._parse(response.content, turn_count)
+
+    async def aanalyze(
+        self, conversation_history: list, turn_count: int, on_routing_fields=None
+    ) -> ReflectionOutput:
+        """Async, streaming variant of analyze.
+
+        ``on_routing_fields`` is called with a provisional ReflectionOutput (no
+        issue_details yet) as soon as is_confident, confident_issues and
+        uncertain_issues have been streamed, so the caller can pick its branch
+        and start routing before the rest of the JSON arrives.
+        """
+        messages = self._build_messages(conversation_history, turn_count)
+        watch = None
+        if on_routing_fields:
+            def watch(parser):
+                if ROUTING_FIELDS <= parser.complete_keys:
+                    on_routing_fields(self._coerce(parser.snapshot(), turn_count))
+                    return True
+                return False
+        raw = await self._astream("full", messages, watch)
+        return self._parse(raw, turn_count)
+
+    def analyze_delta(
+        self, previous: ReflectionOutput, new_messages: list, turn_count: int
+    ) -> ReflectionOutput:
+        """Update ``previous`` from the messages added since it was produced"""
+        messages = self._build_delta_messages(previous, new_messages, turn_count)
+        response = self._invoke("delta", messages)
+        return self._merge(previous, response.content, turn_count)
+
+    async def aanalyze_delta(
+        self, previous: ReflectionOutput, new_messages: list, turn_count: int
+    ) -> ReflectionOutput:
+        """Async, streaming variant of analyze_delta"""
+        messages = self._build_delta_messages(previous, new_messages, turn_count)
+        raw = await self._astream("delta", messages)
+        return self._merge(previous, raw, turn_count)
 
+    def _invoke(self, mode: str, messages: list):
+        callbacks = [self.opik_tracer] if self.opik_tracer else []
+        start = time.perf_counter()
+        response = self.llm.invoke(messages, config={"callbacks": callbacks})
+        self._record_stats(mode, messages, getattr(response, "usage_metadata", None), start)
+        return response
+
+    async def _astream(self, mode: str, messages: list, watch=None) -> str:
+        """Stream the reply, feeding an incremental parser; ``watch`` sees it after
+        every chunk until it returns True"""
+        callbacks = [self.opik_tracer] if self.opik_tracer else []
+        start = time.perf_counter()
+        parser = StreamingJSONParser()
+        parts, usage, routing_fields_ms = [], None, None
+        async for chunk in self.llm.astream(messages, config={"callbacks": callbacks}):
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            if not chunk.content:
+                continue
+            parts.append(chunk.content)
+            if watch:
+                parser.feed(chunk.content)
+                if watch(parser):
+                    watch = None
+                    routing_fields_ms = round((time.perf_counter() - start) * 1000, 1)
+        self._record_stats(mode, messages, usage, start)
+        self.last_call_stats["routing_fields_ms"] = routing_fields_ms
+        return "".join(parts)
+
+    def _record_stats(self, mode: str, messages: list, usage, start: float) -> None:
+        usage = usage or {}
+        self.last_call_stats = {
+            "mode": mode,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "prompt_chars": sum(len(m.content) for m in messages),
+            "input_tokens": usage.get("input_tokens"),
+        }
+
+    def _build_messages(self, conversation_history: list, turn_count: int) -> list:
+        window = self.context.fit(conversation_history, "reflection")
+        history = _format_messages(window.messages)
+        if window.summary:
+            history = f"{window.summary}\n\nMost recent messages:\n{history}"
         prompt = f"""Analyze this conversation (Turn {turn_count}/{config.MAX_TURNS}):
 
-{conversation_text}
+{history}
 
 Return a JSON object matching the ReflectionOutput schema."""
 
-        messages = [
+        return [
             SystemMessage(content=self.system_prompt),
             HumanMessage(content=prompt)
         ]
 
-        callbacks = [self.opik_tracer] if self.opik_tracer else []
-        response = self.llm.invoke(messages, config={"callbacks": callbacks})
+    def _build_delta_messages(
+        self, previous: ReflectionOutput, new_messages: list, turn_count: int
+    ) -> list:
+        details = self._details_by_issue(previous)
+        state = "\n".join(
+            f"- {d.issue_name}: {d.confidence_level} signal(s), user_cares={d.user_cares}"
+            for d in details.values()
+        ) or "(no signals yet)"
 
+        prompt = f"""CURRENT STATE (Turn {turn_count}/{config.MAX_TURNS}):
+{state}
+
+NEW MESSAGES:
+{_format_messages(new_messages)}
+
+Return the issue_updates JSON object."""
+
+        return [
+            SystemMessage(content=self.delta_prompt),
+            HumanMessage(content=prompt)
+        ]
+
+    def _parse(self, raw: str, turn_count: int) -> ReflectionOutput:
         # Parse JSON response and validate with Pydantic
         try:
-            # Extract JSON from markdown code blocks if present
-            content = response.content.strip()
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-
-            data = json.loads(content)
-            return ReflectionOutput(**data)
+            return ReflectionOutput(**json.loads(_extract_json(raw)))
         except Exception as e:
+            data = repair_json(raw)
+            if isinstance(data, dict) and data:
+                # Salvage what the model did produce instead of starting over
+                print(f"Warning: Repaired malformed reflection output: {e}")
+                return self._coerce(data, turn_count)
             # Fallback if parsing fails
             print(f"Warning: Failed to parse reflection output: {e}")
-            print(f"Raw response: {response.content[:500]}")
+            print(f"Raw response: {raw[:500]}")
             return ReflectionOutput(
                 is_confident=False,
                 turn_count=turn_count,
@@ -67,3 +180,89 @@ Return a JSON object matching the ReflectionOutput schema."""
                 issue_details=[]
             )
 
+    def _coerce(self, data: dict, turn_count: int) -> ReflectionOutput:
+        """ReflectionOutput from partial or loosely typed fields, dropping bad entries"""
+        confident = [i for i in data.get("confident_issues") or [] if isinstance(i, str)]
+        uncertain = data.get("uncertain_issues")
+        if not isinstance(uncertain, list):
+            uncertain = [issue for issue in config.ISSUES if issue not in confident]
+        details = []
+        for item in data.get("issue_details") or []:
+            try:
+                details.append(IssueConfidence(**item))
+            except Exception:
+                continue
+        reported_turn = data.get("turn_count")
+        return ReflectionOutput(
+            is_confident=bool(data.get("is_confident", False)),
+            turn_count=reported_turn if isinstance(reported_turn, int) else turn_count,
+            confident_issues=confident,
+            uncertain_issues=[i for i in uncertain if isinstance(i, str)],
+            issue_details=details,
+        )
+
+    def _merge(self, previous: ReflectionOutput, raw: str, turn_count: int) -> ReflectionOutput:
+        """Apply the model's issue_updates to the previous state"""
+        data = repair_json(raw)
+        if not isinstance(data, dict):
+            # Keep the previous state rather than losing every signal seen so far
+            print("Warning: Failed to parse reflection delta")
+            print(f"Raw response: {raw[:500]}")
+            data = {}
+        updates = []
+        for item in data.get("issue_updates") or []:
+            try:
+                updates.append(IssueConfidence(**item))
+            except Exception:
+                continue
+        return self.apply_updates(previous, updates, turn_count)
+
+    def apply_updates(
+        self, previous: Optional[ReflectionOutput], updates: list, turn_count: int
+    ) -> ReflectionOutput:
+        """Merge per-issue updates into ``previous`` (or an empty state)"""
+        details = self._details_by_issue(previous) if previous else {}
+        for update in updates:
+            if update.issue_name in config.ISSUES:
+                details[update.issue_name] = update
+
+        confident = [
+            issue for issue in config.ISSUES
+            if issue in details
+            and details[issue].user_cares
+            and details[issue].confidence_level >= config.SIGNALS_PER_ISSUE
+        ]
+        return ReflectionOutput(
+            is_confident=turn_count >= config.MIN_TURNS_FOR_CONFIDENCE and bool(confident),
+            turn_count=turn_count,
+            confident_issues=confident,
+            uncertain_issues=[issue for issue in config.ISSUES if issue not in confident],
+            issue_details=[details[issue] for issue in config.ISSUES if issue in details],
+        )
+
+    def apply_signals(
+        self, previous: Optional[ReflectionOutput], issues: list, turn_count: int
+    ) -> ReflectionOutput:
+        """Add one clear signal to each of ``issues`` without calling the model"""
+        details = self._details_by_issue(previous) if previous else {}
+        updates = [
+            IssueConfidence(
+                issue_name=issue,
+                confidence_level=(details[issue].confidence_level if issue in details else 0) + 1,
+                user_cares=True,
+            )
+            for issue in issues
+        ]
+        return self.apply_updates(previous, updates, turn_count)
+
+    def _details_by_issue(self, reflection: ReflectionOutput) -> dict:
+        """Issue details keyed by name, backfilling confident issues the model left out"""
+        details = {d.issue_name: d for d in reflection.issue_details}
+        for issue in reflection.confident_issues:
+            if issue not in details:
+                details[issue] = IssueConfidence(
+                    issue_name=issue,
+                    confidence_level=config.SIGNALS_PER_ISSUE,
+                    user_cares=True,
+                )
+        return details
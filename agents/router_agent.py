@@ -1,30 +1,40 @@
-from pathlib import Path
-
 from langchain.schema import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
-import config
 from agents import ReflectionOutput
-
-
-def load_prompt(filename: str) -> str:
-    prompt_path = Path(__file__).parent.parent / "prompts" / filename
-    return prompt_path.read_text().strip()
+from lib.context import ContextManager
+from lib.llm import get_chat_model
+from lib.llm_cache import maybe_cached
+from lib.prompts import load_prompt
 
 
 class RouterAgent:
-    def __init__(self, opik_tracer=None):
-        self.llm = ChatOpenAI(
-            model=config.MODEL_NAME,
-            openai_api_key=config.OPENROUTER_API_KEY,
-            openai_api_base=config.OPENROUTER_BASE_URL,
-            temperature=0.7
-        )
+    def __init__(self, opik_tracer=None, use_cache=None, context=None):
+        llm = get_chat_model("router", temperature=0.7)
+        self.llm = maybe_cached(llm, "router", use_cache)
         self.system_prompt = load_prompt("v1_router_system.txt")
         self.opik_tracer = opik_tracer
+        self.context = context or ContextManager()
 
     def route_streaming(self, reflection: ReflectionOutput, conversation_history: list):
         """Decide next action and yield streaming message for user"""
+        messages = self._build_messages(reflection, conversation_history)
+        callbacks = [self.opik_tracer] if self.opik_tracer else []
+
+        # Use streaming
+        for chunk in self.llm.stream(messages, config={"callbacks": callbacks}):
+            if hasattr(chunk, 'content') and chunk.content:
+                yield chunk.content
+
+    async def aroute_streaming(self, reflection: ReflectionOutput, conversation_history: list):
+        """Async variant of route_streaming"""
+        messages = self._build_messages(reflection, conversation_history)
+        callbacks = [self.opik_tracer] if self.opik_tracer else []
+
+        async for chunk in self.llm.astream(messages, config={"callbacks": callbacks}):
+            if hasattr(chunk, 'content') and chunk.content:
+                yield chunk.content
+
+    def _build_messages(self, reflection: ReflectionOutput, conversation_history: list) -> list:
         reflection_summary = f"""
 is_confident: {reflection.is_confident}
 turn_count: {reflection.turn_count}
@@ -41,18 +51,13 @@ And this conversation history:
 
 What should we do next? Generate the appropriate message."""
 
-        messages = [
+        return [
             SystemMessage(content=self.system_prompt),
             HumanMessage(content=prompt)
         ]
 
-        callbacks = [self.opik_tracer] if self.opik_tracer else []
-        
-        # Use streaming
-        for chunk in self.llm.stream(messages, config={"callbacks": callbacks}):
-            if hasattr(chunk, 'content') and chunk.content:
-                yield chunk.content
-
     def _format_history(self, history: list) -> str:
-        return "\n".join([f"{msg['role']}: {msg['content']}" for msg in history[-4:]])
+        window = self.context.fit(history, "router")
+        lines = [f"{msg['role']}: {msg['content']}" for msg in window.messages]
+        return "\n".join([window.summary, *lines] if window.summary else lines)
 
@@ -0,0 +1,284 @@
+"""Headless chat API: ConversationFlow over HTTP, with replies streamed as SSE.
+
+A plain ASGI application with no web framework; serve it with any ASGI server:
+
+    uv run --with uvicorn uvicorn api.server:app --port 8000
+
+Endpoints:
+
+    POST /sessions                      -> 201 {"thread_id", "message"} (opening question)
+    POST /sessions/{thread_id}/turns    {"message": "..."} -> text/event-stream
+    GET  /sessions/{thread_id}          -> {"thread_id", "turn_count", "messages", ...}
+    GET  /health                        -> {"status", "sessions", "trace_export"}
+
+A turn streams ``token`` events ({"text": ...}) with the router's output,
+coalesced like the Streamlit UI's (STREAM_RENDER_INTERVAL_MS), followed by a
+single ``done`` event carrying the turn's reflection. If the turn fails
+midway, an ``error`` event ({"detail": ...}) ends the stream instead and the
+session is left as it was before the message. Everything runs on
+the server's event loop with async LLM calls, so an open session costs only its
+ConversationFlow and history. Idle sessions are dropped from memory and
+resumed from their checkpoint (lib/checkpoints.py) when they come back.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+import uuid
+
+import config
+from lib.checkpoints import get_checkpoint_store
+from lib.prompts import preload_prompts
+from lib.streaming import acoalesce_chunks
+from lib.telemetry import get_trace_exporter
+from workflows.conversation_flow import ConversationFlow
+
+logger = logging.getLogger(__name__)
+
+_TURNS_PATH = re.compile(r"^/sessions/([0-9A-Za-z-]+)/turns$")
+_SESSION_PATH = re.compile(r"^/sessions/([0-9A-Za-z-]+)$")
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+class Session:
+    def __init__(self, flow: ConversationFlow, messages: list, turn_count: int = 0,
+                 conversation_complete: bool = False):
+        self.flow = flow
+        self.messages = messages
+        self.turn_count = turn_count
+        self.conversation_complete = conversation_complete
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+    def state(self) -> dict:
+        reflection = self.flow.last_reflection
+        return {
+            "thread_id": self.flow.thread_id,
+            "turn_count": self.turn_count,
+            "conversation_complete": self.conversation_complete,
+            "messages": self.messages,
+            "reflection": reflection.model_dump() if reflection else None,
+        }
+
+
+class ChatAPI:
+    """ASGI app holding open sessions in memory, keyed by thread_id"""
+
+    def __init__(self, checkpoints=None, idle_timeout: float = None):
+        self.sessions = {}
+        self.checkpoints = checkpoints
+        if idle_timeout is None:
+            idle_timeout = config.API_SESSION_IDLE_TIMEOUT_S
+        self.idle_timeout = idle_timeout
+        self._last_sweep = time.monotonic()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        try:
+            await self._route(scope, receive, send)
+        except HTTPError as e:
+            await _send_json(send, e.status, {"detail": e.detail})
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                preload_prompts()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self.checkpoints:
+                    self.checkpoints.flush()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _route(self, scope, receive, send) -> None:
+        method, path = scope["method"], scope["path"]
+        if path == "/health":
+            _require(method, "GET")
+            await _send_json(send, 200, {
+                "status": "ok",
+                "sessions": len(self.sessions),
+                "trace_export": get_trace_exporter().metrics(),
+            })
+        elif path == "/sessions":
+            _require(method, "POST")
+            await _send_json(send, 201, self._create_session())
+        elif match := _TURNS_PATH.match(path):
+            _require(method, "POST")
+            body = await _read_json(receive)
+            message = body.get("message") if isinstance(body, dict) else None
+            if not isinstance(message, str) or not message.strip():
+                raise HTTPError(400, 'Body must be {"message": "<non-empty string>"}')
+            await self._stream_turn(self._session(match.group(1)), message, receive, send)
+        elif match := _SESSION_PATH.match(path):
+            _require(method, "GET")
+            await _send_json(send, 200, self._session(match.group(1)).state())
+        else:
+            raise HTTPError(404, "Not found")
+
+    def _create_session(self) -> dict:
+        self._sweep()
+        thread_id = str(uuid.uuid4())
+        flow = ConversationFlow(thread_id=thread_id)
+        opening = flow.get_opening_message()
+        session = Session(flow, [{"role": "assistant", "content": opening}])
+        self.sessions[thread_id] = session
+        if self.checkpoints:
+            self.checkpoints.save(flow.checkpoint(session.messages, 0))
+        return {"thread_id": thread_id, "message": opening}
+
+    def _session(self, thread_id: str) -> Session:
+        self._sweep()
+        session = self.sessions.get(thread_id)
+        if session is None:
+            checkpoint = self.checkpoints.load(thread_id) if self.checkpoints else None
+            if checkpoint is None:
+                raise HTTPError(404, "Unknown session")
+            flow = ConversationFlow(thread_id=thread_id)
+            flow.restore(checkpoint)
+            session = Session(flow, list(checkpoint.messages), checkpoint.turn_count,
+                              checkpoint.conversation_complete)
+            self.sessions[thread_id] = session
+        session.last_used = time.monotonic()
+        return session
+
+    def _sweep(self) -> None:
+        """Drop sessions idle past the timeout; they resume from checkpoints"""
+        now = time.monotonic()
+        if now - self._last_sweep < min(self.idle_timeout, 60):
+            return
+        self._last_sweep = now
+        for thread_id, session in list(self.sessions.items()):
+            if now - session.last_used > self.idle_timeout and not session.lock.locked():
+                del self.sessions[thread_id]
+
+    async def _stream_turn(self, session: Session, message: str, receive, send) -> None:
+        if session.conversation_complete:
+            raise HTTPError(409, "Conversation is complete")
+        if session.lock.locked():
+            raise HTTPError(409, "A turn is already in progress for this session")
+
+        async with session.lock:
+            before = session.flow.checkpoint(session.messages, session.turn_count)
+            history = [*session.messages, {"role": "user", "content": message}]
+            turn_count = session.turn_count + 1
+            disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+            turns = session.flow.aprocess_turn_streaming(history, turn_count)
+            results = acoalesce_chunks(
+                turns,
+                interval=config.STREAM_RENDER_INTERVAL_MS / 1000,
+                max_chars=config.STREAM_RENDER_MAX_CHARS,
+            )
+            reply = ""
+            completed = False
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            })
+            try:
+                async for result in results:
+                    if disconnected.done():
+                        break
+                    if not result["is_complete"]:
+                        if result["message_chunk"]:
+                            reply += result["message_chunk"]
+                            await send(_event("token", {"text": result["message_chunk"]}))
+                        continue
+                    closing = result["message_chunk"] if result["is_closing"] else None
+                    completed = True
+                    # The closing summary arrives whole instead of as router tokens
+                    session.messages = [
+                        *history, {"role": "assistant", "content": closing or reply},
+                    ]
+                    session.turn_count = turn_count
+                    session.conversation_complete = result["is_closing"]
+                    if self.checkpoints:
+                        self.checkpoints.save(session.flow.checkpoint(
+                            session.messages, session.turn_count,
+                            session.conversation_complete,
+                        ))
+                    await send(_event("done", {
+                        "turn_count": turn_count,
+                        "conversation_complete": session.conversation_complete,
+                        "closing_message": closing,
+                        "reflection": result["reflection"].model_dump(),
+                    }))
+                    break
+            except Exception:
+                # Headers are already sent, so the failure goes out as an event
+                # and the stream still ends normally
+                logger.exception("Turn failed for session %s", session.flow.thread_id)
+                await send(_event("error", {"detail": "Turn failed; send the message again"}))
+            finally:
+                await results.aclose()
+                await turns.aclose()
+                disconnected.cancel()
+                if not completed:
+                    # Roll back, so an abandoned turn leaves no partial state
+                    session.flow.restore(before)
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def _require(method: str, expected: str) -> None:
+    if method != expected:
+        raise HTTPError(405, "Method not allowed")
+
+
+def _event(name: str, data: dict) -> dict:
+    payload = f"event: {name}\ndata: {json.dumps(data)}\n\n".encode()
+    return {"type": "http.response.body", "body": payload, "more_body": True}
+
+
+async def _read_json(receive):
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HTTPError(400, "Client disconnected")
+        body += message.get("body", b"")
+        if len(body) > config.API_MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+        if not message.get("more_body"):
+            break
+    try:
+        return json.loads(body or b"null")
+    except ValueError:
+        raise HTTPError(400, "Body must be JSON") from None
+
+
+async def _wait_for_disconnect(receive) -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _send_json(send, status: int, data: dict) -> None:
+    body = json.dumps(data).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+app = ChatAPI(checkpoints=get_checkpoint_store() if config.CHECKPOINTS else None)
@@ -3,29 +3,47 @@ import uuid
 import streamlit as st
 
 import config
+from lib.checkpoints import get_checkpoint_store
+from lib.prompts import preload_prompts
+from lib.streaming import coalesce_chunks
 from lib.telemetry import init_opik_tracer
 from workflows.conversation_flow import ConversationFlow
 
 st.set_page_config(page_title="Issue Discovery Chatbot", page_icon="💬")
 
+# Cached per process; later reruns and sessions reuse the loaded prompts
+preload_prompts()
+
+# Shared by every app process pointed at the same CHECKPOINT_PATH
+checkpoints = get_checkpoint_store() if config.CHECKPOINTS else None
+
 # Initialize session state
 if 'messages' not in st.session_state:
     st.session_state.messages = []
 if 'turn_count' not in st.session_state:
     st.session_state.turn_count = 0
 if 'thread_id' not in st.session_state:
-    # Generate unique thread_id for this conversation session
-    st.session_state.thread_id = str(uuid.uuid4())
+    # Resume the thread named in the URL, or generate a unique thread_id for this
+    # conversation session. The URL keeps it across reloads and app processes.
+    st.session_state.thread_id = st.query_params.get("thread_id") or str(uuid.uuid4())
+    st.query_params["thread_id"] = st.session_state.thread_id
+if 'conversation_complete' not in st.session_state:
+    st.session_state.conversation_complete = False
+if 'last_reflection' not in st.session_state:
+    st.session_state.last_reflection = None
 if 'conversation_flow' not in st.session_state:
     opik_tracer = init_opik_tracer()
     st.session_state.conversation_flow = ConversationFlow(
         opik_tracer,
         thread_id=st.session_state.thread_id
     )
-if 'conversation_complete' not in st.session_state:
-    st.session_state.conversation_complete = False
-if 'last_reflection' not in st.session_state:
-    st.session_state.last_reflection = None
+    checkpoint = checkpoints.load(st.session_state.thread_id) if checkpoints else None
+    if checkpoint:
+        st.session_state.conversation_flow.restore(checkpoint)
+        st.session_state.messages = list(checkpoint.messages)
+        st.session_state.turn_count = checkpoint.turn_count
+        st.session_state.last_reflection = checkpoint.last_reflection
+        st.session_state.conversation_complete = checkpoint.conversation_complete
 
 # Sidebar
 with st.sidebar:
@@ -33,6 +51,7 @@ with st.sidebar:
     if st.button("Start Over"):
         for key in list(st.session_state.keys()):
             del st.session_state[key]
+        st.query_params.clear()
         st.rerun()
 
     st.divider()
@@ -43,6 +62,11 @@ with st.sidebar:
     st.caption("📊 Conversation Thread")
     st.code(st.session_state.thread_id, language=None)
     st.caption("Use this ID to find traces in Opik")
+    trace_metrics = st.session_state.conversation_flow.trace_exporter.metrics()
+    st.caption(
+        f"Trace export: {trace_metrics['queue_depth']} queued, "
+        f"{trace_metrics['dropped']} dropped"
+    )
 
     # Real-time issue detection visualization
     st.divider()
@@ -140,33 +164,36 @@ if not st.session_state.conversation_complete:
         # Increment turn
         st.session_state.turn_count += 1
 
-        # Process turn with streaming
-        message_placeholder = st.empty()
+        # Process turn with streaming. The reply is written into one markdown
+        # element; chunks are coalesced so it re-renders at a bounded rate rather
+        # than once per token.
+        with st.chat_message("assistant"):
+            message_placeholder = st.empty()
         full_message = ""
         
         with st.spinner("Thinking..."):
-            for result in st.session_state.conversation_flow.process_turn_streaming(
-                st.session_state.messages,
-                st.session_state.turn_count
-            ):
-                # Store reflection for visualization
-                st.session_state.last_reflection = result['reflection']
-                
+            results = coalesce_chunks(
+                st.session_state.conversation_flow.process_turn_streaming(
+                    st.session_state.messages,
+                    st.session_state.turn_count
+                ),
+                interval=config.STREAM_RENDER_INTERVAL_MS / 1000,
+                max_chars=config.STREAM_RENDER_MAX_CHARS,
+            )
+            for result in results:
                 # Accumulate message chunks
                 if result['message_chunk']:
                     full_message += result['message_chunk']
-                    
-                    # Display streaming message
-                    with message_placeholder.container():
-                        with st.chat_message("assistant"):
-                            st.markdown(full_message + "▌")  # Cursor effect
+                    if not result['is_complete']:
+                        message_placeholder.markdown(full_message + "▌")  # Cursor effect
                 
                 # If complete, finalize the message
                 if result['is_complete']:
+                    # Store reflection for visualization (sent once per turn)
+                    st.session_state.last_reflection = result['reflection']
+
                     # Remove cursor and add final message
-                    with message_placeholder.container():
-                        with st.chat_message("assistant"):
-                            st.markdown(full_message)
+                    message_placeholder.markdown(full_message)
                     
                     # Add to conversation history
                     st.session_state.messages.append({
@@ -177,6 +204,14 @@ if not st.session_state.conversation_complete:
                     # Check if conversation is complete
                     if st.session_state.turn_count >= config.MAX_TURNS:
                         st.session_state.conversation_complete = True
+
+                    # Persist the turn (written to disk in the background)
+                    if checkpoints:
+                        checkpoints.save(st.session_state.conversation_flow.checkpoint(
+                            st.session_state.messages,
+                            st.session_state.turn_count,
+                            st.session_state.conversation_complete,
+                        ))
                     
                     break
 
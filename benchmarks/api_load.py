@@ -0,0 +1,227 @@
+"""Load test of the headless chat API (api/server.py) against the fake LLM.
+
+Starts the API under uvicorn in a subprocess with LLM_BACKEND=fake, then opens
+``--sessions`` sessions at once and runs ``--turns`` turns of each through the SSE
+turn endpoint (a full conversation by default). Every session must run all its
+turns, and only turn MAX_TURNS may close the conversation. Reports time to first token, turn latency, completed sessions
+per second and the server's resident memory at peak.
+
+Run from the repository root:
+
+    uv run --with uvicorn python -m benchmarks.api_load [--sessions 2000] [--turns 5]
+
+Pass ``--url`` to load an already running server instead.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+import config
+
+USER_REPLIES = [
+    "Rent and groceries keep going up and my paycheck doesn't.",
+    "My mom can barely afford her prescriptions anymore.",
+    "It feels like Congress just fights instead of fixing anything.",
+    "There have been a lot of break-ins in my neighborhood.",
+    "Honestly I think money in politics is the root of it all.",
+]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, latency_ms: float) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "LLM_BACKEND": "fake",
+        "FAKE_LLM_LATENCY_MS": str(latency_ms),
+        "OPIK_TRACK_DISABLE": "true",
+        "CHECKPOINT_PATH": os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite3"),
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.server:app", "--port", str(port),
+         "--log-level", "warning", "--backlog", "4096", "--timeout-keep-alive", "600"],
+        env=env,
+    )
+
+
+def cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+class Connection:
+    """Minimal keep-alive HTTP/1.1 client, so the load generator stays cheaper than the
+    server it measures (this and the server may share a core)"""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method: str, path: str, body: dict = None):
+        """Send a request; yields the response body as it arrives"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        data = json.dumps(body).encode() if body is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode()
+            + data
+        )
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) != b"\r\n":
+            name, value = line.decode().split(":", 1)
+            headers[name.lower()] = value.strip()
+        if status >= 400:
+            raise RuntimeError(f"{method} {path} -> {status}")
+        if "content-length" in headers:
+            yield await self.reader.readexactly(int(headers["content-length"]))
+            return
+        while size := int((await self.reader.readline()).strip(), 16):  # chunked
+            yield await self.reader.readexactly(size)
+            await self.reader.readexactly(2)
+        await self.reader.readexactly(2)
+
+    async def json(self, method: str, path: str):
+        return json.loads(b"".join([part async for part in self.request(method, path)]))
+
+    def close(self) -> None:
+        if self.writer:
+            self.writer.close()
+
+
+async def run_session(host: str, port: int, turns: int, ttfts: list, latencies: list,
+                      started: asyncio.Event, ready: list, total: int) -> None:
+    conn = Connection(host, port)
+    thread_id = (await conn.json("POST", "/sessions"))["thread_id"]
+    ready.append(thread_id)
+    if len(ready) == total:
+        started.set()
+    await started.wait()  # every session is open before any turn starts
+    try:
+        for turn in range(turns):
+            body = {"message": USER_REPLIES[turn % len(USER_REPLIES)]}
+            start = time.perf_counter()
+            ttft = None
+            stream = b""
+            async for part in conn.request("POST", f"/sessions/{thread_id}/turns", body):
+                if ttft is None:
+                    ttft = time.perf_counter() - start
+                stream += part
+            latencies.append(time.perf_counter() - start)
+            ttfts.append(ttft)
+            done = json.loads(stream.rsplit(b"event: done\ndata: ", 1)[1])
+            if done["conversation_complete"] != (turn + 1 == config.MAX_TURNS):
+                raise RuntimeError(
+                    f"session {thread_id}: conversation_complete="
+                    f"{done['conversation_complete']} after turn {turn + 1}"
+                )
+    finally:
+        conn.close()
+
+
+def percentiles(values: list) -> str:
+    ms = sorted(v * 1000 for v in values)
+    q = statistics.quantiles(ms, n=100)
+    return f"p50 {q[49]:7.0f} ms   p95 {q[94]:7.0f} ms   max {ms[-1]:7.0f} ms"
+
+
+async def load(url: str, sessions: int, turns: int, pid) -> None:
+    host, port = urlsplit(url).hostname, urlsplit(url).port or 80
+    ttfts, latencies, ready = [], [], []
+    started = asyncio.Event()
+    peak = [0.0]
+
+    async def watch_memory():
+        while pid:
+            peak[0] = max(peak[0], rss_mb(pid))
+            await asyncio.sleep(0.2)
+
+    watcher = asyncio.create_task(watch_memory())
+    server_cpu = cpu_seconds(pid) if pid else None
+    client_cpu = time.process_time()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_session(host, port, turns, ttfts, latencies, started, ready, sessions)
+        for _ in range(sessions)
+    ))
+    elapsed = time.perf_counter() - start
+    client_cpu = time.process_time() - client_cpu
+    if pid:
+        server_cpu = cpu_seconds(pid) - server_cpu
+    watcher.cancel()
+    conn = Connection(host, port)
+    health = await conn.json("GET", "/health")
+    conn.close()
+
+    assert len(latencies) == sessions * turns, f"{len(latencies)} of {sessions * turns} turns ran"
+    print(f"sessions: {sessions} open at once, {turns} turns each, {elapsed:.1f} s")
+    print(f"time to first token  {percentiles([t for t in ttfts if t is not None])}")
+    print(f"turn latency         {percentiles(latencies)}")
+    print(f"throughput           {sessions / elapsed:.1f} sessions/s, "
+          f"{len(latencies) / elapsed:.1f} turns/s")
+    print(f"client CPU           {client_cpu / elapsed:.0%} of one core")
+    if pid:
+        print(f"server CPU           {server_cpu / elapsed:.0%} of one core, "
+              f"{server_cpu / len(latencies) * 1000:.1f} ms per turn")
+        print(f"server RSS peak      {peak[0]:.0f} MB "
+              f"({peak[0] * 1024 / sessions:.0f} KB per open session, upper bound)")
+    print(f"server sessions held {health['sessions']}, "
+          f"trace export dropped {health['trace_export']['dropped']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=300, help="fake LLM latency")
+    parser.add_argument("--url", help="load this server instead of starting one")
+    args = parser.parse_args()
+    if not 1 <= args.turns <= config.MAX_TURNS:
+        parser.error(f"--turns must be between 1 and MAX_TURNS ({config.MAX_TURNS})")
+
+    server = None
+    url = args.url
+    if url is None:
+        port = _free_port()
+        server = start_server(port, args.latency_ms)
+        url = f"http://127.0.0.1:{port}"
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(f"{url}/health", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.1)
+    try:
+        asyncio.run(load(url, args.sessions, args.turns, server.pid if server else None))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
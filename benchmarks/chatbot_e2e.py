@@ -0,0 +1,91 @@
+"""End-to-end ConversationFlow latency and throughput against the fake LLM.
+
+Runs many full conversations (config.MAX_TURNS turns each) concurrently on one
+event loop, with every agent served by lib/fake_llm.py, and reports
+time-to-first-token, per-turn latency and completed sessions per second.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.chatbot_e2e [--sessions 200] [--concurrency 50]
+
+Fake model timing comes from FAKE_LLM_LATENCY_MS and FAKE_LLM_TOKENS_PER_SECOND.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ["LLM_BACKEND"] = "fake"
+os.environ.setdefault("OPIK_TRACK_DISABLE", "true")
+
+import config  # noqa: E402
+from workflows.conversation_flow import ConversationFlow  # noqa: E402
+
+USER_REPLIES = [
+    "Rent and groceries keep going up and my paycheck doesn't.",
+    "My mom can barely afford her prescriptions anymore.",
+    "It feels like Congress just fights instead of fixing anything.",
+    "There have been a lot of break-ins in my neighborhood.",
+    "Honestly I think money in politics is the root of it all.",
+]
+
+
+async def run_session(ttfts: list, turn_latencies: list) -> None:
+    flow = ConversationFlow()
+    history = [{"role": "assistant", "content": flow.get_opening_message()}]
+    for turn in range(1, config.MAX_TURNS + 1):
+        history.append({"role": "user", "content": USER_REPLIES[(turn - 1) % len(USER_REPLIES)]})
+        start = time.perf_counter()
+        ttft = None
+        reply = ""
+        async for result in flow.aprocess_turn_streaming(history, turn):
+            if ttft is None and result["message_chunk"]:
+                ttft = time.perf_counter() - start
+            reply += result["message_chunk"]
+            if result["is_complete"]:
+                break
+        turn_latencies.append(time.perf_counter() - start)
+        ttfts.append(ttft)
+        history.append({"role": "assistant", "content": reply})
+        if result["is_closing"]:
+            break
+
+
+async def run(sessions: int, concurrency: int):
+    ttfts, turn_latencies = [], []
+    limit = asyncio.Semaphore(concurrency)
+
+    async def bounded():
+        async with limit:
+            await run_session(ttfts, turn_latencies)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded() for _ in range(sessions)))
+    return ttfts, turn_latencies, time.perf_counter() - start
+
+
+def percentiles(values: list) -> str:
+    ms = sorted(v * 1000 for v in values)
+    q = statistics.quantiles(ms, n=100)
+    return f"p50 {q[49]:7.0f} ms   p95 {q[94]:7.0f} ms   max {ms[-1]:7.0f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    ttfts, turn_latencies, elapsed = asyncio.run(run(args.sessions, args.concurrency))
+    print(f"fake LLM: {config.FAKE_LLM_LATENCY_MS:.0f} ms latency, "
+          f"{config.FAKE_LLM_TOKENS_PER_SECOND:.0f} tokens/s")
+    print(f"sessions: {args.sessions} (concurrency {args.concurrency}), turns: {len(ttfts)}")
+    print(f"time to first token  {percentiles(ttfts)}")
+    print(f"turn latency         {percentiles(turn_latencies)}")
+    print(f"throughput           {args.sessions / elapsed:.1f} sessions/s")
+
+
+if __name__ == "__main__":
+    main()
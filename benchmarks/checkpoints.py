@@ -0,0 +1,86 @@
+"""Cost of write-behind checkpointing on the request path and of resuming a thread.
+
+Saves a five-turn checkpoint for each of ``--threads`` conversations, then
+resumes random threads from other processes sharing the same SQLite file, as
+app processes behind a load balancer would.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.checkpoints [--threads 5000] [--path /tmp/ckpt.sqlite3]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from agents import IssueConfidence, ReflectionOutput
+from lib.checkpoints import Checkpoint, CheckpointStore
+
+MESSAGES = [
+    {"role": "assistant" if i % 2 == 0 else "user",
+     "content": "Rent and groceries keep going up and my paycheck doesn't. " * 3}
+    for i in range(11)
+]
+REFLECTION = ReflectionOutput(
+    is_confident=True, turn_count=5, confident_issues=["Cost of living", "Inflation"],
+    uncertain_issues=[],
+    issue_details=[
+        IssueConfidence(issue_name="Cost of living", confidence_level=2, user_cares=True),
+        IssueConfidence(issue_name="Inflation", confidence_level=1, user_cares=True),
+    ],
+)
+
+
+def microseconds(values: list) -> str:
+    us = sorted(v * 1e6 for v in values)
+    return f"p50 {statistics.median(us):7.1f} us   p99 {us[int(0.99 * (len(us) - 1))]:7.1f} us"
+
+
+def resume(path: str, thread_ids: list) -> list:
+    """Load each thread from a fresh store in this (separate) process"""
+    store = CheckpointStore(path)
+    timings = []
+    for thread_id in thread_ids:
+        start = time.perf_counter()
+        checkpoint = store.load(thread_id)
+        timings.append(time.perf_counter() - start)
+        assert checkpoint.last_reflection == REFLECTION
+    store.close()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=5000)
+    parser.add_argument("--path", default=os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite3"))
+    args = parser.parse_args()
+
+    store = CheckpointStore(args.path)
+    thread_ids = [f"thread-{i}" for i in range(args.threads)]
+    saves = []
+    for thread_id in thread_ids:
+        checkpoint = Checkpoint(thread_id, MESSAGES, 5, REFLECTION, reflected_upto=11)
+        start = time.perf_counter()
+        store.save(checkpoint)
+        saves.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    store.flush(timeout=60)
+    drain = time.perf_counter() - start
+    store.close()
+    print(f"save (request path)       {microseconds(saves)}")
+    print(f"background write          {args.threads} checkpoints drained {drain * 1000:.0f} ms "
+          f"after the last save")
+
+    sample = random.sample(thread_ids, min(1000, args.threads))
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        timings = [t for part in pool.map(resume, [args.path] * 2, [sample[::2], sample[1::2]])
+                   for t in part]
+    print(f"resume in another process {microseconds(timings)}")
+
+
+if __name__ == "__main__":
+    main()
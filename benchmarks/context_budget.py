@@ -0,0 +1,95 @@
+"""Prompt size per agent as a conversation grows, with and without token budgets.
+
+Builds each agent's prompt for every turn of a long synthetic conversation
+(well past config.MAX_TURNS) and reports its estimated tokens, once with the
+budgets from config.CONTEXT_BUDGETS and once with budgets disabled (the full
+history). No model is called.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.context_budget [--turns 40]
+"""
+
+import argparse
+import os
+import time
+
+os.environ["LLM_BACKEND"] = "fake"
+os.environ.setdefault("OPIK_TRACK_DISABLE", "true")
+
+from agents import ReflectionOutput  # noqa: E402
+from agents.conversation_agent import ConversationAgent  # noqa: E402
+from agents.reflection_agent import ReflectionAgent  # noqa: E402
+from agents.router_agent import RouterAgent  # noqa: E402
+from lib.context import ContextManager, count_tokens  # noqa: E402
+
+ASSISTANT_TURN = (
+    "Thanks, that helps. When you think about how that plays out for your family, what "
+    "part of it worries you the most right now?"
+)
+USER_TURNS = [
+    "Honestly it's the grocery bill. Every week the same cart costs more and my paycheck "
+    "hasn't moved in two years, so we've started skipping things we used to buy.",
+    "My dad's insulin went up again and his insurance keeps finding reasons not to cover "
+    "the brand his doctor wants him on. It's exhausting to fight with them every month.",
+    "And then Congress can't even agree to keep the lights on. Every few months there's "
+    "another shutdown threat while regular people wait to see if they get paid.",
+]
+REFLECTION = ReflectionOutput(
+    is_confident=False, turn_count=1, confident_issues=["Inflation"],
+    uncertain_issues=["Health care affordability"], issue_details=[],
+)
+REPORT_TURNS = (1, 5, 10, 20, 40, 80)
+
+
+def prompt_tokens(messages) -> int:
+    return sum(count_tokens(m.content) for m in messages)
+
+
+def run(turns: int, budgets) -> dict:
+    context = ContextManager(budgets=budgets)
+    agents = {
+        "conversation": ConversationAgent(context=context),
+        "reflection": ReflectionAgent(context=context),
+        "router": RouterAgent(context=context),
+    }
+    history = [{"role": "assistant", "content": ASSISTANT_TURN}]
+    sizes = {name: {} for name in agents}
+    build_s = 0.0
+    for turn in range(1, turns + 1):
+        history.append({"role": "user", "content": USER_TURNS[(turn - 1) % len(USER_TURNS)]})
+        start = time.perf_counter()
+        prompts = {
+            "conversation": agents["conversation"]._build_messages(history),
+            "reflection": agents["reflection"]._build_messages(history, turn),
+            "router": agents["router"]._build_messages(REFLECTION, history),
+        }
+        build_s += time.perf_counter() - start
+        for name, messages in prompts.items():
+            sizes[name][turn] = prompt_tokens(messages)
+        history.append({"role": "assistant", "content": ASSISTANT_TURN})
+    return {"sizes": sizes, "build_ms_per_turn": build_s / turns * 1000}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=40)
+    args = parser.parse_args()
+
+    budgeted = run(args.turns, None)
+    unbounded = run(args.turns, {})
+    turns = [t for t in REPORT_TURNS if t <= args.turns]
+    print("estimated prompt tokens, budgeted / full history")
+    print(f"{'turn':>4} " + " ".join(f"{name:>21}" for name in budgeted["sizes"]))
+    for turn in turns:
+        cells = [
+            f"{budgeted['sizes'][name][turn]:>9} / {unbounded['sizes'][name][turn]:>9}"
+            for name in budgeted["sizes"]
+        ]
+        print(f"{turn:>4} " + " ".join(f"{cell:>21}" for cell in cells))
+    print(f"prompt build time per turn: budgeted {budgeted['build_ms_per_turn']:.2f} ms, "
+          f"full {unbounded['build_ms_per_turn']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Check the local issue pre-classifier on a held-out persona set.
+
+The lexicons in lib/issue_classifier.py were written while reading
+evals/personas.json, so by default this runs on evals/personas_holdout.json,
+which they were not tuned on. Feeds each persona's user messages one turn at a
+time to IssuePreclassifier and reports how many turns it resolves without the
+LLM, the precision/recall of the issues it tags on those turns, and the time
+per call.
+
+Tags are scored against the personas' expected labels, and with
+``--against-llm`` also against the reflection LLM: each turn is sent to
+ReflectionAgent.analyze on its own, and the issues it marks as cared about are
+the reference for that turn. That mode needs the real model (LLM_BACKEND=
+openrouter); under the fake backend the reference is the fake's canned reply.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.preclassifier [evals/personas_holdout.json] [--against-llm]
+"""
+
+import argparse
+import json
+import os
+import time
+
+from lib.issue_classifier import IssuePreclassifier
+
+
+def _ratio(num: int, den: int) -> float:
+    return num / den if den else 0.0
+
+
+def _llm_issues(agent, text: str) -> set:
+    """Issues the reflection LLM finds the user cares about in one message"""
+    reflection = agent.analyze([{"role": "user", "content": text}], 1)
+    return {d.issue_name for d in reflection.issue_details
+            if d.user_cares and d.confidence_level > 0}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("personas", nargs="?",
+                        default=os.path.join("evals", "personas_holdout.json"))
+    parser.add_argument("--against-llm", action="store_true",
+                        help="also score local tags against the reflection LLM, turn by turn")
+    args = parser.parse_args()
+
+    with open(args.personas) as f:
+        personas = json.load(f)
+    classifier = IssuePreclassifier()
+    agent = None
+    if args.against_llm:
+        from agents.reflection_agent import ReflectionAgent
+        agent = ReflectionAgent(use_cache=False)
+
+    turns = local = tp = fp = 0
+    expected_total = 0
+    llm_tp = llm_tagged = llm_total = 0
+    elapsed = 0.0
+    for persona in personas:
+        expected = set(persona["expected_issues"])
+        found = set()
+        for text in persona["turns"]:
+            start = time.perf_counter()
+            result = classifier.classify([{"role": "user", "content": text}])
+            elapsed += time.perf_counter() - start
+            turns += 1
+            if not result.ambiguous:
+                local += 1
+                found.update(result.issues)
+            if agent is not None:
+                reference = _llm_issues(agent, text)
+                tagged = set(result.issues) if not result.ambiguous else set()
+                llm_tp += len(tagged & reference)
+                llm_tagged += len(tagged)
+                llm_total += len(reference)
+        tp += len(found & expected)
+        fp += len(found - expected)
+        expected_total += len(expected)
+        print(f"{persona['name']:<26} tagged locally: {sorted(found)}")
+
+    print(f"turns resolved locally: {local}/{turns} ({local / turns:.0%} of LLM calls avoided)")
+    print(f"vs expected labels: precision {_ratio(tp, tp + fp):.2f}, "
+          f"recall {_ratio(tp, expected_total):.2f} "
+          f"(remaining issues are left to the LLM on escalated turns)")
+    if agent is not None:
+        print(f"vs reflection LLM, per turn: precision {_ratio(llm_tp, llm_tagged):.2f}, "
+              f"recall {_ratio(llm_tp, llm_total):.2f} "
+              f"({llm_total} issue signals from the LLM over {turns} turns)")
+    print(f"classify: {elapsed / turns * 1e6:.0f} us per message")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Per-turn prompt size and latency of full vs incremental (delta) reflection.
+
+Drives ReflectionAgent through one scripted conversation twice: re-analysing
+the whole transcript every turn, and sending only the new messages plus the
+running issue state. The stub LLM charges a fixed round trip plus a per-token
+prefill cost, so latency tracks prompt size the way a hosted model does.
+Tokens are estimated as characters / 4 (tiktoken needs a network download).
+
+Run from the repository root:
+
+    uv run python -m benchmarks.reflection_delta [--turns 10]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+
+os.environ["LLM_BACKEND"] = "fake"
+
+from langchain_core.messages import AIMessage  # noqa: E402
+
+import config  # noqa: E402
+from agents.reflection_agent import ReflectionAgent  # noqa: E402
+
+USER_TURNS = [
+    "Honestly groceries and rent have gone up so much that I'm not sure how we keep up.",
+    "My mom's insulin costs more every year and her insurance keeps denying claims.",
+    "I guess I also worry about whether anyone in Washington can actually get anything done.",
+    "Our town has had a lot of break-ins lately, people are nervous walking at night.",
+    "I don't really follow immigration stuff much, it doesn't affect me day to day.",
+    "Taxes feel high but I'm not sure where the money goes, it seems wasted.",
+    "My brother has been out of work for months and the jobs around here pay so little.",
+    "I think big donors basically buy elections, regular people don't matter.",
+    "Some of my friends struggled with opioids after injuries, it's been rough.",
+    "That's probably everything, the cost of living is the big one for me though.",
+]
+ASSISTANT_TURN = (
+    "Thanks for sharing that. It sounds like that has a real effect on your family. "
+    "Could you tell me a bit more about what worries you most when you think about it?"
+)
+FULL_REPLY = json.dumps({
+    "is_confident": False,
+    "turn_count": 1,
+    "confident_issues": ["Cost of living"],
+    "uncertain_issues": [i for i in config.ISSUES if i != "Cost of living"],
+    "issue_details": [
+        {"issue_name": "Cost of living", "confidence_level": 1, "user_cares": True}
+    ],
+})
+DELTA_REPLY = json.dumps({"issue_updates": []})
+
+
+class PrefillStubLLM:
+    """Sleeps for a round trip plus a per-token prefill cost, then returns ``reply``."""
+
+    def __init__(self, base_ms: float, ms_per_1k_tokens: float, reply: str):
+        self.base_ms = base_ms
+        self.ms_per_1k_tokens = ms_per_1k_tokens
+        self.reply = reply
+
+    async def ainvoke(self, messages, config=None):
+        tokens = sum(len(m.content) for m in messages) / 4
+        await asyncio.sleep((self.base_ms + self.ms_per_1k_tokens * tokens / 1000) / 1000)
+        return AIMessage(content=self.reply)
+
+    async def astream(self, messages, config=None):
+        yield await self.ainvoke(messages, config=config)
+
+
+async def run(incremental: bool, turns: int, base_ms: float, ms_per_1k: float) -> list:
+    agent = ReflectionAgent()
+    history = [{"role": "assistant", "content": ASSISTANT_TURN}]
+    previous, seen, stats = None, 0, []
+    for turn in range(1, turns + 1):
+        history.append({"role": "user", "content": USER_TURNS[(turn - 1) % len(USER_TURNS)]})
+        if incremental and previous is not None:
+            agent.llm = PrefillStubLLM(base_ms, ms_per_1k, DELTA_REPLY)
+            previous = await agent.aanalyze_delta(previous, history[seen:], turn)
+        else:
+            agent.llm = PrefillStubLLM(base_ms, ms_per_1k, FULL_REPLY)
+            previous = await agent.aanalyze(history, turn)
+        seen = len(history)
+        stats.append(agent.last_call_stats)
+        history.append({"role": "assistant", "content": ASSISTANT_TURN})
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--base-ms", type=float, default=300)
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=200)
+    args = parser.parse_args()
+
+    full = asyncio.run(run(False, args.turns, args.base_ms, args.ms_per_1k_tokens))
+    delta = asyncio.run(run(True, args.turns, args.base_ms, args.ms_per_1k_tokens))
+    print(f"{'turn':>4} {'full tok':>9} {'delta tok':>10} {'full ms':>8} {'delta ms':>9}")
+    for turn, (f, d) in enumerate(zip(full, delta), 1):
+        print(f"{turn:>4} {f['prompt_chars'] // 4:>9} {d['prompt_chars'] // 4:>10} "
+              f"{f['latency_ms']:>8.0f} {d['latency_ms']:>9.0f}")
+    full_tok = sum(f["prompt_chars"] for f in full) // 4
+    delta_tok = sum(d["prompt_chars"] for d in delta) // 4
+    print(f"total prompt tokens: full {full_tok}, delta {delta_tok} "
+          f"({1 - delta_tok / full_tok:.0%} saved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Time-to-first-token when routing starts on the reflection's routing fields.
+
+A first-turn reflection streams its routing fields (is_confident, confident and
+uncertain issues) before the per-issue details. ConversationFlow picks the
+branch and starts the router as soon as those fields are complete; the baseline
+here waits for the whole reflection, as the flow did before streaming parsing.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.reflection_streaming [--tokens-per-second 60] [--turns 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+os.environ["LLM_BACKEND"] = "fake"
+os.environ.setdefault("OPIK_TRACK_DISABLE", "true")
+
+import config  # noqa: E402
+from lib.fake_llm import FakeChatModel  # noqa: E402
+from workflows.conversation_flow import ConversationFlow  # noqa: E402
+
+REFLECTION = json.dumps({
+    "is_confident": False,
+    "turn_count": 1,
+    "confident_issues": ["Inflation"],
+    "uncertain_issues": [i for i in config.ISSUES if i != "Inflation"],
+    "issue_details": [
+        {
+            "issue_name": issue,
+            "confidence_level": 1 if issue == "Inflation" else 0,
+            "user_cares": issue == "Inflation",
+        }
+        for issue in config.ISSUES
+    ],
+})
+
+
+class WaitForReflection(ConversationFlow):
+    """Branches only once the complete reflection has been parsed"""
+
+    async def _areflect(self, conversation_history, turn_count, on_routing_fields=None):
+        return await super()._areflect(conversation_history, turn_count)
+
+
+async def first_turn(flow_cls, tokens_per_second: float) -> tuple:
+    flow = flow_cls(speculative_routing=False, preclassify=False)
+    flow.reflection_agent.llm = FakeChatModel(
+        [REFLECTION], latency=0.3, tokens_per_second=tokens_per_second
+    )
+    flow.router_agent.llm = FakeChatModel(latency=0.3, tokens_per_second=100)
+    history = [
+        {"role": "assistant", "content": flow.get_opening_message()},
+        {"role": "user", "content": "Groceries cost way more than they used to."},
+    ]
+    start = time.perf_counter()
+    ttft = None
+    async for result in flow.aprocess_turn_streaming(history, 1):
+        if ttft is None and result["message_chunk"]:
+            ttft = time.perf_counter() - start
+    total = time.perf_counter() - start
+    assert result["reflection"].issue_details, "final chunk must carry the full reflection"
+    return ttft, total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens-per-second", type=float, default=60)
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"reflection reply: {len(REFLECTION.split(' '))} tokens "
+          f"at {args.tokens_per_second:g} tokens/s")
+    print(f"{'':<22} {'TTFT ms':>8} {'turn ms':>8}")
+    for label, flow_cls in (("wait for reflection", WaitForReflection),
+                            ("branch on fields", ConversationFlow)):
+        runs = [asyncio.run(first_turn(flow_cls, args.tokens_per_second))
+                for _ in range(args.turns)]
+        ttft = statistics.median(r[0] for r in runs) * 1000
+        total = statistics.median(r[1] for r in runs) * 1000
+        print(f"{label:<22} {ttft:>8.0f} {total:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
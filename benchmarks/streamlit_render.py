@@ -0,0 +1,65 @@
+"""Server-side CPU per chat turn of the Streamlit app, rendered headlessly.
+
+Runs app.py through streamlit.testing's AppTest against the fake LLM and
+measures process CPU time (all threads: script, flow loop, fake model) for
+each turn. Pass ``--app`` to compare another revision of the script, e.g.
+``git show HEAD~1:app.py > /tmp/app_old.py``.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.streamlit_render [--turns 4] [--app app.py]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ["LLM_BACKEND"] = "fake"
+os.environ.setdefault("FAKE_LLM_LATENCY_MS", "50")
+os.environ.setdefault("FAKE_LLM_TOKENS_PER_SECOND", "200")
+os.environ.setdefault("OPIK_TRACK_DISABLE", "true")
+os.environ.setdefault("PRECLASSIFIER", "false")
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+USER_REPLIES = [
+    "Rent and groceries keep going up and my paycheck doesn't.",
+    "My mom can barely afford her prescriptions anymore.",
+    "It feels like Congress just fights instead of fixing anything.",
+    "There have been a lot of break-ins in my neighborhood.",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="app.py")
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--reply-words", type=int, default=300,
+                        help="length of each streamed assistant reply")
+    args = parser.parse_args()
+
+    from lib import fake_llm  # imported after the environment is set
+    fake_llm.DEFAULT_REPLY = " ".join(["word"] * args.reply_words)
+    sys.path.insert(0, os.getcwd())
+
+    app = AppTest.from_file(os.path.abspath(args.app), default_timeout=120)
+    app.run()
+    cpu, wall = [], []
+    for turn in range(args.turns):
+        app.chat_input[0].set_value(USER_REPLIES[turn % len(USER_REPLIES)])
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        app.run()
+        cpu.append(time.process_time() - cpu_start)
+        wall.append(time.perf_counter() - wall_start)
+        if app.exception:
+            raise SystemExit(app.exception)
+
+    print(f"{args.app}: {args.reply_words}-word replies, {args.turns} turns")
+    print(f"CPU per turn   median {statistics.median(cpu) * 1000:7.0f} ms")
+    print(f"wall per turn  median {statistics.median(wall) * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Turn latency with inline trace export vs the background TraceExporter queue.
+
+Conversations run against the fake LLM while traces go to
+lib/telemetry.LocalCollector, which sleeps ``--export-ms`` per export call to
+stand in for the network round trip to Opik. "inline" exports each trace on the
+request path, as the flow used to flush; "queued" hands it to TraceExporter.
+A last run with a tiny queue shows traces being dropped instead of blocking.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.trace_export [--sessions 20] [--export-ms 150]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ["LLM_BACKEND"] = "fake"
+os.environ["FAKE_LLM_LATENCY_MS"] = "50"
+os.environ["FAKE_LLM_TOKENS_PER_SECOND"] = "0"
+os.environ.setdefault("OPIK_TRACK_DISABLE", "true")
+
+import config  # noqa: E402
+from lib.telemetry import LocalCollector, TraceExporter  # noqa: E402
+from workflows.conversation_flow import ConversationFlow  # noqa: E402
+
+USER_REPLIES = [
+    "Rent and groceries keep going up and my paycheck doesn't.",
+    "My mom can barely afford her prescriptions anymore.",
+    "It feels like Congress just fights instead of fixing anything.",
+]
+
+
+class InlineExporter:
+    """Exports each record on the caller's thread before returning"""
+
+    def __init__(self, export):
+        self.export = export
+
+    def submit(self, record) -> bool:
+        self.export([record])
+        return True
+
+
+async def run_session(exporter, latencies: list) -> None:
+    flow = ConversationFlow(trace_exporter=exporter, preclassify=False)
+    history = [{"role": "assistant", "content": flow.get_opening_message()}]
+    for turn in range(1, config.MAX_TURNS + 1):
+        history.append({"role": "user", "content": USER_REPLIES[(turn - 1) % len(USER_REPLIES)]})
+        start = time.perf_counter()
+        reply = ""
+        async for result in flow.aprocess_turn_streaming(history, turn):
+            reply += result["message_chunk"]
+        latencies.append(time.perf_counter() - start)
+        history.append({"role": "assistant", "content": reply})
+        if result["message_chunk"]:
+            break
+
+
+async def run(exporter, sessions: int) -> tuple:
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(exporter, latencies) for _ in range(sessions)))
+    return latencies, time.perf_counter() - start
+
+
+def report(label: str, latencies: list, elapsed: float) -> None:
+    ms = sorted(v * 1000 for v in latencies)
+    q = statistics.quantiles(ms, n=100)
+    print(f"{label:<8} turns {len(ms):>4}   p50 {q[49]:6.0f} ms   p95 {q[94]:6.0f} ms   "
+          f"wall {elapsed:5.1f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--export-ms", type=float, default=150)
+    args = parser.parse_args()
+    latency = args.export_ms / 1000
+
+    inline = LocalCollector(latency)
+    report("inline", *asyncio.run(run(InlineExporter(inline), args.sessions)))
+
+    queued = LocalCollector(latency)
+    exporter = TraceExporter(queued, batch_size=50, flush_interval=0.2)
+    report("queued", *asyncio.run(run(exporter, args.sessions)))
+    exporter.shutdown()
+    print(f"queued   exported {len(queued.traces)} traces in {len(queued.batches)} batches; "
+          f"{exporter.metrics()}")
+
+    tiny = TraceExporter(LocalCollector(latency), max_queue=2, batch_size=1)
+    asyncio.run(run(tiny, args.sessions))
+    tiny.shutdown()
+    print(f"tiny queue (2): {tiny.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Time-to-first-token of ConversationFlow with and without speculative routing.
+
+Both agents are replaced by the fake LLM with fixed latencies, so the numbers show
+how much of a turn is spent waiting on serial round trips, not model speed.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.ttft [--reflect-ms 800] [--first-token-ms 400]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ["LLM_BACKEND"] = "fake"
+os.environ.setdefault("OPIK_TRACK_DISABLE", "true")
+
+import config  # noqa: E402
+from lib.fake_llm import FakeChatModel  # noqa: E402
+from workflows.conversation_flow import ConversationFlow  # noqa: E402
+
+# Reflection replies: a full analysis on turn 1, then incremental updates. The
+# router input repeats on turns 2 and 4, so speculation is accepted there and
+# discarded on turn 3, where a second issue makes the reflection confident.
+INFLATION = {"issue_name": "Inflation", "confidence_level": 1, "user_cares": True}
+HEALTH = {"issue_name": "Health care affordability", "confidence_level": 1, "user_cares": True}
+SCRIPT = [
+    json.dumps({
+        "is_confident": False,
+        "turn_count": 1,
+        "confident_issues": ["Inflation"],
+        "uncertain_issues": [i for i in config.ISSUES if i != "Inflation"],
+        "issue_details": [INFLATION],
+    }),
+    json.dumps({"issue_updates": []}),
+    json.dumps({"issue_updates": [HEALTH]}),
+    json.dumps({"issue_updates": []}),
+]
+
+
+async def run_conversation(speculative: bool, reflect: float, first_token: float) -> list:
+    flow = ConversationFlow(speculative_routing=speculative, preclassify=False)
+    flow.reflection_agent.llm = FakeChatModel(SCRIPT, latency=reflect, tokens_per_second=0)
+    flow.router_agent.llm = FakeChatModel(latency=first_token, tokens_per_second=100)
+    history = [{"role": "assistant", "content": flow.get_opening_message()}]
+    ttfts = []
+    for turn in range(1, len(SCRIPT) + 1):
+        history.append({"role": "user", "content": f"answer {turn}"})
+        start = time.perf_counter()
+        ttft = None
+        reply = ""
+        async for result in flow.aprocess_turn_streaming(history, turn):
+            if ttft is None and result["message_chunk"]:
+                ttft = time.perf_counter() - start
+            reply += result["message_chunk"]
+        ttfts.append(ttft)
+        history.append({"role": "assistant", "content": reply})
+    return ttfts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reflect-ms", type=float, default=800)
+    parser.add_argument("--first-token-ms", type=float, default=400)
+    args = parser.parse_args()
+    reflect, first_token = args.reflect_ms / 1000, args.first_token_ms / 1000
+
+    serial = asyncio.run(run_conversation(False, reflect, first_token))
+    speculative = asyncio.run(run_conversation(True, reflect, first_token))
+    print(f"{'turn':>4} {'serial ms':>10} {'speculative ms':>15}")
+    for turn, (a, b) in enumerate(zip(serial, speculative), 1):
+        print(f"{turn:>4} {a * 1000:>10.0f} {b * 1000:>15.0f}")
+    print(f"mean {sum(serial) / len(serial) * 1000:>10.0f} "
+          f"{sum(speculative) / len(speculative) * 1000:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
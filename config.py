@@ -8,10 +8,70 @@ OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 OPIK_API_KEY = os.getenv("OPIK_API_KEY")
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 MODEL_NAME = "openai/gpt-4o-mini"
+
+# Connection pool shared by all OpenRouter calls in the process
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+
+# "openrouter" for the real model, "fake" for the offline stand-in in lib/fake_llm.py
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openrouter")
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "300"))
+FAKE_LLM_TOKENS_PER_SECOND = float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "60"))
+# Optional JSON file holding a list of reflection replies, returned in order
+FAKE_LLM_REFLECTIONS = os.getenv("FAKE_LLM_REFLECTIONS")
 MAX_TURNS = 5
 MIN_TURNS_FOR_CONFIDENCE = 3
 SIGNALS_PER_ISSUE = 1
 
+# After the first turn, send the reflection agent only the new messages plus the
+# running issue state instead of the full transcript
+INCREMENTAL_REFLECTION = os.getenv("INCREMENTAL_REFLECTION", "true").lower() == "true"
+
+# Score user messages against issue lexicons locally and only call the reflection
+# LLM when the result is ambiguous (lib/issue_classifier.py)
+PRECLASSIFIER = os.getenv("PRECLASSIFIER", "false").lower() == "true"
+
+# Turn traces are exported to Opik from a bounded background queue in batches;
+# when the queue is full new traces are dropped rather than blocking a turn
+TRACE_QUEUE_SIZE = int(os.getenv("TRACE_QUEUE_SIZE", "1000"))
+TRACE_BATCH_SIZE = int(os.getenv("TRACE_BATCH_SIZE", "50"))
+TRACE_FLUSH_INTERVAL = float(os.getenv("TRACE_FLUSH_INTERVAL", "1.0"))
+
+# Streaming replies are re-rendered (Streamlit) or sent as an SSE event (API) at
+# most this often, or sooner once this many characters are waiting (lib/streaming.py)
+STREAM_RENDER_INTERVAL_MS = float(os.getenv("STREAM_RENDER_INTERVAL_MS", "50"))
+STREAM_RENDER_MAX_CHARS = int(os.getenv("STREAM_RENDER_MAX_CHARS", "400"))
+
+# Token budget for the conversation history in each agent's prompt (lib/context.py).
+# Older messages are folded into a rolling summary that takes up to
+# CONTEXT_SUMMARY_SHARE of the budget; 0 disables the budget for that agent.
+CONTEXT_BUDGETS = {
+    "conversation": int(os.getenv("CONTEXT_BUDGET_CONVERSATION", "1500")),
+    "reflection": int(os.getenv("CONTEXT_BUDGET_REFLECTION", "2000")),
+    "router": int(os.getenv("CONTEXT_BUDGET_ROUTER", "1000")),
+}
+CONTEXT_SUMMARY_SHARE = float(os.getenv("CONTEXT_SUMMARY_SHARE", "0.25"))
+
+# Conversation checkpoints (lib/checkpoints.py), keyed by thread_id so a session can
+# resume in any app process sharing this file. Writes are batched in the background.
+CHECKPOINTS = os.getenv("CHECKPOINTS", "true").lower() == "true"
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", ".cache/checkpoints.sqlite3")
+CHECKPOINT_FLUSH_INTERVAL_MS = float(os.getenv("CHECKPOINT_FLUSH_INTERVAL_MS", "50"))
+
+# Headless chat API (api/server.py): sessions idle this long are dropped from memory
+# and resumed from their checkpoint on the next request
+API_SESSION_IDLE_TIMEOUT_S = float(os.getenv("API_SESSION_IDLE_TIMEOUT_S", "1800"))
+API_MAX_BODY_BYTES = int(os.getenv("API_MAX_BODY_BYTES", "65536"))
+
+# Disk-backed LLM response cache. Agents named here (conversation, reflection,
+# router) answer repeated prompts from disk instead of calling the model.
+LLM_CACHE_AGENTS = {
+    name.strip() for name in os.getenv("LLM_CACHE_AGENTS", "").split(",") if name.strip()
+}
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3")
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "100"))
+
 ISSUES = [
     "The role of money in politics",
     "Health care affordability",
@@ -0,0 +1,195 @@
+"""Run scripted personas through ConversationFlow and score issue detection.
+
+Each persona (see evals/personas.json) lists its user messages and the
+config.ISSUES labels it should be tagged with. Sessions run concurrently on one
+event loop under a bounded worker pool, and every LLM request passes through a
+shared rate limiter so parallel sessions stay within upstream limits.
+
+Run from the repository root:
+
+    uv run python -m evals.run_personas [evals/personas.json] [--workers 8] [--rps 5]
+        [--repeat 1] [--output eval_results.json]
+
+Writes per-issue precision/recall, per-turn latency and token counts to
+--output and prints a summary. Set LLM_BACKEND=fake to dry-run offline, and
+compare runs with PRECLASSIFIER=true/false to see what the local issue
+pre-classifier saves and costs in accuracy.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+import config
+from workflows.conversation_flow import ConversationFlow
+
+
+class MeteredChatModel:
+    """Waits on a shared rate limiter before each call and counts tokens"""
+
+    def __init__(self, llm, rate_limiter: InMemoryRateLimiter, usage: dict):
+        self.llm = llm
+        self.rate_limiter = rate_limiter
+        self.usage = usage
+
+    def _count(self, message) -> None:
+        metadata = getattr(message, "usage_metadata", None) or {}
+        self.usage["input_tokens"] += metadata.get("input_tokens", 0)
+        self.usage["output_tokens"] += metadata.get("output_tokens", 0)
+
+    async def ainvoke(self, messages, config=None):
+        await self.rate_limiter.aacquire()
+        self.usage["calls"] += 1
+        response = await self.llm.ainvoke(messages, config=config)
+        self._count(response)
+        return response
+
+    async def astream(self, messages, config=None):
+        await self.rate_limiter.aacquire()
+        self.usage["calls"] += 1
+        async for chunk in self.llm.astream(messages, config=config):
+            self._count(chunk)
+            yield chunk
+
+
+async def run_persona(persona: dict, rate_limiter: InMemoryRateLimiter) -> dict:
+    flow = ConversationFlow()
+    for agent in (flow.reflection_agent, flow.router_agent):
+        usage = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+        agent.llm = MeteredChatModel(agent.llm, rate_limiter, usage)
+    turns = []
+    history = [{"role": "assistant", "content": flow.get_opening_message()}]
+
+    for turn_count, user_message in enumerate(persona["turns"][:config.MAX_TURNS], 1):
+        history.append({"role": "user", "content": user_message})
+        before = _usage_total(flow)
+        start = time.perf_counter()
+        ttft = None
+        reply = ""
+        async for result in flow.aprocess_turn_streaming(history, turn_count):
+            if ttft is None and result["message_chunk"]:
+                ttft = time.perf_counter() - start
+            reply += result["message_chunk"]
+            if result["is_complete"]:
+                break
+        after = _usage_total(flow)
+        turns.append({
+            "turn": turn_count,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "ttft_ms": round(ttft * 1000, 1) if ttft is not None else None,
+            "input_tokens": after["input_tokens"] - before["input_tokens"],
+            "output_tokens": after["output_tokens"] - before["output_tokens"],
+        })
+        history.append({"role": "assistant", "content": reply})
+        if result["is_closing"]:
+            break
+
+    reflection = flow.last_reflection
+    return {
+        "name": persona["name"],
+        "expected_issues": persona["expected_issues"],
+        "predicted_issues": reflection.confident_issues if reflection else [],
+        "reflections": dict(flow.reflection_counts),
+        "turns": turns,
+    }
+
+
+def _usage_total(flow: ConversationFlow) -> dict:
+    total = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+    for agent in (flow.reflection_agent, flow.router_agent):
+        for key in total:
+            total[key] += agent.llm.usage[key]
+    return total
+
+
+def score(sessions: list) -> dict:
+    """Per-issue precision/recall over all sessions, plus micro averages"""
+    counts = {issue: {"tp": 0, "fp": 0, "fn": 0} for issue in config.ISSUES}
+    for session in sessions:
+        expected = set(session["expected_issues"])
+        predicted = set(session["predicted_issues"])
+        for issue in predicted & expected:
+            counts[issue]["tp"] += 1
+        for issue in predicted - expected:
+            counts.setdefault(issue, {"tp": 0, "fp": 0, "fn": 0})["fp"] += 1
+        for issue in expected - predicted:
+            counts[issue]["fn"] += 1
+
+    def pr(c):
+        precision = c["tp"] / (c["tp"] + c["fp"]) if c["tp"] + c["fp"] else None
+        recall = c["tp"] / (c["tp"] + c["fn"]) if c["tp"] + c["fn"] else None
+        return {**c, "precision": precision, "recall": recall}
+
+    total = {key: sum(c[key] for c in counts.values()) for key in ("tp", "fp", "fn")}
+    return {"per_issue": {issue: pr(c) for issue, c in counts.items()}, "micro": pr(total)}
+
+
+def summarize(sessions: list, elapsed: float) -> dict:
+    turns = [t for s in sessions for t in s["turns"]]
+    latencies = sorted(t["latency_ms"] for t in turns)
+    local = sum(s["reflections"]["local"] for s in sessions)
+    llm = sum(s["reflections"]["llm"] for s in sessions)
+    return {
+        "sessions": len(sessions),
+        "turns": len(turns),
+        "elapsed_s": round(elapsed, 2),
+        "latency_ms_p50": statistics.median(latencies) if latencies else None,
+        "latency_ms_p95": latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+        "input_tokens": sum(t["input_tokens"] for t in turns),
+        "output_tokens": sum(t["output_tokens"] for t in turns),
+        "reflections_local": local,
+        "reflections_llm": llm,
+        "llm_calls_avoided": round(local / (local + llm), 3) if local + llm else None,
+    }
+
+
+async def run(personas: list, workers: int, rps: float, repeat: int) -> tuple:
+    rate_limiter = InMemoryRateLimiter(requests_per_second=rps, max_bucket_size=max(rps, 1))
+    pool = asyncio.Semaphore(workers)
+
+    async def bounded(persona):
+        async with pool:
+            return await run_persona(persona, rate_limiter)
+
+    start = time.perf_counter()
+    sessions = await asyncio.gather(*(bounded(p) for p in personas for _ in range(repeat)))
+    return list(sessions), time.perf_counter() - start
+
+
+def _fmt(value) -> str:
+    return "   -" if value is None else f"{value:4.2f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("personas", nargs="?", default=os.path.join("evals", "personas.json"))
+    parser.add_argument("--workers", type=int, default=8, help="concurrent sessions")
+    parser.add_argument("--rps", type=float, default=5.0, help="LLM requests per second")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per persona")
+    parser.add_argument("--output", default="eval_results.json")
+    args = parser.parse_args()
+
+    with open(args.personas) as f:
+        personas = json.load(f)
+    sessions, elapsed = asyncio.run(run(personas, args.workers, args.rps, args.repeat))
+    report = {"summary": summarize(sessions, elapsed), **score(sessions), "sessions": sessions}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'issue':<45} {'prec':>5} {'rec':>5} {'tp':>3} {'fp':>3} {'fn':>3}")
+    for issue, c in report["per_issue"].items():
+        print(f"{issue[:45]:<45} {_fmt(c['precision']):>5} {_fmt(c['recall']):>5} "
+              f"{c['tp']:>3} {c['fp']:>3} {c['fn']:>3}")
+    micro = report["micro"]
+    print(f"{'micro':<45} {_fmt(micro['precision']):>5} {_fmt(micro['recall']):>5}")
+    print(json.dumps(report["summary"]))
+    print(f"full report: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
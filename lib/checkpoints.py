@@ -0,0 +1,170 @@
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+import config
+from agents import ReflectionOutput
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint(NamedTuple):
+    thread_id: str
+    messages: List[dict]
+    turn_count: int
+    last_reflection: Optional[ReflectionOutput]
+    conversation_complete: bool = False
+    # History messages the last reflection has seen (ConversationFlow._reflected_upto)
+    reflected_upto: int = 0
+
+    def to_json(self) -> str:
+        state = self._asdict()
+        if self.last_reflection is not None:
+            state["last_reflection"] = self.last_reflection.model_dump()
+        return json.dumps(state)
+
+    @classmethod
+    def from_json(cls, data: str) -> "Checkpoint":
+        state = json.loads(data)
+        if state["last_reflection"] is not None:
+            state["last_reflection"] = ReflectionOutput(**state["last_reflection"])
+        return cls(**state)
+
+
+class CheckpointStore:
+    """Conversation state keyed by thread_id in SQLite, written behind the request.
+
+    ``save`` only records the latest checkpoint per thread in memory; a writer
+    thread commits everything pending in one transaction every
+    ``flush_interval`` seconds, so a turn never waits on disk. ``load`` sees
+    this process's pending writes first, then the database. The database runs
+    in WAL mode, so several app processes can share one file: a session can
+    resume in any of them once its last turn has been flushed.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.05):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.writes = 0
+        self._pending = {}
+        self._writing = {}  # batch being committed; still served by load
+        self._cond = threading.Condition()
+        self._closed = False
+        self._wake = threading.Event()  # flush/close cut the batching wait short
+        self._read_lock = threading.Lock()
+        self._reader = self._connect()
+        self._reader.execute(
+            """CREATE TABLE IF NOT EXISTS checkpoints (
+                thread_id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )"""
+        )
+        self._reader.commit()
+        self._writer = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        """Queue ``checkpoint``; replaces any unwritten one for the same thread"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("CheckpointStore is closed")
+            self._pending[checkpoint.thread_id] = checkpoint
+            self._cond.notify()
+
+    def load(self, thread_id: str) -> Optional[Checkpoint]:
+        with self._cond:
+            pending = self._pending.get(thread_id) or self._writing.get(thread_id)
+        if pending is not None:
+            return pending
+        with self._read_lock:
+            row = self._reader.execute(
+                "SELECT state FROM checkpoints WHERE thread_id = ?", (thread_id,)
+            ).fetchone()
+        return Checkpoint.from_json(row[0]) if row else None
+
+    def delete(self, thread_id: str) -> None:
+        with self._cond:
+            self._pending.pop(thread_id, None)
+        self.flush()
+        with self._read_lock:
+            self._reader.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            self._reader.commit()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until every checkpoint saved so far is on disk"""
+        deadline = time.monotonic() + timeout
+        self._wake.set()
+        with self._cond:
+            self._cond.notify()
+            while (self._pending or self._writing) and time.monotonic() < deadline:
+                self._cond.wait(0.01)
+
+    def close(self) -> None:
+        """Write what is pending and stop the writer"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._wake.set()
+        self._writer.join()
+        self._reader.close()
+
+    def _run(self) -> None:
+        conn = self._connect()
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                closed = self._closed
+            if not closed:
+                self._wake.wait(self.flush_interval)  # let more turns join this transaction
+            with self._cond:
+                self._wake.clear()
+                batch = self._writing = self._pending
+                self._pending = {}
+            failed = False
+            if batch:
+                try:
+                    now = time.time()
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?)",
+                        [(thread_id, cp.to_json(), now) for thread_id, cp in batch.items()],
+                    )
+                    conn.commit()
+                    self.writes += len(batch)
+                except sqlite3.Error:
+                    logger.exception("Checkpoint write failed; retrying %d threads", len(batch))
+                    conn.rollback()
+                    failed = not closed
+            with self._cond:
+                if failed:
+                    # Newer checkpoints saved meanwhile take precedence
+                    self._pending = {**batch, **self._pending}
+                self._writing = {}
+                self._cond.notify_all()
+                if self._closed and not self._pending:
+                    break
+        conn.close()
+
+
+@lru_cache(maxsize=None)
+def get_checkpoint_store() -> CheckpointStore:
+    """Process-wide store at config.CHECKPOINT_PATH, flushed at interpreter exit"""
+    os.makedirs(os.path.dirname(config.CHECKPOINT_PATH) or ".", exist_ok=True)
+    store = CheckpointStore(config.CHECKPOINT_PATH, config.CHECKPOINT_FLUSH_INTERVAL_MS / 1000)
+    atexit.register(store.close)
+    return store
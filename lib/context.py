@@ -0,0 +1,101 @@
+from typing import List, NamedTuple
+
+import config
+
+# Approximate tokens for the role label and separators around each message
+MESSAGE_OVERHEAD = 4
+# Tokens kept per message in the rolling summary; the user's words matter most
+SUMMARY_LINE_TOKENS = {"user": 40, "assistant": 20}
+
+
+def count_tokens(text: str) -> int:
+    """Approximate token count at four characters per token.
+
+    Close enough for budgeting English chat; it needs no tokenizer download.
+    """
+    return (len(text) + 3) // 4
+
+
+def clip(text: str, max_tokens: int) -> str:
+    """Cut ``text`` at a word boundary to roughly ``max_tokens`` tokens"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    return text[:max_tokens * 4].rsplit(" ", 1)[0] + "…"
+
+
+class ContextWindow(NamedTuple):
+    summary: str  # empty when the whole history fits
+    messages: List[dict]
+
+
+class ContextManager:
+    """Fits one conversation's history into per-agent token budgets.
+
+    The newest messages are kept verbatim while they fit. Older ones are folded
+    into a rolling summary of one clipped line per message; each line and token
+    count is computed once and reused across turns and agents, so the work per
+    turn is bounded by the budget rather than the length of the conversation.
+    The summary gets up to ``summary_share`` of the budget (plus whatever the
+    recent messages leave) and keeps its newest lines.
+    """
+
+    def __init__(self, budgets: dict = None, summary_share: float = None):
+        self.budgets = dict(config.CONTEXT_BUDGETS if budgets is None else budgets)
+        if summary_share is None:
+            summary_share = config.CONTEXT_SUMMARY_SHARE
+        self.summary_share = summary_share
+        self._contents = []
+        self._tokens = []
+        self._prefix = [0]  # running token totals, so the total needs no rescan
+        self._lines = []
+        self._line_tokens = []
+
+    def fit(self, history: list, agent: str) -> ContextWindow:
+        """Summary plus the recent messages of ``history`` that fit ``agent``'s budget"""
+        budget = self.budgets.get(agent)
+        if not budget:
+            return ContextWindow("", list(history))
+        self._index(history)
+        if self._prefix[len(history)] <= budget:
+            return ContextWindow("", list(history))
+
+        recent_budget = budget - int(budget * self.summary_share)
+        # Always keep the latest message, even if it alone exceeds the budget
+        start = len(history) - 1
+        used = self._tokens[start]
+        while start > 0 and used + self._tokens[start - 1] <= recent_budget:
+            start -= 1
+            used += self._tokens[start]
+        return ContextWindow(self._summary(start, budget - used), list(history[start:]))
+
+    def _index(self, history: list) -> None:
+        """Extend the per-message caches; start over if history was rewritten"""
+        known = len(self._contents)
+        if known > len(history) or (known and history[known - 1]["content"] != self._contents[-1]):
+            self._contents, self._tokens, self._lines, self._line_tokens = [], [], [], []
+            self._prefix = [0]
+            known = 0
+        for msg in history[known:]:
+            limit = SUMMARY_LINE_TOKENS.get(msg["role"], SUMMARY_LINE_TOKENS["assistant"])
+            line = f"- {msg['role']}: {clip(msg['content'], limit)}"
+            self._contents.append(msg["content"])
+            self._tokens.append(count_tokens(msg["content"]) + MESSAGE_OVERHEAD)
+            self._prefix.append(self._prefix[-1] + self._tokens[-1])
+            self._lines.append(line)
+            self._line_tokens.append(count_tokens(line) + 1)
+
+    def _summary(self, upto: int, budget: int) -> str:
+        """Newest summary lines for messages before ``upto`` that fit ``budget``"""
+        header = f"Summary of the {upto} earlier messages (clipped):"
+        omitted = "- ({} older messages omitted)"
+        used = count_tokens(header) + count_tokens(omitted) + MESSAGE_OVERHEAD
+        first = upto
+        while first > 0 and used + self._line_tokens[first - 1] <= budget:
+            first -= 1
+            used += self._line_tokens[first]
+        if first == upto:
+            return ""
+        lines = self._lines[first:upto]
+        if first:
+            lines.insert(0, omitted.format(first))
+        return "\n".join([header, *lines])
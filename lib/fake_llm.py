@@ -0,0 +1,129 @@
+import asyncio
+import itertools
+import json
+import time
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+import config
+
+DEFAULT_REPLY = (
+    "Thanks for sharing that. When you think about your day-to-day life, which of these "
+    "feels most pressing to you: prices and rent, health care costs, or jobs in your area?"
+)
+
+
+def default_reflection_reply(messages) -> str:
+    """A fixed, valid reflection in whichever format the prompt asks for"""
+    if "issue_updates" in messages[-1].content:
+        return json.dumps({"issue_updates": []})
+    return json.dumps({
+        "is_confident": False,
+        "turn_count": 1,
+        "confident_issues": ["Cost of living"],
+        "uncertain_issues": [i for i in config.ISSUES if i != "Cost of living"],
+        "issue_details": [
+            {"issue_name": "Cost of living", "confidence_level": 1, "user_cares": True}
+        ],
+    })
+
+
+def scripted_reflection_replies(replies: list):
+    """Reply callable returning ``replies`` in order, cycling, each in the prompt's format.
+
+    Scripts are written as full reflections. When the prompt asks for a delta
+    (INCREMENTAL_REFLECTION), a full reply is sent as ``issue_updates`` holding
+    all of its issue_details; the agent then derives is_confident and the issue
+    lists itself, as it does for real delta replies. Replies that already hold
+    ``issue_updates`` are returned as written.
+    """
+    next_reply = itertools.cycle(replies).__next__
+
+    def reply(messages) -> str:
+        data = next_reply()
+        if "issue_updates" in messages[-1].content and "issue_updates" not in data:
+            data = {"issue_updates": data.get("issue_details", [])}
+        return json.dumps(data)
+
+    return reply
+
+
+class FakeChatModel:
+    """Local stand-in for ChatOpenAI with no network access.
+
+    Every call waits ``latency`` seconds (the round trip up to the first token),
+    then produces the reply one whitespace-separated token at a time at
+    ``tokens_per_second``. Replies come from ``replies``, either a list cycled in
+    order or a callable taking the prompt messages.
+    """
+
+    def __init__(self, replies=None, latency: float = 0.3, tokens_per_second: float = 60.0,
+                 model_name: str = "fake"):
+        if replies is None:
+            replies = [DEFAULT_REPLY]
+        self._next_reply = replies if callable(replies) else itertools.cycle(replies).__next__
+        self._callable = callable(replies)
+        self.latency = latency
+        self.token_interval = 1 / tokens_per_second if tokens_per_second else 0.0
+        self.model_name = model_name
+        self.temperature = None
+
+    def _reply(self, messages):
+        text = self._next_reply(messages) if self._callable else self._next_reply()
+        tokens = [t + " " for t in text.split(" ")]
+        tokens[-1] = tokens[-1].rstrip(" ")
+        return text, tokens
+
+    def _usage(self, messages, tokens) -> dict:
+        input_tokens = sum(len(m.content) for m in messages) // 4
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": len(tokens),
+            "total_tokens": input_tokens + len(tokens),
+        }
+
+    def invoke(self, messages, config=None):
+        text, tokens = self._reply(messages)
+        time.sleep(self.latency + self.token_interval * len(tokens))
+        return AIMessage(content=text, usage_metadata=self._usage(messages, tokens))
+
+    async def ainvoke(self, messages, config=None):
+        text, tokens = self._reply(messages)
+        await asyncio.sleep(self.latency + self.token_interval * len(tokens))
+        return AIMessage(content=text, usage_metadata=self._usage(messages, tokens))
+
+    def stream(self, messages, config=None):
+        _, tokens = self._reply(messages)
+        time.sleep(self.latency)
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(self.token_interval)
+            yield AIMessageChunk(content=token)
+        # Usage arrives on a trailing empty chunk, as with OpenAI's stream_usage
+        yield AIMessageChunk(content="", usage_metadata=self._usage(messages, tokens))
+
+    async def astream(self, messages, config=None):
+        _, tokens = self._reply(messages)
+        await asyncio.sleep(self.latency)
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(self.token_interval)
+            yield AIMessageChunk(content=token)
+        # Usage arrives on a trailing empty chunk, as with OpenAI's stream_usage
+        yield AIMessageChunk(content="", usage_metadata=self._usage(messages, tokens))
+
+
+def create_fake_model(role: str) -> FakeChatModel:
+    """Fake model for one agent role, configured from config.FAKE_LLM_*"""
+    replies = None
+    if role == "reflection":
+        replies = default_reflection_reply
+        if config.FAKE_LLM_REFLECTIONS:
+            with open(config.FAKE_LLM_REFLECTIONS) as f:
+                replies = scripted_reflection_replies(json.load(f))
+    return FakeChatModel(
+        replies=replies,
+        latency=config.FAKE_LLM_LATENCY_MS / 1000,
+        tokens_per_second=config.FAKE_LLM_TOKENS_PER_SECOND,
+        model_name=f"fake-{role}",
+    )
@@ -0,0 +1,150 @@
+import re
+from functools import lru_cache
+from typing import List, NamedTuple
+
+import numpy as np
+
+import config
+
+# Curated phrases per issue (up to three words, lowercase, as tokenized below).
+# A phrase listed under several issues is split between them by its IDF weight.
+ISSUE_LEXICONS = {
+    "The role of money in politics": [
+        "donor", "donors", "lobbyist", "lobbyists", "lobbying", "super pac", "pac", "pacs",
+        "citizens united", "campaign finance", "big money", "dark money", "special interests",
+        "campaign contributions", "buy elections", "big donors",
+    ],
+    "Health care affordability": [
+        "healthcare", "health care", "health insurance", "premiums", "premium", "deductible",
+        "deductibles", "copay", "copays", "medical bills", "medical", "hospital", "doctor",
+        "doctors", "prescription", "prescriptions", "insulin", "medicare", "medicaid",
+        "obamacare", "affordable care", "insurance",
+    ],
+    "Inflation": [
+        "inflation", "inflationary", "prices", "rising prices", "interest rates", "buys less",
+        "price", "shot up", "groceries",
+    ],
+    "Federal budget deficit": [
+        "deficit", "deficits", "national debt", "debt", "borrowing", "balance the budget",
+        "balanced budget", "trillion", "trillions",
+    ],
+    "Poverty in America": [
+        "poverty", "poor", "homeless", "homelessness", "food stamps", "welfare", "hungry",
+        "hunger", "food bank", "food banks",
+    ],
+    "Ability of Republicans and Democrats to work together/government dysfunction": [
+        "congress", "gridlock", "bipartisan", "partisan", "partisanship", "work together",
+        "shutdown", "dysfunction", "dysfunctional", "polarized", "polarization", "both parties",
+        "can't agree", "washington", "get anything done", "gets done",
+    ],
+    "Drug addiction/opioid crisis": [
+        "opioid", "opioids", "fentanyl", "overdose", "overdoses", "addiction", "addicted",
+        "addicts", "drugs", "heroin", "meth", "rehab",
+    ],
+    "Moral values/social values": [
+        "values", "morals", "moral", "morality", "decency", "faith", "religion", "religious",
+        "church", "family values", "abortion", "traditional values",
+    ],
+    "Cost of living": [
+        "cost of living", "rent", "rents", "groceries", "grocery", "afford", "expensive",
+        "housing", "mortgage", "utilities", "make ends meet", "paycheck to paycheck",
+        "costs more", "everything costs",
+    ],
+    "Government corruption": [
+        "corruption", "corrupt", "bribes", "bribery", "on the take", "scandal", "scandals",
+        "kickbacks", "insider trading", "crooked", "swamp", "washington",
+    ],
+    "Jobs and the economy": [
+        "jobs", "job", "unemployment", "unemployed", "out of work", "layoffs", "laid off",
+        "wages", "wage", "economy", "economic", "factory", "factories", "manufacturing",
+        "hiring", "recession", "steady work",
+    ],
+    "Taxes and government spending": [
+        "taxes", "tax", "taxed", "government spending", "spending", "spends", "irs",
+        "tax cuts", "wasteful", "wasted", "money goes",
+    ],
+    "Crime and public safety": [
+        "crime", "crimes", "criminal", "criminals", "break ins", "police", "shooting",
+        "shootings", "violence", "violent", "theft", "stolen", "robbery", "burglary",
+        "feel safe", "safety", "unsafe", "gangs",
+    ],
+    "Immigration": [
+        "immigration", "immigrants", "immigrant", "border", "borders", "border security",
+        "migrants", "migrant", "asylum", "deportation", "deport", "illegal", "undocumented",
+        "citizenship",
+    ],
+    "Racism/social equality": [
+        "racism", "racist", "race", "discrimination", "discriminated", "equality",
+        "inequality", "equity", "civil rights", "treated fairly", "diversity", "prejudice",
+    ],
+}
+
+# Words that, shortly before a match, may flip its meaning ("I don't care about taxes")
+NEGATIONS = {"not", "no", "never", "don't", "dont", "doesn't", "isn't", "aren't", "didn't", "nor"}
+NEGATION_WINDOW = 3
+MAX_PHRASE_WORDS = 3
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+class Preclassification(NamedTuple):
+    ambiguous: bool
+    issues: List[str]
+    scores: np.ndarray
+
+
+class IssuePreclassifier:
+    """Keyword TF-IDF scorer mapping user text onto config.ISSUES.
+
+    Each issue's lexicon is a document; a phrase's weight is 1 / (number of
+    issues listing it), so a phrase unique to one issue scores 1.0 and shared
+    phrases split their weight. Scores for a message are one matrix-vector
+    product of that weight matrix with the message's phrase counts. A message is
+    resolved locally only when every scored issue reaches ``threshold``, at
+    least one issue does, and no match is preceded by a negation; anything else
+    is ambiguous and should go to the LLM.
+    """
+
+    def __init__(self, lexicons: dict = None, threshold: float = 1.0):
+        lexicons = lexicons or ISSUE_LEXICONS
+        self.issues = [issue for issue in config.ISSUES if issue in lexicons]
+        self.threshold = threshold
+        vocab = sorted({phrase for issue in self.issues for phrase in lexicons[issue]})
+        self.vocab = {phrase: i for i, phrase in enumerate(vocab)}
+        presence = np.zeros((len(self.issues), len(vocab)), dtype=np.float32)
+        for row, issue in enumerate(self.issues):
+            for phrase in lexicons[issue]:
+                presence[row, self.vocab[phrase]] = 1.0
+        idf = 1.0 / presence.sum(axis=0)
+        self.weights = presence * idf
+
+    def _phrase_counts(self, text: str):
+        tokens = _TOKEN.findall(text.lower())
+        counts = np.zeros(len(self.vocab), dtype=np.float32)
+        negated = False
+        for start in range(len(tokens)):
+            for n in range(1, MAX_PHRASE_WORDS + 1):
+                index = self.vocab.get(" ".join(tokens[start:start + n]))
+                if index is None:
+                    continue
+                counts[index] += 1
+                window = tokens[max(0, start - NEGATION_WINDOW):start]
+                negated = negated or any(word in NEGATIONS for word in window)
+        return counts, negated
+
+    def classify(self, messages: list) -> Preclassification:
+        """Score the user messages in ``messages`` (role/content dicts)"""
+        text = "\n".join(msg["content"] for msg in messages if msg["role"] == "user")
+        counts, negated = self._phrase_counts(text)
+        scores = self.weights @ counts
+        scored = scores > 0
+        confident = scores >= self.threshold
+        ambiguous = negated or not confident.any() or bool((scored & ~confident).any())
+        issues = [self.issues[i] for i in np.flatnonzero(confident)]
+        return Preclassification(ambiguous, issues, scores)
+
+
+@lru_cache(maxsize=None)
+def get_preclassifier() -> IssuePreclassifier:
+    """Process-wide classifier; the weight matrix is built once"""
+    return IssuePreclassifier()
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import weakref
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+import config
+from lib.fake_llm import create_fake_model
+
+_lock = threading.Lock()
+_models = {}
+_http_client = None
+_http_async_client = None
+
+
+class _PerLoopAsyncClient(httpx.AsyncClient):
+    """AsyncClient that sends each request through a pool owned by the running loop.
+
+    httpx connections belong to the event loop that opened them, so a single
+    pool shared across loops (ConversationFlow's background loop, the API
+    server's loop, successive asyncio.run calls) would hand out sockets from a
+    closed loop. Requests are still built by this client; a loop's pool is
+    created on its first request and released with the loop.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._pool_kwargs = kwargs
+        self._pools = weakref.WeakKeyDictionary()
+        self._pools_lock = threading.Lock()
+
+    def _pool(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._pools_lock:
+            pool = self._pools.get(loop)
+            if pool is None:
+                pool = self._pools[loop] = httpx.AsyncClient(**self._pool_kwargs)
+            return pool
+
+    async def send(self, request, **kwargs):
+        return await self._pool().send(request, **kwargs)
+
+
+def _http_clients():
+    """Keep-alive connection pools shared by every OpenRouter model in the process.
+
+    The async client keeps one pool per event loop (see _PerLoopAsyncClient).
+    """
+    global _http_client, _http_async_client
+    if _http_client is None:
+        limits = httpx.Limits(
+            max_connections=config.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY,
+        )
+        _http_client = httpx.Client(limits=limits)
+        _http_async_client = _PerLoopAsyncClient(limits=limits)
+    return _http_client, _http_async_client
+
+
+def get_chat_model(role: str, temperature: float):
+    """Chat model for one agent role ("conversation", "reflection" or "router")
+
+    The backend comes from config.LLM_BACKEND: "openrouter" for the real model,
+    "fake" for the offline stand-in in lib/fake_llm.py. OpenRouter models are
+    stateless, so one instance per temperature is shared by all agents and
+    sessions; fake models keep per-session reply scripts and are built fresh.
+    """
+    if config.LLM_BACKEND == "fake":
+        return create_fake_model(role)
+    if config.LLM_BACKEND != "openrouter":
+        raise ValueError(f"Unknown LLM_BACKEND: {config.LLM_BACKEND!r}")
+    with _lock:
+        model = _models.get(temperature)
+        if model is None:
+            http_client, http_async_client = _http_clients()
+            model = ChatOpenAI(
+                model=config.MODEL_NAME,
+                openai_api_key=config.OPENROUTER_API_KEY,
+                openai_api_base=config.OPENROUTER_BASE_URL,
+                temperature=temperature,
+                stream_usage=True,
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
+            _models[temperature] = model
+        return model
@@ -0,0 +1,210 @@
+import asyncio
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+import config
+
+
+def cache_key(model: str, temperature, messages) -> str:
+    """Hash of everything that determines the model's answer"""
+    payload = json.dumps(
+        [model, temperature, [(m.type, m.content) for m in messages]],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed response store with LRU eviction under a byte cap.
+
+    Responses are kept as the list of streamed chunks so a cached streaming call
+    replays with the same chunk boundaries it was recorded with. A hit is a
+    read only: its ``last_used`` time is held in memory and written with the
+    next ``put`` (which is when eviction needs it) or on ``close``. The total
+    size is kept as a running count, read from the table once on open, so
+    eviction never scans it.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched = {}  # key -> last_used not yet written
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                chunks TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+        )
+        self._conn.commit()
+        self._bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT chunks FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = time.time()
+        return json.loads(row[0])
+
+    def put(self, key: str, chunks: list) -> None:
+        data = json.dumps(chunks)
+        size = len(data.encode())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._touched.pop(key, None)
+            self._write_touches()
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._bytes += size - (old[0] if old else 0)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, data, size, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._bytes
+
+    def _write_touches(self) -> None:
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE responses SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()],
+            )
+            self._touched = {}
+
+    def _evict(self) -> None:
+        if self._bytes <= self.max_bytes:
+            return
+        stale = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_used"
+        ):
+            stale.append((key,))
+            self._bytes -= size
+            if self._bytes <= self.max_bytes:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def close(self) -> None:
+        with self._lock:
+            self._write_touches()
+            self._conn.commit()
+            self._conn.close()
+
+
+class CachedChatModel:
+    """Wraps a chat model so identical prompts are answered from an LLMCache.
+
+    Only the calls the agents make are covered: invoke/ainvoke and
+    stream/astream. Cache hits skip the model entirely, so callbacks (Opik) do
+    not see them. A stream that is abandoned midway is not stored. The async
+    calls run every cache read and write in a worker thread, so the event loop
+    never waits on SQLite or on another thread's eviction.
+    """
+
+    def __init__(self, llm, cache: LLMCache):
+        self.llm = llm
+        self.cache = cache
+
+    def _key(self, messages) -> str:
+        model = getattr(self.llm, "model_name", None) or type(self.llm).__name__
+        return cache_key(model, getattr(self.llm, "temperature", None), messages)
+
+    def invoke(self, messages, config=None):
+        key = self._key(messages)
+        chunks = self.cache.get(key)
+        if chunks is None:
+            response = self.llm.invoke(messages, config=config)
+            self.cache.put(key, [response.content])
+            return response
+        return AIMessage(content="".join(chunks))
+
+    async def ainvoke(self, messages, config=None):
+        key = self._key(messages)
+        chunks = await asyncio.to_thread(self.cache.get, key)
+        if chunks is None:
+            response = await self.llm.ainvoke(messages, config=config)
+            await asyncio.to_thread(self.cache.put, key, [response.content])
+            return response
+        return AIMessage(content="".join(chunks))
+
+    def stream(self, messages, config=None):
+        key = self._key(messages)
+        chunks = self.cache.get(key)
+        if chunks is not None:
+            for chunk in chunks:
+                yield AIMessageChunk(content=chunk)
+            return
+        recorded = []
+        for chunk in self.llm.stream(messages, config=config):
+            recorded.append(chunk.content)
+            yield chunk
+        self.cache.put(key, recorded)
+
+    async def astream(self, messages, config=None):
+        key = self._key(messages)
+        chunks = await asyncio.to_thread(self.cache.get, key)
+        if chunks is not None:
+            for chunk in chunks:
+                yield AIMessageChunk(content=chunk)
+            return
+        recorded = []
+        async for chunk in self.llm.astream(messages, config=config):
+            recorded.append(chunk.content)
+            yield chunk
+        await asyncio.to_thread(self.cache.put, key, recorded)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> LLMCache:
+    """Process-wide cache shared by every agent that has caching enabled, closed at exit"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            os.makedirs(os.path.dirname(config.LLM_CACHE_PATH) or ".", exist_ok=True)
+            _cache = LLMCache(config.LLM_CACHE_PATH, config.LLM_CACHE_MAX_MB * 1024 * 1024)
+            atexit.register(_cache.close)
+        return _cache
+
+
+def maybe_cached(llm, agent_name: str, enabled=None):
+    """Wrap ``llm`` with the shared cache if enabled for this agent.
+
+    ``enabled`` overrides the ``LLM_CACHE_AGENTS`` setting when not None.
+    """
+    if enabled is None:
+        enabled = agent_name in config.LLM_CACHE_AGENTS
+    return CachedChatModel(llm, get_cache()) if enabled else llm
@@ -0,0 +1,174 @@
+import json
+import re
+
+_NUMBER = re.compile(r"-?\d+(\.\d+)?([eE][+-]?\d+)?$")
+_LITERALS = {
+    "true": "true", "false": "false", "null": "null",
+    "True": "true", "False": "false", "None": "null",
+}
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class StreamingJSONParser:
+    """Incremental, forgiving JSON scanner for LLM output.
+
+    ``feed`` takes text as it streams in and keeps a normalized copy of the JSON
+    seen so far, along with the last point where closing the open brackets would
+    give a valid document. ``snapshot`` parses up to that point, so incomplete
+    strings, numbers and keys are left out rather than breaking the parse. Text
+    before the first bracket (prose, code fences) and after the top-level value
+    is ignored; trailing commas, dangling keys, raw newlines in strings and
+    Python literals are repaired. ``complete_keys`` lists top-level object keys
+    whose values have been fully received.
+    """
+
+    def __init__(self):
+        self.complete_keys = set()
+        self.done = False
+        self._out = []
+        # One [bracket, expecting, entry_start] per open container; expecting is
+        # "key", "colon", "value" or "comma"
+        self._stack = []
+        self._safe = None
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._string_is_key = False
+        self._key = None
+        self._bare = []
+
+    def feed(self, text: str) -> None:
+        for char in text:
+            if self.done:
+                return
+            if self._in_string:
+                self._string_char(char)
+            elif not self._stack:
+                if char in _CLOSERS:
+                    self._open(char)
+            elif char in " \t\r\n":
+                self._flush_bare()
+            elif char == '"':
+                self._flush_bare()
+                self._open_string()
+            elif char == ":":
+                self._flush_bare()
+                if self._stack[-1][1] == "colon":
+                    self._out.append(":")
+                    self._stack[-1][1] = "value"
+            elif char == ",":
+                self._flush_bare()
+                top = self._stack[-1]
+                if top[1] == "comma":
+                    self._out.append(",")
+                    top[1] = "key" if top[0] == "{" else "value"
+                    top[2] = len(self._out)
+            elif char in "}]":
+                self._flush_bare()
+                self._close()
+            elif char in _CLOSERS:
+                self._flush_bare()
+                if self._stack[-1][1] == "value":
+                    self._open(char)
+            elif self._stack[-1][1] == "value":
+                self._bare.append(char)
+
+    def close(self) -> None:
+        """Mark the end of the stream; a trailing number or literal is accepted"""
+        if not self._in_string and self._stack:
+            self._flush_bare()
+
+    def snapshot(self):
+        """The JSON value received so far, or None if nothing usable has arrived"""
+        if self._safe is None:
+            return None
+        length, closers = self._safe
+        try:
+            return json.loads("".join(self._out[:length]) + closers)
+        except json.JSONDecodeError:
+            return None
+
+    def _open(self, bracket: str) -> None:
+        self._out.append(bracket)
+        self._stack.append([bracket, "key" if bracket == "{" else "value", len(self._out)])
+        self._mark_safe()
+
+    def _open_string(self) -> None:
+        top = self._stack[-1]
+        if top[1] == "comma":  # missing comma between entries
+            self._out.append(",")
+            top[1] = "key" if top[0] == "{" else "value"
+            top[2] = len(self._out)
+        elif top[1] == "colon":  # missing colon after a key
+            self._out.append(":")
+            top[1] = "value"
+        self._string_is_key = top[1] == "key"
+        self._string_start = len(self._out)
+        self._in_string = True
+        self._out.append('"')
+
+    def _string_char(self, char: str) -> None:
+        if self._escape:
+            self._escape = False
+            self._out.append(char)
+        elif char == "\\":
+            self._escape = True
+            self._out.append(char)
+        elif char == '"':
+            self._in_string = False
+            self._out.append(char)
+            if self._string_is_key:
+                if len(self._stack) == 1:
+                    self._key = json.loads("".join(self._out[self._string_start:]))
+                self._stack[-1][1] = "colon"
+            else:
+                self._value_done()
+        elif char == "\n":
+            self._out.append("\\n")
+        else:
+            self._out.append(char)
+
+    def _flush_bare(self) -> None:
+        if not self._bare:
+            return
+        token = "".join(self._bare)
+        self._bare = []
+        if token in _LITERALS:
+            self._out.append(_LITERALS[token])
+        elif _NUMBER.match(token):
+            self._out.append(token)
+        else:
+            return  # unquoted junk is dropped; a dangling key is cleaned up on close
+        self._value_done()
+
+    def _close(self) -> None:
+        bracket, expecting, entry_start = self._stack.pop()
+        if expecting in ("colon", "value") and bracket == "{":
+            del self._out[entry_start:]  # key without a value
+        if self._out and self._out[-1] == ",":
+            self._out.pop()
+        self._out.append(_CLOSERS[bracket])
+        if self._stack:
+            self._value_done()
+        else:
+            self.done = True
+            self._safe = (len(self._out), "")
+
+    def _value_done(self) -> None:
+        top = self._stack[-1]
+        top[1] = "comma"
+        if len(self._stack) == 1 and top[0] == "{" and self._key is not None:
+            self.complete_keys.add(self._key)
+        self._mark_safe()
+
+    def _mark_safe(self) -> None:
+        closers = "".join(_CLOSERS[entry[0]] for entry in reversed(self._stack))
+        self._safe = (len(self._out), closers)
+
+
+def repair_json(text: str):
+    """Best-effort parse of a complete but possibly malformed LLM JSON reply"""
+    parser = StreamingJSONParser()
+    parser.feed(text)
+    parser.close()
+    return parser.snapshot()
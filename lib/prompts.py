@@ -0,0 +1,16 @@
+from functools import lru_cache
+from pathlib import Path
+
+PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+
+
+@lru_cache(maxsize=None)
+def load_prompt(filename: str) -> str:
+    """Load prompt from prompts directory, reading each file once per process"""
+    return (PROMPTS_DIR / filename).read_text().strip()
+
+
+def preload_prompts() -> None:
+    """Read every prompt file up front so no session pays for file I/O"""
+    for path in PROMPTS_DIR.glob("*.txt"):
+        load_prompt(path.name)
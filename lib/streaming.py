@@ -0,0 +1,62 @@
+import time
+
+
+class _ChunkBuffer:
+    """Buffering and flush decisions shared by coalesce_chunks and acoalesce_chunks"""
+
+    def __init__(self, interval: float, max_chars: int):
+        self.interval = interval
+        self.max_chars = max_chars
+        self.pending = []
+        self.size = 0
+        self.last = float("-inf")
+
+    def push(self, result: dict) -> list:
+        """Results to yield now that ``result`` has arrived"""
+        if result["is_complete"]:
+            # Leftover text goes out as an ordinary chunk, so the final result
+            # keeps exactly the message_chunk the flow gave it
+            out = [self._release(result)] if self.pending else []
+            return [*out, result]
+        if result["message_chunk"]:
+            self.pending.append(result["message_chunk"])
+            self.size += len(result["message_chunk"])
+        now = time.monotonic()
+        if self.pending and (now - self.last >= self.interval or self.size >= self.max_chars):
+            self.last = now
+            return [self._release(result)]
+        return []
+
+    def _release(self, result: dict) -> dict:
+        chunk = {**result, "message_chunk": "".join(self.pending), "is_complete": False,
+                 "reflection": None}
+        self.pending, self.size = [], 0
+        return chunk
+
+
+def coalesce_chunks(results, interval: float = 0.05, max_chars: int = 400):
+    """Merge ConversationFlow turn results so a UI re-renders at a bounded rate.
+
+    Yields results in the same shape as process_turn_streaming, with
+    ``message_chunk`` holding all text since the previous yield. The first text
+    is released immediately; after that, text is held until ``interval``
+    seconds have passed since the last yield or ``max_chars`` are buffered.
+    Text still held when the final (``is_complete``) result arrives is yielded
+    as one more ordinary chunk; the final result itself passes through
+    unchanged, so its ``message_chunk`` is only ever the flow's own.
+    """
+    buffer = _ChunkBuffer(interval, max_chars)
+    for result in results:
+        yield from buffer.push(result)
+        if result["is_complete"]:
+            return
+
+
+async def acoalesce_chunks(results, interval: float = 0.05, max_chars: int = 400):
+    """Async variant of coalesce_chunks, for aprocess_turn_streaming"""
+    buffer = _ChunkBuffer(interval, max_chars)
+    async for result in results:
+        for out in buffer.push(result):
+            yield out
+        if result["is_complete"]:
+            return
@@ -1,5 +1,20 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from functools import lru_cache
+
+import opik
+from opik.api_objects.opik_client import get_client_cached
 from opik.integrations.langchain import OpikTracer
 
+import config
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
 
 def init_opik_tracer(tags=None, project_name="Issue Discovery Chatbot"):
     """Initialize OpikTracer for LangChain with optional tags and project name"""
@@ -14,3 +29,142 @@ def init_opik_tracer(tags=None, project_name="Issue Discovery Chatbot"):
         print(f"⚠️  Warning: Could not initialize Opik tracer: {e}")
         return None
 
+
+class TraceExporter:
+    """Bounded queue of trace records exported in batches by a background thread.
+
+    ``submit`` never blocks: when the queue is full the record is dropped and
+    counted. The worker collects up to ``batch_size`` records, waiting at most
+    ``flush_interval`` seconds after the first one, and hands each batch to
+    ``export``. ``shutdown`` drains whatever is queued before returning.
+    """
+
+    def __init__(self, export, max_queue: int = 1000, batch_size: int = 50,
+                 flush_interval: float = 1.0):
+        self.export = export
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._counts = {"submitted": 0, "dropped": 0, "exported": 0, "batches": 0,
+                        "failed_batches": 0, "max_queue_depth": 0}
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="trace-export", daemon=True)
+        self._worker.start()
+
+    def submit(self, record) -> bool:
+        """Queue a record for export; False if it was dropped"""
+        # The closed check and the enqueue happen under the lock that shutdown
+        # takes to close, so every accepted record is queued ahead of _STOP
+        with self._lock:
+            if self._closed:
+                return False
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self._counts["dropped"] += 1
+                first = self._counts["dropped"] == 1
+            else:
+                self._counts["submitted"] += 1
+                depth = self._queue.qsize()
+                if depth > self._counts["max_queue_depth"]:
+                    self._counts["max_queue_depth"] = depth
+                return True
+        if first:
+            logger.warning("Trace export queue full; dropping traces")
+        return False
+
+    def metrics(self) -> dict:
+        """Current queue depth plus running counters"""
+        with self._lock:
+            return {"queue_depth": self._queue.qsize(), **self._counts}
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop accepting records and export everything already queued"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._worker.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not _STOP and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            if stop:
+                batch.pop()
+            if batch:
+                self._export(batch)
+            if stop:
+                return
+
+    def _export(self, batch: list) -> None:
+        try:
+            self.export(batch)
+        except Exception:
+            logger.exception("Trace export failed; %d traces lost", len(batch))
+            with self._lock:
+                self._counts["failed_batches"] += 1
+            return
+        with self._lock:
+            self._counts["exported"] += len(batch)
+            self._counts["batches"] += 1
+
+
+def export_to_opik(batch: list) -> None:
+    """Log each record (keyword arguments for Opik.trace) and flush once per batch.
+
+    The flush also sends the LLM spans OpikTracer queued on the same client.
+    Nothing is sent while tracing is disabled (OPIK_TRACK_DISABLE).
+    """
+    if not opik.is_tracing_active():
+        return
+    client = get_client_cached()
+    for record in batch:
+        client.trace(**record)
+    client.flush()
+
+
+class LocalCollector:
+    """In-process stand-in for a trace backend; keeps every batch it receives.
+
+    ``latency`` simulates the network round trip of one export call.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.batches = []
+
+    def __call__(self, batch: list) -> None:
+        time.sleep(self.latency)
+        self.batches.append(list(batch))
+
+    @property
+    def traces(self) -> list:
+        return [record for batch in self.batches for record in batch]
+
+
+@lru_cache(maxsize=None)
+def get_trace_exporter() -> TraceExporter:
+    """Process-wide exporter to Opik, drained at interpreter exit"""
+    exporter = TraceExporter(
+        export_to_opik,
+        max_queue=config.TRACE_QUEUE_SIZE,
+        batch_size=config.TRACE_BATCH_SIZE,
+        flush_interval=config.TRACE_FLUSH_INTERVAL,
+    )
+    atexit.register(exporter.shutdown)
+    return exporter
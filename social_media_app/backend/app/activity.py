@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class ActivityRecord(NamedTuple):
+    created_at: str
+    kind: str
+    post_id: str
+    comment_id: Optional[str] = None
+
+
+class ActivityIndex:
+    """Per-user log of likes, shares and comments, oldest first.
+
+    Live interactions arrive in time order, so recording one is a list append and
+    positions never shift. That makes a position a stable cursor: a page is a
+    single slice ending at the cursor, whatever the length of the history.
+    """
+
+    def __init__(self) -> None:
+        self._by_user: Dict[str, List[ActivityRecord]] = {}
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._by_user
+
+    def record(self, user_id: str, record: ActivityRecord) -> None:
+        self._by_user.setdefault(user_id, []).append(record)
+
+    def sort(self) -> None:
+        """Restore time order after bulk-loading out-of-order history."""
+        for records in self._by_user.values():
+            records.sort()
+
+    def page(
+        self, user_id: str, cursor: Optional[str], limit: int
+    ) -> Tuple[List[ActivityRecord], Optional[str]]:
+        """Return up to ``limit`` records latest first, plus the cursor for older ones."""
+        records = self._by_user.get(user_id, [])
+        end = len(records)
+        if cursor:
+            try:
+                end = int(cursor)
+            except ValueError:
+                return [], None
+            if not 0 <= end <= len(records):
+                return [], None
+        start = max(0, end - limit)
+        selected = records[start:end]
+        selected.reverse()
+        return selected, str(start) if start > 0 else None
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Dict, List, Set
+
+TOP_REACTORS = 5
+
+
+class PostAudience:
+    """Running audience aggregates for one post.
+
+    Every counter is updated on the mutation that changes it, so reading the
+    summary never walks the post's like, share or comment collections. Reactor
+    scores only ever grow, which lets the top-k list be maintained in place.
+    """
+
+    __slots__ = (
+        "likes",
+        "shares",
+        "comments",
+        "audience",
+        "commenters",
+        "silent",
+        "reactor_scores",
+        "top_reactors",
+    )
+
+    def __init__(self) -> None:
+        self.likes = 0
+        self.shares = 0
+        self.comments = 0
+        self.audience: Set[str] = set()
+        self.commenters: Set[str] = set()
+        self.silent = 0
+        self.reactor_scores: Dict[str, int] = {}
+        self.top_reactors: List[str] = []
+
+    def record_view(self, user_id: str) -> None:
+        self._join(user_id)
+
+    def record_like(self, user_id: str) -> None:
+        self.likes += 1
+        self._join(user_id)
+        self._react(user_id)
+
+    def record_share(self, user_id: str) -> None:
+        self.shares += 1
+        self._join(user_id)
+        self._react(user_id)
+
+    def record_comment(self, user_id: str) -> None:
+        self.comments += 1
+        self._join(user_id)
+        if user_id not in self.commenters:
+            self.commenters.add(user_id)
+            self.silent -= 1
+        self._react(user_id)
+
+    def _join(self, user_id: str) -> None:
+        if user_id not in self.audience:
+            self.audience.add(user_id)
+            self.silent += 1
+
+    def _react(self, user_id: str) -> None:
+        scores = self.reactor_scores
+        scores[user_id] = scores.get(user_id, 0) + 1
+        top = self.top_reactors
+        if user_id not in top:
+            if len(top) < TOP_REACTORS:
+                top.append(user_id)
+            elif scores[user_id] > scores[top[-1]]:
+                top[-1] = user_id
+            else:
+                return
+        top.sort(key=lambda uid: -scores[uid])
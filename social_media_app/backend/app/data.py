@@ -2,12 +2,25 @@ from __future__ import annotations
 
 import hashlib
 import random
+from bisect import bisect_left, insort
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 
 from faker import Faker
 
-from .schemas import Comment, Post, Profile
+from .activity import ActivityIndex, ActivityRecord
+from .audience import PostAudience
+from .related import CoEngagementIndex
+from .schemas import (
+    Activity,
+    AudienceSummary,
+    Comment,
+    CommentWithAuthor,
+    EngagementMix,
+    Post,
+    Profile,
+)
+from .trending import TrendingCounters
 
 fake = Faker()
 Faker.seed(42)  # For reproducible fake data
@@ -130,14 +143,30 @@ FUN_POSTS = [
 class DataStore:
     """In-memory data store for the social media app."""
 
-    def __init__(self):
+    def __init__(self, seed: bool = True):
         self.profiles: Dict[str, Profile] = {}
         self.posts: Dict[str, Post] = {}
+        # Top-level comments per post; replies hang off their parent in comment_replies
         self.comments: Dict[str, List[Comment]] = {}
+        self.comment_index: Dict[str, Comment] = {}
+        self.comment_replies: Dict[str, List[Comment]] = {}
         self.likes: Dict[str, set[str]] = {}
         self.shares: Dict[str, set[str]] = {}
-        self.post_ids_ordered: List[str] = []
-        self._seed_data()
+        self.audience: Dict[str, PostAudience] = {}
+        # Sorted oldest-first by (created_at, post_id) so a new post is an append;
+        # feed reads walk it backwards and locate cursors by bisection.
+        self.timeline: List[Tuple[str, str]] = []
+        self.author_timelines: Dict[str, List[Tuple[str, str]]] = {}
+        self.activity = ActivityIndex()
+        self.related = CoEngagementIndex()
+        self.trending = TrendingCounters()
+        if seed:
+            self._seed_data()
+
+    @property
+    def post_ids_ordered(self) -> List[str]:
+        """All post IDs, latest first."""
+        return [pid for _, pid in reversed(self.timeline)]
 
     def _generate_hash_id(self, prefix: str, seed: str) -> str:
         """Generate a hash-based ID."""
@@ -162,7 +191,7 @@ class DataStore:
                 bio=fake.sentence(nb_words=10) if random.random() > 0.3 else None,
                 avatar_url=f"https://api.dicebear.com/7.x/avataaars/svg?seed={username}",
             )
-            self.profiles[profile_id] = profile
+            self.add_profile(profile)
             profile_seeds.append(profile_id)
 
         # Create 100 posts with realistic content
@@ -198,11 +227,7 @@ class DataStore:
                 comment_count=0,
                 share_count=0,
             )
-            self.posts[post_id] = post
-            self.post_ids_ordered.append(post_id)
-            self.comments[post_id] = []
-            self.likes[post_id] = set()
-            self.shares[post_id] = set()
+            self._insert_post(post)
 
         # Add some comments to posts
         for post_id in list(self.posts.keys())[:50]:  # Add comments to half the posts
@@ -223,6 +248,12 @@ class DataStore:
                     ).isoformat(),
                 )
                 self.comments[post_id].append(comment)
+                self.comment_index[comment_id] = comment
+                self.audience[post_id].record_comment(commenter_id)
+                self.activity.record(
+                    commenter_id,
+                    ActivityRecord(comment.created_at, "comment", post_id, comment_id),
+                )
 
         # Add some likes and shares
         for post_id in self.posts.keys():
@@ -230,46 +261,101 @@ class DataStore:
             num_likes = random.randint(0, 30)
             for _ in range(num_likes):
                 liker_id = random.choice(profile_seeds)
-                self.likes[post_id].add(liker_id)
+                if liker_id not in self.likes[post_id]:
+                    self.likes[post_id].add(liker_id)
+                    self.audience[post_id].record_like(liker_id)
+                    self.related.record(post_id, liker_id)
+                    liked_at = (now - timedelta(hours=random.randint(1, 100))).isoformat()
+                    self.activity.record(liker_id, ActivityRecord(liked_at, "like", post_id))
 
             # Random shares
             num_shares = random.randint(0, 10)
             for _ in range(num_shares):
                 sharer_id = random.choice(profile_seeds)
-                self.shares[post_id].add(sharer_id)
+                if sharer_id not in self.shares[post_id]:
+                    self.shares[post_id].add(sharer_id)
+                    self.audience[post_id].record_share(sharer_id)
+                    self.related.record(post_id, sharer_id)
+                    shared_at = (now - timedelta(hours=random.randint(1, 100))).isoformat()
+                    self.activity.record(sharer_id, ActivityRecord(shared_at, "share", post_id))
 
             # Update counts
             self.posts[post_id].like_count = len(self.likes[post_id])
             self.posts[post_id].comment_count = len(self.comments[post_id])
             self.posts[post_id].share_count = len(self.shares[post_id])
 
-        # Keep latest first
-        self.post_ids_ordered.sort(
-            key=lambda pid: self.posts[pid].created_at, reverse=True
+        # Seeded interactions get random timestamps; live ones are appended in order
+        for comments in self.comments.values():
+            comments.sort(key=lambda c: c.created_at)
+        self.activity.sort()
+
+    def _insert_post(self, post: Post) -> None:
+        """Register a post and insert it into the time-ordered indexes."""
+        self.posts[post.id] = post
+        self.comments[post.id] = []
+        self.likes[post.id] = set()
+        self.shares[post.id] = set()
+        self.audience[post.id] = PostAudience()
+        key = (post.created_at, post.id)
+        insort(self.timeline, key)
+        insort(self.author_timelines.setdefault(post.author_id, []), key)
+
+    def _timeline_position(self, post_id: str) -> Optional[int]:
+        post = self.posts.get(post_id)
+        if post is None:
+            return None
+        return bisect_left(self.timeline, (post.created_at, post_id))
+
+    def add_profile(self, profile: Profile) -> None:
+        self.profiles[profile.id] = profile
+
+    def create_post(self, author_id: str, text: str) -> Optional[Post]:
+        if author_id not in self.profiles:
+            return None
+        created_at = datetime.now().isoformat()
+        post = Post(
+            id=self._generate_hash_id("post", f"{author_id}_{created_at}_{text[:20]}"),
+            author_id=author_id,
+            text=text,
+            created_at=created_at,
         )
+        self._insert_post(post)
+        return post
 
     def get_feed(
         self, cursor: Optional[str], limit: int
     ) -> Tuple[List[Post], Optional[str]]:
         if limit <= 0:
             return [], None
-        ordered = self.post_ids_ordered
-        start_idx = 0
+        end_idx = len(self.timeline)
         if cursor:
-            try:
-                start_idx = ordered.index(cursor) + 1
-            except ValueError:
+            pos = self._timeline_position(cursor)
+            if pos is None:
                 return [], None
-        end_idx = start_idx + limit
-        selected = ordered[start_idx:end_idx]
-        next_cursor = selected[-1] if len(selected) == limit and end_idx < len(ordered) else None
+            end_idx = pos
+        start_idx = max(0, end_idx - limit)
+        selected = [pid for _, pid in reversed(self.timeline[start_idx:end_idx])]
+        next_cursor = selected[-1] if len(selected) == limit and start_idx > 0 else None
         return [self.posts[pid] for pid in selected], next_cursor
 
+    def get_feed_since(self, since: str, limit: int) -> List[Post]:
+        """Posts newer than ``since``, latest first.
+
+        Returns the ``limit`` posts immediately after ``since`` so a polling client
+        never skips any: if a full page comes back, poll again from its first item.
+        """
+        pos = self._timeline_position(since)
+        if pos is None or limit <= 0:
+            return []
+        newer = self.timeline[pos + 1 : pos + 1 + limit]
+        return [self.posts[pid] for _, pid in reversed(newer)]
+
     def get_profile(self, profile_id: str) -> Optional[Profile]:
         return self.profiles.get(profile_id)
 
     def get_profile_posts(self, profile_id: str) -> List[Post]:
-        return [p for p in self.posts.values() if p.author_id == profile_id]
+        timeline = self.author_timelines.get(profile_id, [])
+        return [self.posts[pid] for _, pid in reversed(timeline)]
 
     def get_post(self, post_id: str) -> Optional[Post]:
         return self.posts.get(post_id)
@@ -277,18 +363,71 @@ class DataStore:
     def get_post_comments(self, post_id: str) -> List[Comment]:
         return self.comments.get(post_id, [])
 
+    def get_comment(self, comment_id: str) -> Optional[Comment]:
+        return self.comment_index.get(comment_id)
+
+    def _page_forward(
+        self, items: List[Comment], cursor: Optional[str], limit: int
+    ) -> Tuple[List[Comment], Optional[str]]:
+        """Oldest-first page of an append-only list; the cursor is the next position."""
+        start = 0
+        if cursor:
+            try:
+                start = int(cursor)
+            except ValueError:
+                return [], None
+            if not 0 <= start <= len(items):
+                return [], None
+        end = start + limit
+        return items[start:end], str(end) if end < len(items) else None
+
+    def get_comment_page(
+        self, post_id: str, cursor: Optional[str], limit: int
+    ) -> Tuple[List[Comment], Optional[str]]:
+        """Top-level comments on a post, oldest first."""
+        return self._page_forward(self.comments.get(post_id, []), cursor, limit)
+
+    def get_replies(
+        self, comment_id: str, cursor: Optional[str], limit: int
+    ) -> Tuple[List[Comment], Optional[str]]:
+        """Direct replies to a comment, oldest first."""
+        return self._page_forward(self.comment_replies.get(comment_id, []), cursor, limit)
+
+    def with_authors(self, comments: List[Comment]) -> List[CommentWithAuthor]:
+        """Attach author profiles; comments by unknown users are left out."""
+        out = []
+        for comment in comments:
+            author = self.profiles.get(comment.user_id)
+            if author is not None:
+                out.append(CommentWithAuthor.model_construct(**vars(comment), author=author))
+        return out
+
     def add_like(self, post_id: str, user_id: str) -> bool:
-        if post_id not in self.posts:
+        """Record a like; False if the post is unknown or the user already liked it."""
+        if post_id not in self.posts or user_id in self.likes[post_id]:
             return False
         self.likes[post_id].add(user_id)
+        self.audience[post_id].record_like(user_id)
+        self.related.record(post_id, user_id)
+        self.trending.record(post_id)
+        self.activity.record(
+            user_id, ActivityRecord(datetime.now().isoformat(), "like", post_id)
+        )
         self.posts[post_id].like_count = len(self.likes[post_id])
         return True
 
-    def add_comment(self, post_id: str, user_id: str, text: str) -> Optional[Comment]:
+    def add_comment(
+        self, post_id: str, user_id: str, text: str, parent_id: Optional[str] = None
+    ) -> Optional[Comment]:
         if post_id not in self.posts or post_id not in self.comments:
             return None
+        parent = None
+        if parent_id is not None:
+            parent = self.comment_index.get(parent_id)
+            if parent is None or parent.post_id != post_id:
+                return None
         comment_id = self._generate_hash_id(
-            "comment", f"{post_id}_{user_id}_{len(self.comments[post_id])}"
+            "comment", f"{post_id}_{user_id}_{self.posts[post_id].comment_count}"
         )
         comment = Comment(
             id=comment_id,
@@ -296,18 +435,70 @@ class DataStore:
             user_id=user_id,
             text=text,
             created_at=datetime.now().isoformat(),
+            parent_id=parent_id,
+        )
+        self.comment_index[comment_id] = comment
+        if parent is None:
+            self.comments[post_id].append(comment)
+        else:
+            self.comment_replies.setdefault(parent.id, []).append(comment)
+            parent.reply_count += 1
+        self.audience[post_id].record_comment(user_id)
+        self.trending.record(post_id)
+        self.activity.record(
+            user_id, ActivityRecord(comment.created_at, "comment", post_id, comment.id)
         )
-        self.comments[post_id].append(comment)
-        self.posts[post_id].comment_count = len(self.comments[post_id])
+        self.posts[post_id].comment_count += 1
         return comment
 
     def add_share(self, post_id: str, user_id: str) -> bool:
-        if post_id not in self.posts:
+        """Record a share; False if the post is unknown or the user already shared it."""
+        if post_id not in self.posts or user_id in self.shares[post_id]:
             return False
         self.shares[post_id].add(user_id)
+        self.audience[post_id].record_share(user_id)
+        self.related.record(post_id, user_id)
+        self.trending.record(post_id)
+        self.activity.record(
+            user_id, ActivityRecord(datetime.now().isoformat(), "share", post_id)
+        )
         self.posts[post_id].share_count = len(self.shares[post_id])
         return True
 
+    def get_user_activity(
+        self, user_id: str, cursor: Optional[str], limit: int
+    ) -> Tuple[List[Activity], Optional[str]]:
+        records, next_cursor = self.activity.page(user_id, cursor, limit)
+        return [Activity.model_construct(**r._asdict()) for r in records], next_cursor
+
+    def record_view(self, post_id: str, user_id: str) -> None:
+        if post_id in self.audience:
+            self.audience[post_id].record_view(user_id)
+
+    def get_audience_summary(self, post_id: str) -> Optional[AudienceSummary]:
+        """Build the post's audience summary from its running aggregates."""
+        agg = self.audience.get(post_id)
+        if agg is None:
+            return None
+        engagements = agg.likes + agg.shares + agg.comments
+        audience_size = len(agg.audience)
+        return AudienceSummary.model_construct(
+            audience_size=audience_size,
+            commenter_count=len(agg.commenters),
+            silent_viewer_count=agg.silent,
+            silent_viewer_ratio=agg.silent / audience_size if audience_size else 0.0,
+            engagement_mix=EngagementMix.model_construct(
+                likes=agg.likes / engagements,
+                shares=agg.shares / engagements,
+                comments=agg.comments / engagements,
+            )
+            if engagements
+            else EngagementMix.model_construct(),
+            top_reactors=[
+                self.profiles[uid] for uid in agg.top_reactors if uid in self.profiles
+            ],
+        )
+
     def is_liked_by(self, post_id: str, user_id: str) -> bool:
         return user_id in self.likes.get(post_id, set())
 
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Protocol
+
+Event = Dict[str, Any]
+
+
+class EventExporter(Protocol):
+    """Destination for batches of analytics events."""
+
+    def export(self, events: List[Event]) -> None: ...
+
+
+class NullExporter:
+    """Discards events. Used when no analytics backend is configured."""
+
+    def export(self, events: List[Event]) -> None:
+        return None
+
+
+class FileExporter:
+    """Appends events to a local file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, events: List[Event]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event) + "\n")
+
+
+class HttpExporter:
+    """POSTs batches to a PostHog-compatible ``/batch`` endpoint."""
+
+    def __init__(self, url: str, api_key: str = "", timeout: float = 5.0):
+        self.url = url
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def export(self, events: List[Event]) -> None:
+        body = json.dumps({"api_key": self.api_key, "batch": events}).encode()
+        req = urllib.request.Request(
+            self.url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            resp.read()
+
+
+class EventSink:
+    """Bounded in-process queue drained by a background flusher thread.
+
+    ``emit`` is the only call made on the request path: it builds the event dict and
+    does a single ``put_nowait``. When the queue is full the event is dropped and
+    counted instead of blocking the handler. The flusher exports a batch once it
+    holds ``batch_size`` events or ``flush_interval`` seconds have passed since the
+    first event of the batch arrived.
+    """
+
+    def __init__(
+        self,
+        exporter: EventExporter,
+        max_queue_size: int = 10_000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+    ):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.exported = 0
+        self.export_errors = 0
+        # Request threads and the flusher both update the counters
+        self._counter_lock = threading.Lock()
+        self._queue: queue.Queue[Event] = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def emit(
+        self, event: str, distinct_id: str, properties: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        try:
+            self._queue.put_nowait(
+                {
+                    "event": event,
+                    "distinct_id": distinct_id,
+                    "properties": properties or {},
+                    "timestamp": datetime.now().isoformat(),
+                }
+            )
+        except queue.Full:
+            with self._counter_lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="event-sink", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the flusher after exporting everything still queued."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._drain()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._export(batch)
+
+    def _drain(self) -> None:
+        batch: List[Event] = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self._export(batch)
+                batch = []
+        if batch:
+            self._export(batch)
+
+    def _export(self, batch: List[Event]) -> None:
+        try:
+            self.exporter.export(batch)
+        except Exception:
+            # Analytics must never take the API down; the batch is lost and counted.
+            with self._counter_lock:
+                self.export_errors += 1
+                self.dropped += len(batch)
+            return
+        with self._counter_lock:
+            self.exported += len(batch)
+
+
+def create_exporter_from_env() -> EventExporter:
+    http_url = os.getenv("ANALYTICS_HTTP_URL")
+    if http_url:
+        return HttpExporter(http_url, api_key=os.getenv("ANALYTICS_API_KEY", ""))
+    file_path = os.getenv("ANALYTICS_FILE")
+    if file_path:
+        return FileExporter(file_path)
+    return NullExporter()
+
+
+# Global singleton instance; started and drained by the app lifespan
+sink = EventSink(
+    create_exporter_from_env(),
+    max_queue_size=int(os.getenv("ANALYTICS_QUEUE_SIZE", "10000")),
+    batch_size=int(os.getenv("ANALYTICS_BATCH_SIZE", "100")),
+    flush_interval=float(os.getenv("ANALYTICS_FLUSH_INTERVAL", "1.0")),
+)
@@ -1,15 +1,31 @@
 from __future__ import annotations
 
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
+from .events import sink
+from .routers.debug import TOKEN_ENV
+from .routers.debug import router as debug_router
 from .routers.feed import router as feed_router
 from .routers.interactions import router as interactions_router
 from .routers.posts import router as posts_router
 from .routers.profiles import router as profiles_router
+from .routers.trending import router as trending_router
 from .telemetry import init_telemetry
 
-app = FastAPI(title="Social Media Backend", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    sink.start()
+    yield
+    sink.close()
+
+
+app = FastAPI(title="Social Media Backend", version="0.1.0", lifespan=lifespan)
 
 # CORS for the frontend
 app.add_middleware(
@@ -20,12 +36,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON bodies for clients that send Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 init_telemetry(app)
 
 app.include_router(feed_router)
 app.include_router(profiles_router)
 app.include_router(posts_router)
 app.include_router(interactions_router)
+app.include_router(trending_router)
+
+if os.getenv(TOKEN_ENV):
+    app.include_router(debug_router)
 
 
 @app.get("/healthz")
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+# Only one capture at a time; concurrent requests would double the sampling cost
+_capture_lock = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({code.co_filename})"
+
+
+def sample_stacks(duration: float, interval: float = 0.005) -> Counter[str]:
+    """Sample every other thread's Python stack until ``duration`` elapses.
+
+    Stacks are keyed root-first and joined with ``;``, prefixed by the thread
+    name, which is the collapsed format flamegraph.pl and speedscope read.
+    """
+    own = threading.get_ident()
+    counts: Counter[str] = Counter()
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(f"thread:{names.get(thread_id, thread_id)}")
+            stack.reverse()
+            counts[";".join(stack).replace(" ", "_")] += 1
+        time.sleep(interval)
+    return counts
+
+
+def capture(duration: float, interval: float = 0.005) -> Optional[str]:
+    """Collapsed stacks for one capture, or ``None`` if another is running."""
+    if not _capture_lock.acquire(blocking=False):
+        return None
+    try:
+        counts = sample_stacks(duration, interval)
+    finally:
+        _capture_lock.release()
+    return "".join(f"{stack} {n}\n" for stack, n in counts.most_common())
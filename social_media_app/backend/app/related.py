@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Dict, List, Set, Tuple
+
+MAX_RELATED = 50
+
+
+class CoEngagementIndex:
+    """Post x user engagement matrix for "people who engaged with this also..." lookups.
+
+    Post and user IDs are interned to small integers and the matrix is held as two
+    sparse adjacency lists, one per axis. Scoring a post only touches the posts
+    reachable through its own engagers, so cost follows the size of that
+    neighbourhood rather than the number of posts in the store.
+
+    Posts are ranked by the cosine score they are returned with: shared engagers
+    over the geometric mean of both posts' engager counts. The overlap counts are
+    cached per post. An engagement by user ``u`` on post ``p`` changes the overlap
+    between ``p`` and exactly the posts ``u`` already engaged with, so only those
+    cache entries are dropped; they are rebuilt on next read. Scores also depend
+    on each post's degree, which any engagement can change, so the ranking itself
+    is done at read time over the cached overlaps.
+    """
+
+    def __init__(self) -> None:
+        self._post_index: Dict[str, int] = {}
+        self._post_names: List[str] = []
+        self._user_index: Dict[str, int] = {}
+        self._post_users: List[Set[int]] = []
+        self._user_posts: List[Set[int]] = []
+        self._cache: Dict[int, List[Tuple[int, int]]] = {}  # post -> [(other, shared)]
+
+    def _intern_post(self, post_id: str) -> int:
+        idx = self._post_index.get(post_id)
+        if idx is None:
+            idx = self._post_index[post_id] = len(self._post_names)
+            self._post_names.append(post_id)
+            self._post_users.append(set())
+        return idx
+
+    def _intern_user(self, user_id: str) -> int:
+        idx = self._user_index.get(user_id)
+        if idx is None:
+            idx = self._user_index[user_id] = len(self._user_posts)
+            self._user_posts.append(set())
+        return idx
+
+    def record(self, post_id: str, user_id: str) -> None:
+        p = self._intern_post(post_id)
+        u = self._intern_user(user_id)
+        users = self._post_users[p]
+        if u in users:
+            return
+        posts = self._user_posts[u]
+        self._cache.pop(p, None)
+        for q in posts:
+            self._cache.pop(q, None)
+        users.add(u)
+        posts.add(p)
+
+    def related(self, post_id: str, limit: int) -> List[Tuple[str, float, int]]:
+        """Top ``limit`` posts as ``(post_id, cosine score, shared engagers)``."""
+        p = self._post_index.get(post_id)
+        if p is None:
+            return []
+        overlap = self._cache.get(p)
+        if overlap is None:
+            overlap = self._cache[p] = self._overlap(p)
+        names = self._post_names
+        degree = self._post_users
+        norm = len(degree[p])
+        scored = ((shared / math.sqrt(norm * len(degree[q])), shared, q) for q, shared in overlap)
+        return [
+            (names[q], score, shared)
+            for score, shared, q in heapq.nlargest(min(limit, MAX_RELATED), scored)
+        ]
+
+    def _overlap(self, p: int) -> List[Tuple[int, int]]:
+        overlap: Dict[int, int] = {}
+        for u in self._post_users[p]:
+            for q in self._user_posts[u]:
+                overlap[q] = overlap.get(q, 0) + 1
+        overlap.pop(p, None)
+        return list(overlap.items())
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import Response
+from pydantic_core import to_json
+
+
+class TrustedJSONResponse(Response):
+    """Serialize handler output straight to JSON bytes.
+
+    Returning a ``Response`` makes FastAPI skip its ``response_model`` pass, which
+    would otherwise dump the model to a dict, validate it again and re-encode it.
+    Use it only for models built with ``model_construct`` from store data that was
+    validated when it was written; ``response_model`` still documents the schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
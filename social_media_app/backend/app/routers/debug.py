@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from ..profiler import capture
+
+# Mounted by main.py only when DEBUG_PROFILER_TOKEN is set, so a disabled profiler
+# adds no route and no per-request work.
+TOKEN_ENV = "DEBUG_PROFILER_TOKEN"
+
+
+def require_debug_token(x_debug_token: str = Header("")) -> None:
+    expected = os.getenv(TOKEN_ENV, "")
+    if not expected or not hmac.compare_digest(x_debug_token.encode(), expected.encode()):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+    include_in_schema=False,
+    dependencies=[Depends(require_debug_token)],
+)
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+def profile(
+    seconds: float = Query(5.0, gt=0, le=60),
+    interval_ms: float = Query(5.0, ge=1, le=100),
+) -> PlainTextResponse:
+    """Sample all threads for ``seconds`` and return collapsed stacks."""
+    stacks = capture(seconds, interval_ms / 1000)
+    if stacks is None:
+        raise HTTPException(status_code=409, detail="A profile capture is already running")
+    return PlainTextResponse(stacks)
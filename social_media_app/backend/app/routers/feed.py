@@ -1,25 +1,81 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Dict, List, Literal, Optional, Union
 
 from fastapi import APIRouter, HTTPException, Query
 
 from ..data import store
-from ..schemas import FeedResponse, PostWithAuthor
+from ..events import sink
+from ..responses import TrustedJSONResponse
+from ..schemas import FeedResponse, NormalizedFeedResponse, Post, PostWithAuthor, Profile
 
 router = APIRouter(prefix="/feed", tags=["feed"])
 
+# Columns every normalized item keeps so clients can key posts and resolve authors
+REQUIRED_FIELDS = ("id", "author_id")
 
-@router.get("", response_model=FeedResponse)
-def get_feed(
-    cursor: Optional[str] = Query(None), limit: int = Query(20, ge=1, le=50)
-) -> FeedResponse:
-    posts, next_cursor = store.get_feed(cursor=cursor, limit=limit)
-    items: list[PostWithAuthor] = []
+
+def _parse_fields(fields: Optional[str]) -> Optional[set[str]]:
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(Post.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown post fields: {', '.join(sorted(unknown))}"
+        )
+    return requested.union(REQUIRED_FIELDS)
+
+
+def _normalized(
+    posts: List[Post], next_cursor: Optional[str], columns: Optional[set[str]]
+) -> NormalizedFeedResponse:
+    authors: Dict[str, Profile] = {}
+    items = []
     for p in posts:
-        author = store.get_profile(p.author_id)
-        if author is None:
-            raise HTTPException(status_code=500, detail="Author not found")
-        items.append(PostWithAuthor(**p.model_dump(), author=author))
-    return FeedResponse(items=items, next_cursor=next_cursor)
+        if p.author_id not in authors:
+            author = store.get_profile(p.author_id)
+            if author is None:
+                raise HTTPException(status_code=500, detail="Author not found")
+            authors[p.author_id] = author
+        items.append(p.model_dump(include=columns))
+    return NormalizedFeedResponse.model_construct(
+        items=items, authors=authors, next_cursor=next_cursor
+    )
+
 
+@router.get("", response_model=Union[FeedResponse, NormalizedFeedResponse])
+def get_feed(
+    cursor: Optional[str] = Query(None),
+    since: Optional[str] = Query(
+        None, description="Only return posts newer than this post ID (delta polling)"
+    ),
+    limit: int = Query(20, ge=1, le=50),
+    user_id: str = "anonymous",
+    view: Literal["nested", "normalized"] = Query("nested"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated post columns to return (normalized view only)"
+    ),
+) -> TrustedJSONResponse:
+    if fields and view != "normalized":
+        raise HTTPException(status_code=400, detail="fields= requires view=normalized")
+    if since and cursor:
+        raise HTTPException(status_code=400, detail="Use either cursor or since, not both")
+    columns = _parse_fields(fields)
+    if since:
+        posts, next_cursor = store.get_feed_since(since, limit=limit), None
+    else:
+        posts, next_cursor = store.get_feed(cursor=cursor, limit=limit)
+    if view == "normalized":
+        response = _normalized(posts, next_cursor, columns)
+    else:
+        items: list[PostWithAuthor] = []
+        for p in posts:
+            author = store.get_profile(p.author_id)
+            if author is None:
+                raise HTTPException(status_code=500, detail="Author not found")
+            items.append(PostWithAuthor.model_construct(**vars(p), author=author))
+        response = FeedResponse.model_construct(items=items, next_cursor=next_cursor)
+    # One exposure event per page keeps the request path at a single enqueue
+    sink.emit("feed_exposure", user_id, {"post_ids": [p.id for p in posts]})
+    return TrustedJSONResponse(response)
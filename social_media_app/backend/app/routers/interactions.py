@@ -1,49 +1,86 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
 
 from ..data import store
-from ..schemas import CommentRequest, InteractionResponse, LikeRequest, ShareRequest
+from ..events import sink
+from ..responses import TrustedJSONResponse
+from ..schemas import (
+    CommentPage,
+    CommentRequest,
+    InteractionResponse,
+    LikeRequest,
+    ShareRequest,
+)
 
 router = APIRouter(prefix="/posts", tags=["interactions"])
 
 
 @router.post("/{post_id}/like", response_model=InteractionResponse)
-def like_post(post_id: str, body: LikeRequest) -> InteractionResponse:
+def like_post(post_id: str, body: LikeRequest) -> TrustedJSONResponse:
     if post_id not in store.posts:
         raise HTTPException(status_code=404, detail="Post not found")
-    store.add_like(post_id, body.user_id)
+    if store.add_like(post_id, body.user_id):
+        sink.emit("post_engagement", body.user_id, {"post_id": post_id, "action": "like"})
     post = store.posts[post_id]
     liked_by_user = store.is_liked_by(post_id, body.user_id)
-    return InteractionResponse(post=post, liked_by_user=liked_by_user)
+    return TrustedJSONResponse(
+        InteractionResponse.model_construct(post=post, liked_by_user=liked_by_user)
+    )
 
 
 @router.post("/{post_id}/comment", response_model=InteractionResponse)
-def comment_post(post_id: str, body: CommentRequest) -> InteractionResponse:
+def comment_post(post_id: str, body: CommentRequest) -> TrustedJSONResponse:
     if post_id not in store.posts:
         raise HTTPException(status_code=404, detail="Post not found")
-    comment = store.add_comment(post_id, body.user_id, body.text)
+    if body.parent_id is not None and store.get_comment(body.parent_id) is None:
+        raise HTTPException(status_code=404, detail="Parent comment not found")
+    comment = store.add_comment(post_id, body.user_id, body.text, parent_id=body.parent_id)
     if comment is None:
         raise HTTPException(status_code=400, detail="Cannot add comment")
+    sink.emit("post_engagement", body.user_id, {"post_id": post_id, "action": "comment"})
     post = store.posts[post_id]
-    return InteractionResponse(post=post, new_comment=comment)
+    return TrustedJSONResponse(InteractionResponse.model_construct(post=post, new_comment=comment))
 
 
 @router.post("/{post_id}/share", response_model=InteractionResponse)
-def share_post(post_id: str, body: ShareRequest) -> InteractionResponse:
+def share_post(post_id: str, body: ShareRequest) -> TrustedJSONResponse:
     if post_id not in store.posts:
         raise HTTPException(status_code=404, detail="Post not found")
-    ok = store.add_share(post_id, body.user_id)
-    if not ok:
-        raise HTTPException(status_code=400, detail="Cannot share")
+    if store.add_share(post_id, body.user_id):
+        sink.emit("post_engagement", body.user_id, {"post_id": post_id, "action": "share"})
     post = store.posts[post_id]
-    return InteractionResponse(post=post)
+    return TrustedJSONResponse(InteractionResponse.model_construct(post=post))
 
 
-@router.get("/{post_id}/comments")
-def list_comments(post_id: str):
+@router.get("/{post_id}/comments", response_model=CommentPage)
+def list_comments(
+    post_id: str, cursor: Optional[str] = Query(None), limit: int = Query(50, ge=1, le=100)
+) -> TrustedJSONResponse:
+    """Top-level comments with authors, oldest first, each with its ``reply_count``."""
     if post_id not in store.posts:
         raise HTTPException(status_code=404, detail="Post not found")
-    comments = store.comments.get(post_id, [])
-    return comments
+    items, next_cursor = store.get_comment_page(post_id, cursor=cursor, limit=limit)
+    return TrustedJSONResponse(
+        CommentPage.model_construct(items=store.with_authors(items), next_cursor=next_cursor)
+    )
+
+
+@router.get("/{post_id}/comments/{comment_id}/replies", response_model=CommentPage)
+def list_replies(
+    post_id: str,
+    comment_id: str,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+) -> TrustedJSONResponse:
+    """Direct replies to a comment, oldest first; deeper levels load the same way."""
+    comment = store.get_comment(comment_id)
+    if comment is None or comment.post_id != post_id:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    items, next_cursor = store.get_replies(comment_id, cursor=cursor, limit=limit)
+    return TrustedJSONResponse(
+        CommentPage.model_construct(items=store.with_authors(items), next_cursor=next_cursor)
+    )
 
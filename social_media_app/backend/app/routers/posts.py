@@ -1,16 +1,45 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 
 from ..data import store
-from ..schemas import CommentWithAuthor, PostDetailResponse, PostWithAuthor
+from ..events import sink
+from ..responses import TrustedJSONResponse
+from ..schemas import (
+    CreatePostRequest,
+    PostDetailResponse,
+    PostWithAuthor,
+    RelatedPost,
+    RelatedPostsResponse,
+)
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
 
+@router.post("", response_model=PostWithAuthor, status_code=201)
+def create_post(body: CreatePostRequest) -> TrustedJSONResponse:
+    """Publish a new post at the head of the feed."""
+    post = store.create_post(body.author_id, body.text)
+    if post is None:
+        raise HTTPException(status_code=404, detail="Author not found")
+    sink.emit("post_created", body.author_id, {"post_id": post.id})
+    author = store.profiles[post.author_id]
+    return TrustedJSONResponse(
+        PostWithAuthor.model_construct(**vars(post), author=author), status_code=201
+    )
+
+
 @router.get("/{post_id}", response_model=PostDetailResponse)
-def get_post_detail(post_id: str, user_id: str = "anonymous") -> PostDetailResponse:
-    """Get detailed view of a single post including all comments."""
+def get_post_detail(
+    post_id: str,
+    user_id: str = "anonymous",
+    comments_limit: int = Query(50, ge=1, le=100),
+) -> TrustedJSONResponse:
+    """Get detailed view of a single post with its first page of top-level comments.
+
+    Replies are not inlined; each comment carries ``reply_count`` and its thread is
+    loaded from ``/posts/{post_id}/comments/{comment_id}/replies``.
+    """
     post = store.get_post(post_id)
     if post is None:
         raise HTTPException(status_code=404, detail="Post not found")
@@ -19,23 +48,44 @@ def get_post_detail(post_id: str, user_id: str = "anonymous") -> PostDetailRespo
     if author is None:
         raise HTTPException(status_code=404, detail="Post author not found")
 
-    post_with_author = PostWithAuthor(**post.model_dump(), author=author)
+    post_with_author = PostWithAuthor.model_construct(**vars(post), author=author)
 
-    # Get all comments with author info
-    comments = store.get_post_comments(post_id)
-    comments_with_authors = []
-    for comment in comments:
-        comment_author = store.get_profile(comment.user_id)
-        if comment_author:
-            comments_with_authors.append(
-                CommentWithAuthor(**comment.model_dump(), author=comment_author)
-            )
+    # Get the first page of top-level comments with author info
+    comments, comments_next_cursor = store.get_comment_page(
+        post_id, cursor=None, limit=comments_limit
+    )
+    comments_with_authors = store.with_authors(comments)
 
     liked_by_user = store.is_liked_by(post_id, user_id)
+    if user_id != "anonymous":
+        store.record_view(post_id, user_id)
+    sink.emit("post_viewed", user_id, {"post_id": post_id})
 
-    return PostDetailResponse(
-        post=post_with_author,
-        comments=comments_with_authors,
-        liked_by_current_user=liked_by_user,
+    return TrustedJSONResponse(
+        PostDetailResponse.model_construct(
+            post=post_with_author,
+            comments=comments_with_authors,
+            comments_next_cursor=comments_next_cursor,
+            liked_by_current_user=liked_by_user,
+            audience=store.get_audience_summary(post_id),
+        )
     )
 
+
+@router.get("/{post_id}/related", response_model=RelatedPostsResponse)
+def get_related_posts(post_id: str, limit: int = Query(10, ge=1, le=50)) -> TrustedJSONResponse:
+    """Posts ranked by overlap in the users who liked or shared them."""
+    if post_id not in store.posts:
+        raise HTTPException(status_code=404, detail="Post not found")
+    items = []
+    for related_id, score, shared in store.related.related(post_id, limit):
+        post = store.posts[related_id]
+        author = store.profiles[post.author_id]
+        items.append(
+            RelatedPost.model_construct(
+                post=PostWithAuthor.model_construct(**vars(post), author=author),
+                score=score,
+                shared_engagers=shared,
+            )
+        )
+    return TrustedJSONResponse(RelatedPostsResponse.model_construct(items=items))
@@ -1,18 +1,58 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
 
 from ..data import store
-from ..schemas import ProfileResponse
+from ..responses import TrustedJSONResponse
+from ..schemas import ActivityResponse, ProfileResponse, ProfilesResponse
 
 router = APIRouter(prefix="/profiles", tags=["profiles"])
 
+MAX_BATCH_IDS = 100
+
+
+@router.get("", response_model=ProfilesResponse)
+def get_profiles(
+    ids: str = Query(..., description="Comma-separated profile IDs"),
+) -> TrustedJSONResponse:
+    """Look up many profiles in one round trip, without their posts."""
+    requested = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if len(requested) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request"
+        )
+    profiles = []
+    missing = []
+    for profile_id in requested:
+        profile = store.get_profile(profile_id)
+        if profile is None:
+            missing.append(profile_id)
+        else:
+            profiles.append(profile)
+    return TrustedJSONResponse(
+        ProfilesResponse.model_construct(profiles=profiles, missing=missing)
+    )
+
 
 @router.get("/{profile_id}", response_model=ProfileResponse)
-def get_profile(profile_id: str) -> ProfileResponse:
+def get_profile(profile_id: str, include_posts: bool = Query(True)) -> TrustedJSONResponse:
     profile = store.get_profile(profile_id)
     if profile is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    posts = store.get_profile_posts(profile_id)
-    return ProfileResponse(profile=profile, posts=posts)
+    posts = store.get_profile_posts(profile_id) if include_posts else None
+    return TrustedJSONResponse(ProfileResponse.model_construct(profile=profile, posts=posts))
+
 
+@router.get("/{profile_id}/activity", response_model=ActivityResponse)
+def get_profile_activity(
+    profile_id: str, cursor: Optional[str] = Query(None), limit: int = Query(20, ge=1, le=100)
+) -> TrustedJSONResponse:
+    """Likes, shares and comments by this user, latest first."""
+    if profile_id not in store.profiles and profile_id not in store.activity:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    items, next_cursor = store.get_user_activity(profile_id, cursor=cursor, limit=limit)
+    return TrustedJSONResponse(
+        ActivityResponse.model_construct(items=items, next_cursor=next_cursor)
+    )
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Query
+
+from ..data import store
+from ..responses import TrustedJSONResponse
+from ..schemas import PostWithAuthor, TrendingPost, TrendingResponse
+
+router = APIRouter(prefix="/trending", tags=["trending"])
+
+
+@router.get("", response_model=TrendingResponse)
+def get_trending(
+    window: str = Query("1h", description="Sliding window: 5m, 1h or 24h"),
+    limit: int = Query(10, ge=1, le=50),
+) -> TrustedJSONResponse:
+    """Posts with the most likes, shares and comments inside the window."""
+    if window not in store.trending.windows:
+        raise HTTPException(status_code=400, detail=f"Unknown window: {window}")
+    items = []
+    for post_id, count in store.trending.top(window, limit):
+        post = store.posts[post_id]
+        author = store.profiles[post.author_id]
+        items.append(
+            TrendingPost.model_construct(
+                post=PostWithAuthor.model_construct(**vars(post), author=author),
+                engagements=count,
+            )
+        )
+    return TrustedJSONResponse(TrendingResponse.model_construct(window=window, items=items))
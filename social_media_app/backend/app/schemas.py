@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -19,6 +19,8 @@ class Comment(BaseModel):
     user_id: str
     text: str
     created_at: str
+    parent_id: Optional[str] = None
+    reply_count: int = 0
 
 
 class Post(BaseModel):
@@ -40,9 +42,59 @@ class FeedResponse(BaseModel):
     next_cursor: Optional[str] = None
 
 
+class RelatedPost(BaseModel):
+    post: PostWithAuthor
+    score: float
+    shared_engagers: int
+
+
+class RelatedPostsResponse(BaseModel):
+    items: List[RelatedPost]
+
+
+class TrendingPost(BaseModel):
+    post: PostWithAuthor
+    engagements: int
+
+
+class TrendingResponse(BaseModel):
+    window: str
+    items: List[TrendingPost]
+
+
+class NormalizedFeedResponse(BaseModel):
+    """Feed page with each author sent once and posts referencing ``author_id``."""
+
+    items: List[Dict[str, Any]]
+    authors: Dict[str, Profile]
+    next_cursor: Optional[str] = None
+
+
 class ProfileResponse(BaseModel):
     profile: Profile
-    posts: List[Post]
+    posts: Optional[List[Post]] = None
+
+
+class ProfilesResponse(BaseModel):
+    profiles: List[Profile]
+    missing: List[str] = Field(default_factory=list)
+
+
+class CreatePostRequest(BaseModel):
+    author_id: str
+    text: str = Field(..., min_length=1, max_length=280)
+
+
+class Activity(BaseModel):
+    kind: Literal["like", "share", "comment"]
+    post_id: str
+    created_at: str
+    comment_id: Optional[str] = None
+
+
+class ActivityResponse(BaseModel):
+    items: List[Activity]
+    next_cursor: Optional[str] = None
 
 
 class LikeRequest(BaseModel):
@@ -52,6 +104,7 @@ class LikeRequest(BaseModel):
 class CommentRequest(BaseModel):
     user_id: str
     text: str
+    parent_id: Optional[str] = Field(None, description="ID of the comment being replied to")
 
 
 class ShareRequest(BaseModel):
@@ -68,8 +121,30 @@ class CommentWithAuthor(Comment):
     author: Profile
 
 
+class EngagementMix(BaseModel):
+    likes: float = 0.0
+    shares: float = 0.0
+    comments: float = 0.0
+
+
+class AudienceSummary(BaseModel):
+    audience_size: int = 0
+    commenter_count: int = 0
+    silent_viewer_count: int = 0
+    silent_viewer_ratio: float = 0.0
+    engagement_mix: EngagementMix = Field(default_factory=EngagementMix)
+    top_reactors: List[Profile] = Field(default_factory=list)
+
+
+class CommentPage(BaseModel):
+    items: List[CommentWithAuthor]
+    next_cursor: Optional[str] = None
+
+
 class PostDetailResponse(BaseModel):
     post: PostWithAuthor
     comments: List[CommentWithAuthor]
+    comments_next_cursor: Optional[str] = None
     liked_by_current_user: bool = False
+    audience: Optional[AudienceSummary] = None
 
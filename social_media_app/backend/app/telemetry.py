@@ -9,12 +9,21 @@ from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from prometheus_client import Gauge
 from prometheus_fastapi_instrumentator import Instrumentator
 
+from .events import sink
+
 
 def init_telemetry(app: FastAPI) -> None:
     # Prometheus metrics
     Instrumentator().instrument(app).expose(app, endpoint="/metrics")
+    Gauge("analytics_queue_depth", "Events waiting in the analytics sink").set_function(
+        sink.queue_depth
+    )
+    Gauge("analytics_events_dropped", "Events dropped by the analytics sink").set_function(
+        lambda: sink.dropped
+    )
 
     # OpenTelemetry traces
     service_name = os.getenv("OTEL_SERVICE_NAME", "social-media-backend")
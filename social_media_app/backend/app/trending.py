@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Window name -> (span in seconds, number of buckets)
+DEFAULT_WINDOWS: Dict[str, Tuple[int, int]] = {
+    "5m": (300, 30),
+    "1h": (3600, 60),
+    "24h": (86400, 96),
+}
+TOP_K = 100
+
+
+class WindowCounter:
+    """Per-post engagement counts over one sliding window.
+
+    The window is a fixed ring of time buckets. Each bucket maps post ID to the
+    engagements seen in that slice of time, and ``totals`` holds the running sum
+    across the ring. When time moves past a bucket its counts are subtracted and
+    the slot is reused, so memory is bounded by buckets x posts active in the
+    window and never grows with history.
+
+    A top-k list is kept beside the totals. Between bucket expirations counts only
+    grow, so an increment can update the list in O(k). An expiration can only
+    shrink counts, which may reorder anything, so the list is rebuilt from the
+    active posts at most once per bucket width.
+    """
+
+    def __init__(self, span: int, buckets: int, now: float, k: int = TOP_K):
+        self.width = span / buckets
+        self.k = k
+        self.buckets: List[Dict[str, int]] = [{} for _ in range(buckets)]
+        self.totals: Dict[str, int] = {}
+        self.head = int(now // self.width)
+        self._top: List[str] = []
+        self._top_stale = False
+
+    def _advance(self, now: float) -> None:
+        epoch = int(now // self.width)
+        steps = epoch - self.head
+        if steps <= 0:
+            return
+        n = len(self.buckets)
+        totals = self.totals
+        for i in range(1, min(steps, n) + 1):
+            slot = (self.head + i) % n
+            for post_id, count in self.buckets[slot].items():
+                left = totals[post_id] - count
+                if left:
+                    totals[post_id] = left
+                else:
+                    del totals[post_id]
+            self.buckets[slot] = {}
+            self._top_stale = True
+        self.head = epoch
+
+    def add(self, post_id: str, now: float) -> None:
+        self._advance(now)
+        bucket = self.buckets[self.head % len(self.buckets)]
+        bucket[post_id] = bucket.get(post_id, 0) + 1
+        totals = self.totals
+        totals[post_id] = totals.get(post_id, 0) + 1
+        if self._top_stale:
+            return
+        top = self._top
+        if post_id not in top:
+            if len(top) < self.k:
+                top.append(post_id)
+            elif totals[post_id] > totals[top[-1]]:
+                top[-1] = post_id
+            else:
+                return
+        top.sort(key=lambda pid: -totals[pid])
+
+    def top(self, limit: int, now: float) -> List[Tuple[str, int]]:
+        self._advance(now)
+        totals = self.totals
+        if self._top_stale:
+            self._top = heapq.nlargest(self.k, totals, key=totals.__getitem__)
+            self._top_stale = False
+        return [(pid, totals[pid]) for pid in self._top[:limit]]
+
+
+class TrendingCounters:
+    """Sliding-window engagement counters for every configured window."""
+
+    def __init__(
+        self,
+        windows: Optional[Dict[str, Tuple[int, int]]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.clock = clock
+        now = clock()
+        self.windows = {
+            name: WindowCounter(span, buckets, now)
+            for name, (span, buckets) in (windows or DEFAULT_WINDOWS).items()
+        }
+        self._lock = threading.Lock()
+
+    def record(self, post_id: str) -> None:
+        now = self.clock()
+        with self._lock:
+            for counter in self.windows.values():
+                counter.add(post_id, now)
+
+    def top(self, window: str, limit: int) -> List[Tuple[str, int]]:
+        with self._lock:
+            return self.windows[window].top(limit, self.clock())
@@ -0,0 +1,41 @@
+"""Bytes-per-page comparison of feed response modes on the seeded store.
+
+Run from ``social_media_app/backend``::
+
+    python -m benchmarks.feed_payload
+"""
+
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+MODES = {
+    "nested": {},
+    "normalized": {"view": "normalized"},
+    "normalized+fields": {"view": "normalized", "fields": "text,created_at,like_count"},
+}
+
+
+def page_bytes(client: TestClient, params: dict, encoding: str) -> int:
+    resp = client.get("/feed", params=params, headers={"Accept-Encoding": encoding})
+    resp.raise_for_status()
+    # Content-Length is the size on the wire; ``resp.content`` is already decoded
+    return int(resp.headers["content-length"])
+
+
+def main(limit: int = 50) -> None:
+    client = TestClient(app)
+    baseline = page_bytes(client, {"limit": limit}, "identity")
+    print(f"feed page of {limit} posts")
+    print(f"{'mode':<20}{'identity':>10}{'gzip':>10}  (share of nested identity bytes)")
+    for name, extra in MODES.items():
+        params = {"limit": limit, **extra}
+        raw = page_bytes(client, params, "identity")
+        gz = page_bytes(client, params, "gzip")
+        print(f"{name:<20}{raw:>10}{gz:>10}  ({raw / baseline:.0%} / {gz / baseline:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Bytes per entity in the in-memory ``DataStore``, checked against stored budgets.
+
+An empty store is filled through its public write methods at several sizes, so
+every secondary index (timelines, audience, activity, co-engagement, trending)
+is included in the cost. Each phase is measured with tracemalloc, and process
+RSS is sampled alongside it. If the largest size goes over a budget in
+``memory_budgets.json``, the top allocation sites for that phase are printed
+and the script exits non-zero.
+
+Run from ``social_media_app/backend``::
+
+    python -m benchmarks.memory                 # check budgets
+    python -m benchmarks.memory --sizes 1000 5000 --update-budgets
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from app.data import DataStore
+from app.schemas import Profile
+
+BUDGETS_PATH = Path(__file__).with_name("memory_budgets.json")
+# Headroom added over measured values when budgets are regenerated
+BUDGET_HEADROOM = 1.25
+TOP_SITES = 10
+
+# Entities written per post at each size, mirroring the seeded data's shape
+PROFILES_PER_POST = 0.1
+COMMENTS_PER_POST = 1.5
+LIKES_PER_POST = 8
+
+
+def rss_bytes() -> int:
+    """Current resident set size; falls back to peak RSS off Linux."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure(
+    phase: Callable[[], int],
+) -> Tuple[float, float, tracemalloc.Snapshot, tracemalloc.Snapshot]:
+    """Run one write phase; return traced and RSS bytes per entity plus snapshots."""
+    gc.collect()
+    before = tracemalloc.take_snapshot()
+    traced_before, _ = tracemalloc.get_traced_memory()
+    rss_before = rss_bytes()
+    count = phase()
+    gc.collect()
+    traced_after, _ = tracemalloc.get_traced_memory()
+    rss_after = rss_bytes()
+    after = tracemalloc.take_snapshot()
+    return (
+        (traced_after - traced_before) / count,
+        (rss_after - rss_before) / count,
+        before,
+        after,
+    )
+
+
+def run_size(posts: int, rng: random.Random) -> Dict[str, dict]:
+    store = DataStore(seed=False)
+    profile_ids: List[str] = []
+    post_ids: List[str] = []
+
+    def add_profiles() -> int:
+        n = max(1, int(posts * PROFILES_PER_POST))
+        for i in range(n):
+            profile = Profile(
+                id=f"profile{i:08d}",
+                handle=f"@user{i}",
+                display_name=f"User {i}",
+                bio="Lorem ipsum dolor sit amet, consectetur adipiscing elit." if i % 3 else None,
+                avatar_url=f"https://api.dicebear.com/7.x/avataaars/svg?seed=user{i}",
+            )
+            store.add_profile(profile)
+            profile_ids.append(profile.id)
+        return n
+
+    def add_posts() -> int:
+        for i in range(posts):
+            post = store.create_post(rng.choice(profile_ids), f"Post number {i} about things")
+            post_ids.append(post.id)
+        return posts
+
+    def add_comments() -> int:
+        n = int(posts * COMMENTS_PER_POST)
+        for i in range(n):
+            store.add_comment(rng.choice(post_ids), rng.choice(profile_ids), f"Comment {i}")
+        return n
+
+    def add_likes() -> int:
+        n = 0
+        for _ in range(posts * LIKES_PER_POST):
+            post_id, user_id = rng.choice(post_ids), rng.choice(profile_ids)
+            if not store.is_liked_by(post_id, user_id):
+                store.add_like(post_id, user_id)
+                n += 1
+        return n
+
+    results = {}
+    for entity, phase in [
+        ("profile", add_profiles),
+        ("post", add_posts),
+        ("comment", add_comments),
+        ("like", add_likes),
+    ]:
+        traced, rss, before, after = measure(phase)
+        results[entity] = {"traced": traced, "rss": rss, "before": before, "after": after}
+    return results
+
+
+def print_top_sites(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> None:
+    for stat in after.compare_to(before, "lineno")[:TOP_SITES]:
+        frame = stat.traceback[0]
+        print(f"      {stat.size_diff / 1024:10.1f} KiB  {frame.filename}:{frame.lineno}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 5_000, 20_000])
+    parser.add_argument("--update-budgets", action="store_true")
+    args = parser.parse_args()
+
+    budgets = json.loads(BUDGETS_PATH.read_text()) if BUDGETS_PATH.exists() else {}
+    tracemalloc.start()
+    rng = random.Random(42)
+    print(f"{'posts':>8}  {'entity':<8}{'traced B/entity':>16}{'rss B/entity':>14}")
+    largest = {}
+    for size in sorted(args.sizes):
+        largest = run_size(size, rng)
+        for entity, result in largest.items():
+            print(f"{size:>8}  {entity:<8}{result['traced']:>16.0f}{result['rss']:>14.0f}")
+    tracemalloc.stop()
+
+    if args.update_budgets:
+        new = {e: round(r["traced"] * BUDGET_HEADROOM) for e, r in largest.items()}
+        BUDGETS_PATH.write_text(json.dumps(new, indent=2) + "\n")
+        print(f"wrote {BUDGETS_PATH.name}")
+        return 0
+
+    failed = False
+    for entity, result in largest.items():
+        budget = budgets.get(entity)
+        if budget is None or result["traced"] <= budget:
+            continue
+        failed = True
+        print(f"\nOVER BUDGET {entity}: {result['traced']:.0f} B > {budget} B; top sites:")
+        print_top_sites(result["before"], result["after"])
+    if not failed:
+        print("\nall entities within budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
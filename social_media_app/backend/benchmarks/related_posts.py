@@ -0,0 +1,73 @@
+"""Latency of /posts/{id}/related lookups on a large synthetic engagement graph.
+
+Engagements follow a Zipf-like popularity curve over posts and users so a few
+posts and users are much busier than the rest, as on a real feed.
+
+Run from ``social_media_app/backend``::
+
+    python -m benchmarks.related_posts --posts 1000000 --users 200000 --engagements 3000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from app.related import CoEngagementIndex
+
+
+def build(posts: int, users: int, engagements: int, seed: int = 7) -> CoEngagementIndex:
+    rng = random.Random(seed)
+    index = CoEngagementIndex()
+    post_weights = [1 / (i + 1) ** 0.8 for i in range(posts)]
+    user_weights = [1 / (i + 1) ** 0.6 for i in range(users)]
+    post_draws = rng.choices(range(posts), weights=post_weights, k=engagements)
+    user_draws = rng.choices(range(users), weights=user_weights, k=engagements)
+    for p, u in zip(post_draws, user_draws):
+        index.record(f"p{p}", f"u{u}")
+    return index
+
+
+def percentiles(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    return f"p50 {statistics.median(ordered):7.3f} ms   p99 {p99:7.3f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--engagements", type=int, default=3_000_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = build(args.posts, args.users, args.engagements)
+    print(f"built index in {time.perf_counter() - start:.1f}s")
+
+    rng = random.Random(11)
+    engaged = [name for name, idx in index._post_index.items() if index._post_users[idx]]
+    targets = rng.sample(engaged, min(args.queries, len(engaged)))
+    for label in ("cold", "cached"):
+        samples = []
+        for post_id in targets:
+            t0 = time.perf_counter()
+            index.related(post_id, 10)
+            samples.append((time.perf_counter() - t0) * 1000)
+        print(f"{label:<8}{percentiles(samples)}")
+
+    # Interleave writes so reads see the invalidated entries being rebuilt
+    samples = []
+    for post_id in targets:
+        index.record(post_id, f"u{rng.randrange(args.users)}")
+        t0 = time.perf_counter()
+        index.related(post_id, 10)
+        samples.append((time.perf_counter() - t0) * 1000)
+    print(f"{'churn':<8}{percentiles(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""CPU per request spent building and serializing responses, before and after
+the trusted fast path.
+
+The "validated" column reproduces what the handlers used to do: build each item
+with ``Model(**other.model_dump(), ...)`` and let FastAPI's ``response_model``
+pass dump the result, validate it again and encode it. The "trusted" column is
+the current path: ``model_construct`` plus one ``to_json`` call.
+
+Run from ``social_media_app/backend``::
+
+    python -m benchmarks.response_validation
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import timeit
+from typing import Callable, Dict, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from app.data import store
+from app.schemas import (
+    CommentWithAuthor,
+    FeedResponse,
+    InteractionResponse,
+    PostDetailResponse,
+    PostWithAuthor,
+    ProfileResponse,
+)
+
+
+def fastapi_serialize(model: BaseModel) -> bytes:
+    """What ``serialize_response`` + ``JSONResponse.render`` do for a returned model."""
+    validated = type(model).model_validate(model.model_dump())
+    return json.dumps(jsonable_encoder(validated.model_dump(mode="json"))).encode()
+
+
+def feed_validated() -> bytes:
+    posts, cursor = store.get_feed(cursor=None, limit=50)
+    items = [PostWithAuthor(**p.model_dump(), author=store.profiles[p.author_id]) for p in posts]
+    return fastapi_serialize(FeedResponse(items=items, next_cursor=cursor))
+
+
+def feed_trusted() -> bytes:
+    posts, cursor = store.get_feed(cursor=None, limit=50)
+    items = [
+        PostWithAuthor.model_construct(**vars(p), author=store.profiles[p.author_id])
+        for p in posts
+    ]
+    return to_json(FeedResponse.model_construct(items=items, next_cursor=cursor))
+
+
+def _busiest_post() -> str:
+    return max(store.comments, key=lambda pid: len(store.comments[pid]))
+
+
+def detail_validated() -> bytes:
+    post = store.posts[_DETAIL_POST]
+    comments = [
+        CommentWithAuthor(**c.model_dump(), author=store.profiles[c.user_id])
+        for c in store.get_post_comments(post.id)
+    ]
+    return fastapi_serialize(
+        PostDetailResponse(
+            post=PostWithAuthor(**post.model_dump(), author=store.profiles[post.author_id]),
+            comments=comments,
+            audience=store.get_audience_summary(post.id),
+        )
+    )
+
+
+def detail_trusted() -> bytes:
+    post = store.posts[_DETAIL_POST]
+    author = store.profiles[post.author_id]
+    comments = [
+        CommentWithAuthor.model_construct(**vars(c), author=store.profiles[c.user_id])
+        for c in store.get_post_comments(post.id)
+    ]
+    return to_json(
+        PostDetailResponse.model_construct(
+            post=PostWithAuthor.model_construct(**vars(post), author=author),
+            comments=comments,
+            liked_by_current_user=False,
+            audience=store.get_audience_summary(post.id),
+        )
+    )
+
+
+def profile_validated() -> bytes:
+    posts = store.get_profile_posts(_PROFILE)
+    return fastapi_serialize(ProfileResponse(profile=store.profiles[_PROFILE], posts=posts))
+
+
+def profile_trusted() -> bytes:
+    posts = store.get_profile_posts(_PROFILE)
+    return to_json(ProfileResponse.model_construct(profile=store.profiles[_PROFILE], posts=posts))
+
+
+def like_validated() -> bytes:
+    post = store.posts[_DETAIL_POST]
+    return fastapi_serialize(InteractionResponse(post=post, liked_by_user=True))
+
+
+def like_trusted() -> bytes:
+    return to_json(
+        InteractionResponse.model_construct(post=store.posts[_DETAIL_POST], liked_by_user=True)
+    )
+
+
+_DETAIL_POST = _busiest_post()
+_PROFILE = max(store.author_timelines, key=lambda a: len(store.author_timelines[a]))
+
+CASES: Dict[str, Tuple[Callable[[], bytes], Callable[[], bytes]]] = {
+    "GET /feed?limit=50": (feed_validated, feed_trusted),
+    "GET /posts/{id}": (detail_validated, detail_trusted),
+    "GET /profiles/{id}": (profile_validated, profile_trusted),
+    "POST /posts/{id}/like": (like_validated, like_trusted),
+}
+
+
+def per_call_us(fn: Callable[[], bytes]) -> float:
+    timer = timeit.Timer(fn, timer=time.process_time)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=5, number=number))
+    return best / number * 1e6
+
+
+def main() -> None:
+    print(f"{'endpoint':<24}{'validated us':>14}{'trusted us':>12}{'saved':>8}")
+    for name, (validated, trusted) in CASES.items():
+        assert json.loads(validated()) == json.loads(trusted()), name
+        before, after = per_call_us(validated), per_call_us(trusted)
+        print(f"{name:<24}{before:>14.1f}{after:>12.1f}{1 - after / before:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
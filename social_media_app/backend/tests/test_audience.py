@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.audience import TOP_REACTORS, PostAudience
+from app.data import store
+from app.main import app
+
+
+class TestPostAudience:
+    """Tests for incremental per-post audience aggregates."""
+
+    def test_silent_viewers_vs_commenters(self):
+        """Viewers count as silent until they comment."""
+        agg = PostAudience()
+        agg.record_view("a")
+        agg.record_view("a")
+        agg.record_view("b")
+        agg.record_like("c")
+        assert len(agg.audience) == 3
+        assert agg.silent == 3
+        agg.record_comment("a")
+        agg.record_comment("a")
+        agg.record_comment("d")
+        assert agg.commenters == {"a", "d"}
+        assert agg.silent == 2
+        assert agg.comments == 3
+
+    def test_top_reactors_are_ranked(self):
+        """Top reactors track the highest reaction counts."""
+        agg = PostAudience()
+        for i in range(TOP_REACTORS):
+            agg.record_like(f"u{i}")
+        agg.record_share("late")  # ties the minimum; does not displace anyone
+        assert "late" not in agg.top_reactors
+        agg.record_comment("late")
+        agg.record_comment("late")
+        assert agg.top_reactors[0] == "late"
+        assert len(agg.top_reactors) == TOP_REACTORS
+        agg.record_share("u3")
+        assert agg.top_reactors[:2] == ["late", "u3"]
+
+
+class TestAudienceSummary:
+    """Tests for the audience summary on post detail."""
+
+    def test_summary_matches_interaction_sets(self):
+        """Aggregates agree with a full recount of the post's interactions."""
+        for post_id in list(store.posts.keys())[:20]:
+            summary = store.get_audience_summary(post_id)
+            likers = store.likes[post_id]
+            sharers = store.shares[post_id]
+            commenters = {c.user_id for c in store.comments[post_id]}
+            audience = likers | sharers | commenters | store.audience[post_id].audience
+            assert summary.audience_size == len(audience)
+            assert summary.commenter_count == len(commenters)
+            assert summary.silent_viewer_count == len(audience - commenters)
+            total = len(likers) + len(sharers) + len(store.comments[post_id])
+            if total:
+                assert abs(summary.engagement_mix.likes - len(likers) / total) < 1e-9
+
+    def test_post_detail_includes_audience(self):
+        """Post detail returns the summary and counts the viewer."""
+        client = TestClient(app)
+        post_id = list(store.posts.keys())[10]
+        before = client.get(f"/posts/{post_id}").json()["audience"]
+        after = client.get(f"/posts/{post_id}?user_id=audience_viewer").json()["audience"]
+        assert after["audience_size"] == before["audience_size"] + 1
+        assert after["silent_viewer_count"] == before["silent_viewer_count"] + 1
+        client.post(f"/posts/{post_id}/comment", json={"user_id": "audience_viewer", "text": "x"})
+        final = client.get(f"/posts/{post_id}?user_id=audience_viewer").json()["audience"]
+        assert final["audience_size"] == after["audience_size"]
+        assert final["commenter_count"] == after["commenter_count"] + 1
+        assert final["silent_viewer_count"] == after["silent_viewer_count"] - 1
+        for profile in final["top_reactors"]:
+            assert profile["id"] in store.profiles
+
+    def test_missing_post_and_empty_mix(self):
+        """Unknown posts have no summary; untouched posts have an empty mix."""
+        assert store.get_audience_summary("does-not-exist") is None
+        store.record_view("does-not-exist", "u1")
+        store.audience["fresh"] = PostAudience()
+        try:
+            summary = store.get_audience_summary("fresh")
+            assert summary.engagement_mix.likes == 0.0
+            assert summary.silent_viewer_ratio == 0.0
+        finally:
+            del store.audience["fresh"]
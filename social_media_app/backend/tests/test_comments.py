@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.data import store
+from app.main import app
+
+
+def _comment(client: TestClient, post_id: str, text: str, parent_id: str | None = None):
+    body = {"user_id": list(store.profiles.keys())[2], "text": text}
+    if parent_id:
+        body["parent_id"] = parent_id
+    return client.post(f"/posts/{post_id}/comment", json=body)
+
+
+class TestCommentThreads:
+    """Tests for threaded replies and lazy child loading."""
+
+    def test_replies_are_threaded_not_inlined(self):
+        """Replies bump counts but stay out of the top-level list."""
+        client = TestClient(app)
+        post_id = list(store.posts.keys())[70]
+        before = store.posts[post_id].comment_count
+        root = _comment(client, post_id, "root").json()["new_comment"]
+        reply = _comment(client, post_id, "reply", root["id"]).json()
+        assert reply["new_comment"]["parent_id"] == root["id"]
+        assert reply["post"]["comment_count"] == before + 2
+        nested = _comment(client, post_id, "deeper", reply["new_comment"]["id"])
+        assert nested.status_code == 200
+
+        top_level = client.get(f"/posts/{post_id}/comments").json()["items"]
+        assert all(c["parent_id"] is None for c in top_level)
+        listed_root = next(c for c in top_level if c["id"] == root["id"])
+        assert listed_root["reply_count"] == 1
+
+        detail = client.get(f"/posts/{post_id}").json()
+        assert [c["id"] for c in detail["comments"]][-1] == root["id"]
+        assert detail["comments"][-1]["reply_count"] == 1
+
+        replies = client.get(f"/posts/{post_id}/comments/{root['id']}/replies").json()
+        assert [c["text"] for c in replies["items"]] == ["reply"]
+        assert replies["items"][0]["author"]["id"] == list(store.profiles.keys())[2]
+        assert listed_root["author"]["id"] == root["user_id"]
+        assert replies["items"][0]["reply_count"] == 1
+
+    def test_reply_pagination(self):
+        """Replies load lazily in cursor pages, oldest first."""
+        client = TestClient(app)
+        post_id = list(store.posts.keys())[71]
+        root = _comment(client, post_id, "thread").json()["new_comment"]
+        for i in range(7):
+            _comment(client, post_id, f"r{i}", root["id"])
+        url = f"/posts/{post_id}/comments/{root['id']}/replies"
+        texts, cursor = [], None
+        while True:
+            params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            page = client.get(url, params=params).json()
+            texts.extend(c["text"] for c in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert texts == [f"r{i}" for i in range(7)]
+
+    def test_post_detail_pages_top_level_comments(self):
+        """Post detail returns a bounded first page plus a cursor to continue."""
+        client = TestClient(app)
+        post_id = list(store.posts.keys())[72]
+        for i in range(4):
+            _comment(client, post_id, f"c{i}")
+        total = len(store.get_post_comments(post_id))
+        detail = client.get(f"/posts/{post_id}", params={"comments_limit": 2}).json()
+        assert len(detail["comments"]) == 2
+        rest = client.get(
+            f"/posts/{post_id}/comments", params={"cursor": detail["comments_next_cursor"]}
+        ).json()
+        assert len(rest["items"]) == total - 2
+        assert rest["next_cursor"] is None
+
+    def test_thread_errors(self):
+        """Bad parents, mismatched posts and bad cursors are handled."""
+        client = TestClient(app)
+        post_id, other_id = list(store.posts.keys())[73:75]
+        assert _comment(client, post_id, "x", "no-such-comment").status_code == 404
+        root = _comment(client, post_id, "root").json()["new_comment"]
+        assert _comment(client, other_id, "x", root["id"]).status_code == 400
+        url = f"/posts/{other_id}/comments/{root['id']}/replies"
+        assert client.get(url).status_code == 404
+        url = f"/posts/{post_id}/comments/{root['id']}/replies"
+        for cursor in ["abc", "-1", "999"]:
+            assert client.get(url, params={"cursor": cursor}).json()["items"] == []
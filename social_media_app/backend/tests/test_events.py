@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from fastapi.testclient import TestClient
+
+from app.data import store
+from app.events import (
+    EventSink,
+    FileExporter,
+    HttpExporter,
+    NullExporter,
+    create_exporter_from_env,
+    sink,
+)
+from app.main import app
+
+
+class RecordingExporter:
+    def __init__(self, fail: bool = False):
+        self.batches: list[list[dict]] = []
+        self.fail = fail
+
+    def export(self, events):
+        if self.fail:
+            raise RuntimeError("backend down")
+        self.batches.append(list(events))
+
+
+class TestEventSink:
+    """Tests for the buffered analytics sink."""
+
+    def test_emit_is_enqueue_only(self):
+        """Events wait in the queue until the flusher runs."""
+        exporter = RecordingExporter()
+        s = EventSink(exporter)
+        assert s.emit("post_viewed", "u1", {"post_id": "p1"}) is True
+        assert s.queue_depth() == 1
+        assert exporter.batches == []
+
+    def test_full_queue_drops_and_counts(self):
+        """A full queue drops new events instead of blocking."""
+        s = EventSink(RecordingExporter(), max_queue_size=2)
+        results = [s.emit("post_viewed", "u1") for _ in range(5)]
+        assert results == [True, True, False, False, False]
+        assert s.dropped == 3
+
+    def test_concurrent_drops_are_all_counted(self):
+        """Drops from many request threads and a failing flusher add up exactly."""
+        s = EventSink(RecordingExporter(fail=True), max_queue_size=10, batch_size=5,
+                      flush_interval=0.001)
+        s.start()
+
+        def worker():
+            for _ in range(2000):
+                s.emit("post_viewed", "u1")
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        s.close()
+        assert s.exported == 0
+        assert s.dropped == 8 * 2000
+
+    def test_flusher_batches_by_size(self):
+        """The background flusher exports full batches and drains on close."""
+        exporter = RecordingExporter()
+        s = EventSink(exporter, batch_size=3, flush_interval=0.05)
+        for i in range(7):
+            s.emit("post_engagement", f"u{i}", {"action": "like"})
+        s.start()
+        s.start()  # idempotent
+        deadline = time.monotonic() + 2
+        while s.exported < 7 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        s.close()
+        assert [len(b) for b in exporter.batches] == [3, 3, 1]
+        assert s.exported == 7
+        assert s.queue_depth() == 0
+
+    def test_close_drains_in_batches(self):
+        """Closing a never-started sink still exports queued events in batches."""
+        exporter = RecordingExporter()
+        s = EventSink(exporter, batch_size=2)
+        for _ in range(5):
+            s.emit("post_viewed", "u1")
+        s.close()
+        assert [len(b) for b in exporter.batches] == [2, 2, 1]
+
+    def test_export_failure_counts_dropped(self):
+        """A failing exporter loses the batch without raising."""
+        s = EventSink(RecordingExporter(fail=True))
+        s.emit("post_viewed", "u1")
+        s.emit("post_viewed", "u2")
+        s.close()
+        assert s.export_errors == 1
+        assert s.dropped == 2
+
+
+class TestExporters:
+    """Tests for the pluggable exporters."""
+
+    def test_file_exporter(self, tmp_path):
+        """Writes one JSON line per event."""
+        path = tmp_path / "events.jsonl"
+        s = EventSink(FileExporter(str(path)))
+        s.emit("post_viewed", "u1", {"post_id": "p1"})
+        s.close()
+        lines = path.read_text().splitlines()
+        assert json.loads(lines[0])["properties"] == {"post_id": "p1"}
+
+    def test_http_exporter(self):
+        """POSTs a PostHog-style batch to a local stand-in server."""
+        received = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                received.append(json.loads(self.rfile.read(length)))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.handle_request)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_port}/batch"
+        HttpExporter(url, api_key="k").export([{"event": "post_viewed"}])
+        thread.join()
+        server.server_close()
+        assert received == [{"api_key": "k", "batch": [{"event": "post_viewed"}]}]
+
+    def test_exporter_from_env(self, monkeypatch):
+        """Selects the exporter from environment variables."""
+        monkeypatch.delenv("ANALYTICS_HTTP_URL", raising=False)
+        monkeypatch.delenv("ANALYTICS_FILE", raising=False)
+        assert isinstance(create_exporter_from_env(), NullExporter)
+        monkeypatch.setenv("ANALYTICS_FILE", "/tmp/events.jsonl")
+        assert isinstance(create_exporter_from_env(), FileExporter)
+        monkeypatch.setenv("ANALYTICS_HTTP_URL", "http://localhost:9/batch")
+        assert isinstance(create_exporter_from_env(), HttpExporter)
+        NullExporter().export([])
+
+
+class TestRouterEvents:
+    """Tests that request handlers enqueue analytics events."""
+
+    def test_handlers_emit_events(self):
+        """View, feed exposure and engagement each enqueue one event."""
+        client = TestClient(app)
+        post_id = list(store.posts.keys())[4]
+        before = sink.queue_depth() + sink.dropped
+        client.get("/feed", params={"limit": 3})
+        client.get(f"/posts/{post_id}")
+        client.post(f"/posts/{post_id}/like", json={"user_id": "events_user"})
+        client.post(f"/posts/{post_id}/share", json={"user_id": "events_user"})
+        client.post(f"/posts/{post_id}/comment", json={"user_id": "events_user", "text": "hi"})
+        assert sink.queue_depth() + sink.dropped == before + 5
+
+    def test_repeat_like_and_share_emit_nothing(self):
+        """Engagement the store ignores is not counted by analytics either."""
+        client = TestClient(app)
+        post_id = list(store.posts.keys())[5]
+        client.post(f"/posts/{post_id}/like", json={"user_id": "repeat_user"})
+        client.post(f"/posts/{post_id}/share", json={"user_id": "repeat_user"})
+        before = sink.queue_depth() + sink.dropped
+        like = client.post(f"/posts/{post_id}/like", json={"user_id": "repeat_user"})
+        share = client.post(f"/posts/{post_id}/share", json={"user_id": "repeat_user"})
+        assert like.status_code == share.status_code == 200
+        assert like.json()["liked_by_user"] is True
+        assert sink.queue_depth() + sink.dropped == before
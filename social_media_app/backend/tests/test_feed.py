@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from fastapi.testclient import TestClient
 
+from app.data import DataStore, store
 from app.main import app
 
 
@@ -39,3 +40,114 @@ class TestGetFeed:
         assert data["items"] == []
         assert data["next_cursor"] is None
 
+
+class TestNormalizedFeed:
+    """Tests for the normalized feed view and sparse fieldsets."""
+
+    def test_normalized_view_dedupes_authors(self):
+        """Authors are returned once in a map keyed by id."""
+        client = TestClient(app)
+        nested = client.get("/feed", params={"limit": 50}).json()
+        data = client.get("/feed", params={"limit": 50, "view": "normalized"}).json()
+        assert len(data["items"]) == len(nested["items"])
+        assert data["next_cursor"] == nested["next_cursor"]
+        author_ids = {item["author_id"] for item in data["items"]}
+        assert set(data["authors"]) == author_ids
+        assert "author" not in data["items"][0]
+        first = nested["items"][0]
+        assert data["authors"][first["author_id"]] == first["author"]
+
+    def test_fields_projection(self):
+        """fields= keeps only the requested columns plus id and author_id."""
+        client = TestClient(app)
+        resp = client.get(
+            "/feed", params={"limit": 5, "view": "normalized", "fields": "text, like_count"}
+        )
+        assert resp.status_code == 200
+        for item in resp.json()["items"]:
+            assert set(item) == {"id", "author_id", "text", "like_count"}
+
+    def test_fields_errors(self):
+        """Unknown columns and fields= on the nested view are rejected."""
+        client = TestClient(app)
+        bad = client.get("/feed", params={"view": "normalized", "fields": "text,password"})
+        assert bad.status_code == 400
+        assert "password" in bad.json()["detail"]
+        nested = client.get("/feed", params={"fields": "text"})
+        assert nested.status_code == 400
+
+    def test_gzip_negotiation(self):
+        """Large pages are gzip-compressed when the client accepts it."""
+        client = TestClient(app)
+        gz = client.get("/feed", params={"limit": 50}, headers={"Accept-Encoding": "gzip"})
+        assert gz.headers.get("content-encoding") == "gzip"
+        plain = client.get("/feed", params={"limit": 50}, headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert gz.json() == plain.json()
+
+
+class TestFeedOrdering:
+    """Tests for the time-ordered index behind the feed."""
+
+    def test_cursor_walk_is_complete_and_ordered(self):
+        """Paging with cursors visits every post once, latest first."""
+        client = TestClient(app)
+        seen: list[dict] = []
+        cursor = None
+        while True:
+            params = {"limit": 7, **({"cursor": cursor} if cursor else {})}
+            page = client.get("/feed", params=params).json()
+            seen.extend(page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert [p["id"] for p in seen] == store.post_ids_ordered
+        stamps = [p["created_at"] for p in seen]
+        assert stamps == sorted(stamps, reverse=True)
+
+    def test_since_returns_only_newer_posts(self):
+        """Polling with since= returns the delta after the client's head."""
+        client = TestClient(app)
+        head = client.get("/feed", params={"limit": 1}).json()["items"][0]["id"]
+        assert client.get("/feed", params={"since": head}).json()["items"] == []
+
+        author_id = list(store.profiles.keys())[0]
+        created = [
+            client.post("/posts", json={"author_id": author_id, "text": f"delta {i}"}).json()
+            for i in range(3)
+        ]
+        delta = client.get("/feed", params={"since": head}).json()
+        assert [p["id"] for p in delta["items"]] == [p["id"] for p in reversed(created)]
+        assert delta["next_cursor"] is None
+
+        first = client.get("/feed", params={"since": head, "limit": 2}).json()["items"]
+        assert [p["id"] for p in first] == [created[1]["id"], created[0]["id"]]
+        rest = client.get("/feed", params={"since": first[0]["id"], "limit": 2}).json()["items"]
+        assert [p["id"] for p in rest] == [created[2]["id"]]
+
+    def test_since_errors(self):
+        """Unknown heads return nothing; since and cursor are exclusive."""
+        client = TestClient(app)
+        assert client.get("/feed", params={"since": "nope"}).json()["items"] == []
+        head = store.post_ids_ordered[0]
+        resp = client.get("/feed", params={"since": head, "cursor": head})
+        assert resp.status_code == 400
+
+    def test_out_of_order_insert_keeps_indexes_sorted(self):
+        """Backdated posts land in place in the global and per-author indexes."""
+        fresh = DataStore()
+        author_id = next(iter(fresh.profiles))
+        post = fresh.create_post(author_id, "hello")
+        assert fresh.post_ids_ordered[0] == post.id
+        assert fresh.get_profile_posts(author_id)[0].id == post.id
+        assert fresh.create_post("nobody", "hello") is None
+        assert fresh.get_feed(cursor=None, limit=0) == ([], None)
+        assert fresh.get_feed_since(post.id, limit=0) == []
+
+        oldest = fresh.posts[fresh.post_ids_ordered[-1]]
+        backdated = oldest.model_copy(update={"id": "backdated", "created_at": "2000-01-01"})
+        fresh._insert_post(backdated)
+        assert fresh.post_ids_ordered[-1] == "backdated"
+        assert fresh.timeline == sorted(fresh.timeline)
+        for timeline in fresh.author_timelines.values():
+            assert timeline == sorted(timeline)
@@ -84,3 +84,30 @@ class TestPostDetail:
             assert resp.status_code == 200
             assert "author" in resp.json()["post"]
 
+
+class TestCreatePost:
+    """Tests for the post creation endpoint."""
+
+    def test_create_post(self):
+        """Creates a post that appears at the head of the feed and profile."""
+        client = TestClient(app)
+        author_id = list(store.profiles.keys())[1]
+        resp = client.post("/posts", json={"author_id": author_id, "text": "Fresh take"})
+        assert resp.status_code == 201
+        data = resp.json()
+        assert data["author"]["id"] == author_id
+        assert data["like_count"] == 0
+        assert client.get("/feed", params={"limit": 1}).json()["items"][0]["id"] == data["id"]
+        profile = client.get(f"/profiles/{author_id}").json()
+        assert profile["posts"][0]["id"] == data["id"]
+        detail = client.get(f"/posts/{data['id']}").json()
+        assert detail["comments"] == []
+
+    def test_create_post_validation(self):
+        """Unknown authors are 404; empty text is rejected."""
+        client = TestClient(app)
+        missing = client.post("/posts", json={"author_id": "nobody", "text": "hi"})
+        assert missing.status_code == 404
+        author_id = list(store.profiles.keys())[1]
+        empty = client.post("/posts", json={"author_id": author_id, "text": ""})
+        assert empty.status_code == 422
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import profiler
+from app.main import app
+from app.routers.debug import TOKEN_ENV
+from app.routers.debug import router as debug_router
+
+
+def _debug_app() -> FastAPI:
+    debug_app = FastAPI()
+    debug_app.include_router(debug_router)
+    return debug_app
+
+
+def busy_worker(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(100))
+
+
+class TestProfiler:
+    """Tests for the on-demand sampling profiler."""
+
+    def test_capture_collapses_other_threads(self):
+        """Collapsed stacks name the thread and its functions root-first."""
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_worker, args=(stop,), name="busy")
+        worker.start()
+        try:
+            stacks = profiler.capture(0.05, 0.001)
+        finally:
+            stop.set()
+            worker.join()
+        lines = [line for line in stacks.splitlines() if line.startswith("thread:busy;")]
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert "busy_worker" in stack.split(";")[-1]
+        assert int(count) >= 1
+
+    def test_concurrent_capture_is_refused(self):
+        """Only one capture may run at a time."""
+        with profiler._capture_lock:
+            assert profiler.capture(0.01) is None
+
+
+class TestDebugRouter:
+    """Tests for the token-guarded /debug/profile endpoint."""
+
+    def test_not_mounted_without_token(self):
+        """The main app has no debug route unless the token is configured."""
+        assert TestClient(app).get("/debug/profile").status_code == 404
+
+    def test_requires_matching_token(self, monkeypatch):
+        """Missing or wrong tokens are rejected."""
+        client = TestClient(_debug_app())
+        monkeypatch.delenv(TOKEN_ENV, raising=False)
+        assert client.get("/debug/profile", headers={"X-Debug-Token": ""}).status_code == 403
+        monkeypatch.setenv(TOKEN_ENV, "secret")
+        assert client.get("/debug/profile").status_code == 403
+        resp = client.get("/debug/profile", headers={"X-Debug-Token": "nope"})
+        assert resp.status_code == 403
+
+    def test_returns_collapsed_stacks(self, monkeypatch):
+        """A valid token returns plain-text collapsed stacks."""
+        monkeypatch.setenv(TOKEN_ENV, "secret")
+        client = TestClient(_debug_app())
+        resp = client.get(
+            "/debug/profile",
+            params={"seconds": 0.05, "interval_ms": 1},
+            headers={"X-Debug-Token": "secret"},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        assert "thread:" in resp.text
+
+    def test_busy_profiler_conflicts(self, monkeypatch):
+        """A second capture while one is running returns 409."""
+        monkeypatch.setenv(TOKEN_ENV, "secret")
+        client = TestClient(_debug_app())
+        with profiler._capture_lock:
+            resp = client.get("/debug/profile", headers={"X-Debug-Token": "secret"})
+        assert resp.status_code == 409
@@ -26,3 +26,86 @@ class TestGetProfile:
         client = TestClient(app)
         resp = client.get("/profiles/does-not-exist")
         assert resp.status_code == 404
+
+
+class TestProfileActivity:
+    """Tests for the per-user activity index and endpoint."""
+
+    def test_activity_records_interactions_latest_first(self):
+        """Likes, shares and comments show up newest first."""
+        client = TestClient(app)
+        user_id = "activity_user"
+        post_ids = list(store.posts.keys())[20:23]
+        client.post(f"/posts/{post_ids[0]}/like", json={"user_id": user_id})
+        client.post(f"/posts/{post_ids[0]}/like", json={"user_id": user_id})  # no-op repeat
+        client.post(f"/posts/{post_ids[1]}/share", json={"user_id": user_id})
+        comment = client.post(
+            f"/posts/{post_ids[2]}/comment", json={"user_id": user_id, "text": "hmm"}
+        ).json()["new_comment"]
+        data = client.get(f"/profiles/{user_id}/activity").json()
+        assert [(a["kind"], a["post_id"]) for a in data["items"]] == [
+            ("comment", post_ids[2]),
+            ("share", post_ids[1]),
+            ("like", post_ids[0]),
+        ]
+        assert data["items"][0]["comment_id"] == comment["id"]
+        assert data["next_cursor"] is None
+
+    def test_activity_pagination(self):
+        """Cursor pages walk the whole history once, in time order."""
+        client = TestClient(app)
+        profile_id = max(
+            store.profiles, key=lambda pid: len(store.get_user_activity(pid, None, 10_000)[0])
+        )
+        full, _ = store.get_user_activity(profile_id, None, 10_000)
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 4, **({"cursor": cursor} if cursor else {})}
+            page = client.get(f"/profiles/{profile_id}/activity", params=params).json()
+            seen.extend(page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert len(seen) == len(full) > 4
+        stamps = [a["created_at"] for a in seen]
+        assert stamps == sorted(stamps, reverse=True)
+
+    def test_activity_errors(self):
+        """Unknown users 404; malformed or out-of-range cursors return nothing."""
+        client = TestClient(app)
+        assert client.get("/profiles/nobody-at-all/activity").status_code == 404
+        profile_id = list(store.profiles.keys())[0]
+        for cursor in ["abc", "-1", "999999"]:
+            resp = client.get(f"/profiles/{profile_id}/activity", params={"cursor": cursor})
+            assert resp.json() == {"items": [], "next_cursor": None}
+
+
+class TestBatchProfiles:
+    """Tests for batch profile lookup and post-less profile reads."""
+
+    def test_batch_lookup(self):
+        """Returns known profiles in request order and lists unknown ids."""
+        client = TestClient(app)
+        a, b = list(store.profiles.keys())[:2]
+        resp = client.get("/profiles", params={"ids": f"{b}, {a},nope,{b}"})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert [p["id"] for p in data["profiles"]] == [b, a]
+        assert data["missing"] == ["nope"]
+        assert "posts" not in data["profiles"][0]
+
+    def test_batch_limits(self):
+        """ids is required and capped."""
+        client = TestClient(app)
+        assert client.get("/profiles").status_code == 422
+        too_many = ",".join(f"id{i}" for i in range(101))
+        assert client.get("/profiles", params={"ids": too_many}).status_code == 400
+
+    def test_profile_without_posts(self):
+        """include_posts=false skips the post list."""
+        client = TestClient(app)
+        profile_id = list(store.profiles.keys())[0]
+        data = client.get(f"/profiles/{profile_id}", params={"include_posts": "false"}).json()
+        assert data["profile"]["id"] == profile_id
+        assert data["posts"] is None
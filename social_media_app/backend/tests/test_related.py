@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import math
+
+from fastapi.testclient import TestClient
+
+from app.data import store
+from app.main import app
+from app.related import CoEngagementIndex
+
+
+class TestCoEngagementIndex:
+    """Tests for sparse co-engagement ranking."""
+
+    def test_ranks_by_overlap(self):
+        """Posts sharing more engagers rank higher; the post itself is excluded."""
+        index = CoEngagementIndex()
+        for user in ["a", "b", "c"]:
+            index.record("p1", user)
+        for user in ["a", "b"]:
+            index.record("p2", user)
+        index.record("p3", "c")
+        index.record("p3", "z")
+        index.record("p4", "z")
+        ranked = index.related("p1", 10)
+        assert [r[0] for r in ranked] == ["p2", "p3"]
+        assert ranked[0][2] == 2
+        assert math.isclose(ranked[0][1], 2 / math.sqrt(3 * 2))
+        assert index.related("p4", 10) == [("p3", 1 / math.sqrt(2), 1)]
+        assert index.related("missing", 10) == []
+
+    def test_cache_is_invalidated_incrementally(self):
+        """Only posts touched by the engaging user are recomputed."""
+        index = CoEngagementIndex()
+        index.record("p1", "a")
+        index.record("p2", "a")
+        index.record("p3", "b")
+        index.record("p4", "b")
+        assert index.related("p1", 5)[0][0] == "p2"
+        assert index.related("p3", 5)[0][0] == "p4"
+        assert index.related("p4", 5)[0][0] == "p3"
+        index.record("p1", "a")  # repeat engagement is a no-op
+        assert set(index._cache) == {0, 2, 3}
+        index.record("p3", "a")
+        # p3 changed, and so did p1 which shares user "a" with it; p4 did not
+        assert set(index._cache) == {3}
+        assert "p3" in [r[0] for r in index.related("p1", 5)]
+
+    def test_ranks_by_returned_score(self):
+        """A post sharing fewer engagers but with fewer engagers overall can rank first."""
+        index = CoEngagementIndex()
+        for user in ["a", "b"]:
+            index.record("p1", user)
+        for user in ["a", "b", "c", "d", "e", "f", "g", "h"]:
+            index.record("broad", user)
+        index.record("narrow", "a")
+        ranked = index.related("p1", 10)
+        assert [r[0] for r in ranked] == ["narrow", "broad"]
+        assert ranked[0][2] < ranked[1][2]
+        assert ranked[0][1] > ranked[1][1]
+        # A new engager on "narrow" lowers its score without touching p1's users
+        for user in ["x", "y", "z"]:
+            index.record("narrow", user)
+        assert [r[0] for r in index.related("p1", 10)] == ["broad", "narrow"]
+
+    def test_no_overlap(self):
+        """A post whose engagers touched nothing else has no related posts."""
+        index = CoEngagementIndex()
+        index.record("p1", "a")
+        assert index.related("p1", 5) == []
+
+
+class TestRelatedEndpoint:
+    """Tests for /posts/{post_id}/related."""
+
+    def test_related_matches_brute_force(self):
+        """Endpoint ranking agrees with a full scan over the like/share sets."""
+        client = TestClient(app)
+        post_id = max(store.posts, key=lambda pid: len(store.likes[pid] | store.shares[pid]))
+        engagers = store.likes[post_id] | store.shares[post_id]
+        expected = {}
+        for other in store.posts:
+            users = store.likes[other] | store.shares[other]
+            if other != post_id and engagers & users:
+                expected[other] = (len(engagers & users), len(users))
+        data = client.get(f"/posts/{post_id}/related", params={"limit": 5}).json()
+        assert len(data["items"]) == min(5, len(expected))
+        scores = {
+            other: shared / math.sqrt(len(engagers) * degree)
+            for other, (shared, degree) in expected.items()
+        }
+        best = sorted(scores.values(), reverse=True)[:5]
+        for item, score in zip(data["items"], best):
+            assert math.isclose(item["score"], score)
+            shared, _ = expected[item["post"]["id"]]
+            assert item["shared_engagers"] == shared
+        assert data["items"][0]["post"]["author"]["id"] in store.profiles
+
+    def test_related_404(self):
+        """Unknown posts return 404."""
+        client = TestClient(app)
+        assert client.get("/posts/does-not-exist/related").status_code == 404
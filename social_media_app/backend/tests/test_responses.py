@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.data import store
+from app.main import app
+from app.responses import TrustedJSONResponse
+from app.schemas import (
+    FeedResponse,
+    InteractionResponse,
+    NormalizedFeedResponse,
+    PostDetailResponse,
+    ProfileResponse,
+)
+
+
+class TestTrustedResponses:
+    """Responses built without validation still satisfy their schemas."""
+
+    def test_bodies_validate_against_response_models(self):
+        """Each fast-path body round-trips through its declared model unchanged."""
+        client = TestClient(app)
+        post_id = store.post_ids_ordered[0]
+        author_id = store.posts[post_id].author_id
+        cases = [
+            ("/feed", FeedResponse),
+            ("/feed?view=normalized", NormalizedFeedResponse),
+            (f"/posts/{post_id}?user_id=trusted_viewer", PostDetailResponse),
+            (f"/profiles/{author_id}", ProfileResponse),
+        ]
+        for url, model in cases:
+            body = client.get(url).json()
+            assert model.model_validate(body).model_dump(mode="json") == body
+
+        like = client.post(f"/posts/{post_id}/like", json={"user_id": "trusted_user"}).json()
+        assert InteractionResponse.model_validate(like).model_dump(mode="json") == like
+
+    def test_render_handles_plain_collections(self):
+        """Lists of models render to JSON bytes."""
+        comments = store.comments[store.post_ids_ordered[0]]
+        resp = TrustedJSONResponse(comments)
+        assert resp.media_type == "application/json"
+        assert resp.body.startswith(b"[")
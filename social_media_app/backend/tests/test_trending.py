@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.data import store
+from app.main import app
+from app.trending import TrendingCounters, WindowCounter
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestWindowCounter:
+    """Tests for the bucketed ring-buffer window."""
+
+    def test_counts_expire_as_window_slides(self):
+        """Engagements drop out once their bucket leaves the window."""
+        counter = WindowCounter(span=60, buckets=6, now=0)
+        counter.add("a", 1)
+        counter.add("a", 15)
+        counter.add("b", 15)
+        assert counter.top(10, 30) == [("a", 2), ("b", 1)]
+        assert counter.top(10, 65) == [("a", 1), ("b", 1)]
+        assert counter.top(10, 80) == []
+        assert counter.totals == {}
+
+    def test_long_idle_gap_clears_ring(self):
+        """Jumping ahead more than a full window empties every bucket once."""
+        counter = WindowCounter(span=60, buckets=6, now=0)
+        counter.add("a", 5)
+        counter.add("a", 1_000_000)
+        assert counter.top(10, 1_000_000) == [("a", 1)]
+        assert sum(len(b) for b in counter.buckets) == 1
+
+    def test_top_k_tracks_increments(self):
+        """The top list is maintained incrementally and capped at k."""
+        counter = WindowCounter(span=60, buckets=6, now=0, k=2)
+        for post_id in ["a", "b", "c"]:
+            counter.add(post_id, 1)
+        assert [pid for pid, _ in counter.top(5, 1)] == ["a", "b"]
+        counter.add("c", 2)
+        assert counter.top(5, 2) == [("c", 2), ("a", 1)]
+        counter.add("b", 3)
+        counter.add("b", 3)
+        assert counter.top(5, 3) == [("b", 3), ("c", 2)]
+
+
+class TestTrendingCounters:
+    """Tests for multi-window trending counters."""
+
+    def test_windows_diverge_over_time(self):
+        """Short windows forget old engagement before long ones do."""
+        clock = FakeClock()
+        counters = TrendingCounters(clock=clock)
+        counters.record("old")
+        clock.now += 600
+        counters.record("new")
+        assert counters.top("5m", 5) == [("new", 1)]
+        assert sorted(counters.top("1h", 5)) == [("new", 1), ("old", 1)]
+        clock.now += 86400
+        assert counters.top("24h", 5) == []
+
+
+class TestTrendingEndpoint:
+    """Tests for /trending."""
+
+    def test_trending_reflects_live_engagement(self):
+        """Recently engaged posts rank by engagement count."""
+        client = TestClient(app)
+        hot, warm = list(store.posts.keys())[40:42]
+        for i in range(3):
+            client.post(f"/posts/{hot}/like", json={"user_id": f"trend_{i}"})
+        client.post(f"/posts/{warm}/share", json={"user_id": "trend_0"})
+        client.post(f"/posts/{hot}/comment", json={"user_id": "trend_0", "text": "🔥"})
+        data = client.get("/trending", params={"window": "5m", "limit": 50}).json()
+        assert data["window"] == "5m"
+        counts = {item["post"]["id"]: item["engagements"] for item in data["items"]}
+        assert counts[hot] >= 4 and counts[warm] >= 1
+        ranked = [item["engagements"] for item in data["items"]]
+        assert ranked == sorted(ranked, reverse=True)
+        assert data["items"][0]["post"]["author"]["id"] in store.profiles
+
+    def test_unknown_window(self):
+        """Unknown windows are rejected."""
+        client = TestClient(app)
+        assert client.get("/trending", params={"window": "7d"}).status_code == 400
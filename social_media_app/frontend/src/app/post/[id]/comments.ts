@@ -0,0 +1,35 @@
+import type { PostDetailResponse } from "@/lib/api";
+
+// Post detail carries only the first page of top-level comments; the rest and
+// every reply thread are loaded page by page from the comment endpoints.
+export type ThreadComment = PostDetailResponse["comments"][number] & {
+  parent_id?: string | null;
+  reply_count?: number;
+};
+
+export type PagedPostDetail = PostDetailResponse & {
+  comments_next_cursor?: string | null;
+};
+
+export interface CommentPage {
+  items: ThreadComment[];
+  next_cursor: string | null;
+}
+
+const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
+
+async function fetchCommentPage(path: string, cursor?: string | null): Promise<CommentPage> {
+  const url = new URL(`${API_BASE_URL}${path}`);
+  if (cursor) url.searchParams.set("cursor", cursor);
+  const res = await fetch(url.toString());
+  if (!res.ok) throw new Error(`GET ${path} failed: ${res.status}`);
+  return res.json();
+}
+
+export function fetchComments(postId: string, cursor?: string | null) {
+  return fetchCommentPage(`/posts/${postId}/comments`, cursor);
+}
+
+export function fetchReplies(postId: string, commentId: string, cursor?: string | null) {
+  return fetchCommentPage(`/posts/${postId}/comments/${commentId}/replies`, cursor);
+}
@@ -11,6 +11,75 @@ import {
 } from "@/lib/api";
 import type { PostDetailResponse } from "@/lib/api";
 import { Button, Card } from "@/components/ui";
+import { fetchComments, fetchReplies } from "./comments";
+import type { CommentPage, PagedPostDetail, ThreadComment } from "./comments";
+
+function CommentThread({ postId, comment }: { postId: string; comment: ThreadComment }) {
+  const [replies, setReplies] = useState<CommentPage | null>(null);
+  const [isLoading, setIsLoading] = useState(false);
+  const replyCount = comment.reply_count ?? 0;
+
+  const loadReplies = async () => {
+    if (isLoading) return;
+    setIsLoading(true);
+    try {
+      const page = await fetchReplies(postId, comment.id, replies?.next_cursor);
+      setReplies({
+        items: [...(replies?.items ?? []), ...page.items],
+        next_cursor: page.next_cursor,
+      });
+    } catch (err) {
+      console.error("Loading replies failed:", err);
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
+  return (
+    <div>
+      <div className="mb-2 flex items-start gap-3">
+        {comment.author.avatar_url && (
+          <img
+            src={comment.author.avatar_url}
+            alt={comment.author.display_name}
+            className="h-10 w-10 rounded-full"
+          />
+        )}
+        <div className="flex-1">
+          <div className="flex items-center gap-2">
+            <span className="font-semibold">
+              {comment.author.display_name}
+            </span>
+            <span className="text-sm text-gray-600">
+              {comment.author.handle}
+            </span>
+            <span className="text-sm text-gray-400">·</span>
+            <span className="text-sm text-gray-400">
+              {new Date(comment.created_at).toLocaleString()}
+            </span>
+          </div>
+          <p className="mt-1">{comment.text}</p>
+        </div>
+      </div>
+      {replies && replies.items.length > 0 && (
+        <div className="ml-8 mt-3 space-y-3 border-l border-gray-200 pl-4">
+          {replies.items.map((reply) => (
+            <CommentThread key={reply.id} postId={postId} comment={reply} />
+          ))}
+        </div>
+      )}
+      {replyCount > 0 && (replies === null || replies.next_cursor) && (
+        <Button onClick={loadReplies} disabled={isLoading} className="ml-8 text-blue-600">
+          {isLoading
+            ? "Loading..."
+            : replies === null
+              ? `View ${replyCount} ${replyCount === 1 ? "reply" : "replies"}`
+              : "More replies"}
+        </Button>
+      )}
+    </div>
+  );
+}
 
 export default function PostDetail() {
   const params = useParams();
@@ -18,6 +87,9 @@ export default function PostDetail() {
   const postId = params.id as string;
   const [commentText, setCommentText] = useState("");
   const [isSubmitting, setIsSubmitting] = useState(false);
+  // Top-level comments past the first page, loaded with the detail's cursor
+  const [moreComments, setMoreComments] = useState<CommentPage | null>(null);
+  const [isLoadingComments, setIsLoadingComments] = useState(false);
 
   const { data, error, isLoading } = useSWR<PostDetailResponse>(
     `/posts/${postId}`,
@@ -53,6 +125,7 @@ export default function PostDetail() {
     try {
       await commentPost(postId, "current-user", commentText);
       setCommentText("");
+      setMoreComments(null);
       mutate(`/posts/${postId}`);
     } catch (err) {
       console.error("Comment failed:", err);
@@ -62,6 +135,22 @@ export default function PostDetail() {
     }
   };
 
+  const handleLoadMoreComments = async (cursor: string) => {
+    if (isLoadingComments) return;
+    setIsLoadingComments(true);
+    try {
+      const page = await fetchComments(postId, cursor);
+      setMoreComments({
+        items: [...(moreComments?.items ?? []), ...page.items],
+        next_cursor: page.next_cursor,
+      });
+    } catch (err) {
+      console.error("Loading comments failed:", err);
+    } finally {
+      setIsLoadingComments(false);
+    }
+  };
+
   if (isLoading) {
     return (
       <div className="min-h-screen bg-gray-50 p-4">
@@ -91,6 +180,10 @@ export default function PostDetail() {
   }
 
   const { post, comments, liked_by_current_user } = data;
+  const shownComments: ThreadComment[] = [...comments, ...(moreComments?.items ?? [])];
+  const commentsCursor = moreComments
+    ? moreComments.next_cursor
+    : ((data as PagedPostDetail).comments_next_cursor ?? null);
   const timeAgo = new Date(post.created_at).toLocaleString();
 
   return (
@@ -170,42 +263,28 @@ export default function PostDetail() {
         {/* Comments List */}
         <div className="space-y-3">
           <h2 className="text-xl font-bold">
-            Comments ({comments.length})
+            Comments ({post.comment_count})
           </h2>
-          {comments.length === 0 ? (
+          {shownComments.length === 0 ? (
             <Card className="p-6 text-center text-gray-500">
               No comments yet. Be the first to comment!
             </Card>
           ) : (
-            comments.map((comment) => (
+            shownComments.map((comment) => (
               <Card key={comment.id} className="p-4">
-                <div className="mb-2 flex items-start gap-3">
-                  {comment.author.avatar_url && (
-                    <img
-                      src={comment.author.avatar_url}
-                      alt={comment.author.display_name}
-                      className="h-10 w-10 rounded-full"
-                    />
-                  )}
-                  <div className="flex-1">
-                    <div className="flex items-center gap-2">
-                      <span className="font-semibold">
-                        {comment.author.display_name}
-                      </span>
-                      <span className="text-sm text-gray-600">
-                        {comment.author.handle}
-                      </span>
-                      <span className="text-sm text-gray-400">·</span>
-                      <span className="text-sm text-gray-400">
-                        {new Date(comment.created_at).toLocaleString()}
-                      </span>
-                    </div>
-                    <p className="mt-1">{comment.text}</p>
-                  </div>
-                </div>
+                <CommentThread postId={postId} comment={comment} />
               </Card>
             ))
           )}
+          {commentsCursor && (
+            <Button
+              onClick={() => handleLoadMoreComments(commentsCursor)}
+              disabled={isLoadingComments}
+              className="w-full"
+            >
+              {isLoadingComments ? "Loading..." : "Load more comments"}
+            </Button>
+          )}
         </div>
       </div>
     </div>
@@ -0,0 +1,8 @@
+import os
+
+# Tests never call OpenRouter or Opik; set before config is imported
+os.environ["LLM_BACKEND"] = "fake"
+os.environ.setdefault("OPIK_TRACK_DISABLE", "true")
+os.environ["CHECKPOINTS"] = "false"
+os.environ["FAKE_LLM_LATENCY_MS"] = "0"
+os.environ["FAKE_LLM_TOKENS_PER_SECOND"] = "0"
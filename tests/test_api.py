@@ -0,0 +1,137 @@
+import asyncio
+import json
+
+import config
+from api.server import ChatAPI
+from lib.checkpoints import CheckpointStore
+
+
+async def _request(app, method: str, path: str, body=None):
+    """Drive the ASGI app once; returns (status, body bytes)"""
+    data = json.dumps(body).encode() if body is not None else b""
+    sent = []
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": data, "more_body": False}
+        await asyncio.Event().wait()  # client stays connected
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": method, "path": path}, receive, send)
+    assert not sent[-1].get("more_body"), "response body was left open"
+    status = next(m["status"] for m in sent if m["type"] == "http.response.start")
+    return status, b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+
+
+def _events(stream: bytes) -> list:
+    events = []
+    for block in stream.decode().strip().split("\n\n"):
+        name, data = block.split("\n", 1)
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+async def _conversation(app):
+    status, body = await _request(app, "POST", "/sessions")
+    assert status == 201
+    thread_id = json.loads(body)["thread_id"]
+    turns = []
+    for turn in range(1, config.MAX_TURNS + 1):
+        status, stream = await _request(
+            app, "POST", f"/sessions/{thread_id}/turns", {"message": "Rent keeps going up."}
+        )
+        assert status == 200, f"turn {turn} -> {status}"
+        turns.append(_events(stream))
+    status, _ = await _request(
+        app, "POST", f"/sessions/{thread_id}/turns", {"message": "One more thing."}
+    )
+    _, state = await _request(app, "GET", f"/sessions/{thread_id}")
+    return turns, status, json.loads(state)
+
+
+def test_turns_stream_until_the_closing_message():
+    turns, after_close, state = asyncio.run(_conversation(ChatAPI()))
+
+    for turn, events in enumerate(turns[:-1], start=1):
+        names = [name for name, _ in events]
+        assert names[-1] == "done" and names.count("done") == 1
+        assert "token" in names
+        done = events[-1][1]
+        assert done["turn_count"] == turn
+        assert done["conversation_complete"] is False
+        assert done["closing_message"] is None
+        reply = "".join(data["text"] for name, data in events if name == "token")
+        assert state["messages"][2 * turn]["content"] == reply
+
+    last = turns[-1][-1][1]
+    assert last["conversation_complete"] is True
+    assert last["closing_message"] == state["messages"][-1]["content"]
+    assert after_close == 409
+    assert state["turn_count"] == config.MAX_TURNS
+    assert state["conversation_complete"] is True
+
+
+def test_errors_and_resume_from_checkpoint(tmp_path):
+    async def run():
+        store = CheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+        app = ChatAPI(checkpoints=store)
+        assert (await _request(app, "GET", "/sessions/missing"))[0] == 404
+        assert (await _request(app, "GET", "/sessions"))[0] == 405
+        _, body = await _request(app, "POST", "/sessions")
+        thread_id = json.loads(body)["thread_id"]
+        path = f"/sessions/{thread_id}/turns"
+        assert (await _request(app, "POST", path, {"message": " "}))[0] == 400
+        assert (await _request(app, "POST", path, {"message": "Prices are up."}))[0] == 200
+
+        resumed = ChatAPI(checkpoints=store)  # e.g. another process, or after an idle sweep
+        _, state = await _request(resumed, "GET", f"/sessions/{thread_id}")
+        assert json.loads(state)["turn_count"] == 1
+        assert (await _request(resumed, "POST", path, {"message": "And rent."}))[0] == 200
+        store.close()
+
+    asyncio.run(run())
+
+
+def test_failed_turn_sends_error_event_and_rolls_back():
+    async def run():
+        app = ChatAPI()
+        _, body = await _request(app, "POST", "/sessions")
+        thread_id = json.loads(body)["thread_id"]
+        path = f"/sessions/{thread_id}/turns"
+        assert (await _request(app, "POST", path, {"message": "Prices are up."}))[0] == 200
+        before = json.loads((await _request(app, "GET", f"/sessions/{thread_id}"))[1])
+
+        async def failing_turn(history, turn_count):
+            yield {"reflection": None, "message_chunk": "Which ", "is_complete": False,
+                   "is_closing": False, "should_confirm": False}
+            raise RuntimeError("LLM connection reset")
+
+        app.sessions[thread_id].flow.aprocess_turn_streaming = failing_turn
+        status, stream = await _request(app, "POST", path, {"message": "And rent."})
+        after = json.loads((await _request(app, "GET", f"/sessions/{thread_id}"))[1])
+        return status, _events(stream), before, after
+
+    status, events, before, after = asyncio.run(run())
+    assert status == 200
+    assert [name for name, _ in events] == ["token", "error"]
+    assert after == before
+
+
+def test_idle_sessions_are_swept_on_lookup():
+    async def run():
+        app = ChatAPI(idle_timeout=30)
+        ids = [json.loads((await _request(app, "POST", "/sessions"))[1])["thread_id"]
+               for _ in range(2)]
+        app.sessions[ids[0]].last_used -= 100
+        app._last_sweep -= 100
+        status, _ = await _request(app, "GET", f"/sessions/{ids[1]}")
+        return app, ids, status
+
+    app, ids, status = asyncio.run(run())
+    assert status == 200
+    assert list(app.sessions) == [ids[1]]
@@ -0,0 +1,56 @@
+import sqlite3
+
+from agents import IssueConfidence, ReflectionOutput
+from lib.checkpoints import Checkpoint, CheckpointStore
+
+REFLECTION = ReflectionOutput(
+    is_confident=False, turn_count=2, confident_issues=["Inflation"], uncertain_issues=[],
+    issue_details=[IssueConfidence(issue_name="Inflation", confidence_level=1, user_cares=True)],
+)
+MESSAGES = [
+    {"role": "assistant", "content": "What matters most to you?"},
+    {"role": "user", "content": "Prices keep going up."},
+]
+
+
+def test_json_round_trip():
+    checkpoint = Checkpoint("t1", MESSAGES, 2, REFLECTION, reflected_upto=2)
+    assert Checkpoint.from_json(checkpoint.to_json()) == checkpoint
+    empty = Checkpoint("t2", [], 0, None)
+    assert Checkpoint.from_json(empty.to_json()) == empty
+
+
+def test_save_flush_load_from_another_connection(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    store = CheckpointStore(path, flush_interval=0.01)
+    checkpoint = Checkpoint("t1", MESSAGES, 2, REFLECTION, reflected_upto=2)
+    store.save(Checkpoint("t1", MESSAGES[:1], 1, None))
+    store.save(checkpoint)  # replaces the unwritten one
+    assert store.load("t1") == checkpoint  # served before it reaches disk
+    store.flush()
+    assert store.writes >= 1
+
+    conn = sqlite3.connect(path)
+    (state,) = conn.execute("SELECT state FROM checkpoints WHERE thread_id = 't1'").fetchone()
+    conn.close()
+    assert Checkpoint.from_json(state) == checkpoint
+
+    other = CheckpointStore(path)
+    assert other.load("t1") == checkpoint
+    assert other.load("missing") is None
+    other.close()
+    store.close()
+
+
+def test_delete_and_close_write_pending(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    store = CheckpointStore(path, flush_interval=60)
+    store.save(Checkpoint("t1", MESSAGES, 1, None))
+    store.save(Checkpoint("t2", MESSAGES, 1, None))
+    store.delete("t1")
+    store.close()  # does not wait out the flush interval
+
+    reopened = CheckpointStore(path)
+    assert reopened.load("t1") is None
+    assert reopened.load("t2").turn_count == 1
+    reopened.close()
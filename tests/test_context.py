@@ -0,0 +1,65 @@
+from lib.context import MESSAGE_OVERHEAD, ContextManager, clip, count_tokens
+
+
+def _history(n: int, words: int = 30) -> list:
+    return [
+        {"role": "user" if i % 2 else "assistant", "content": f"message {i} " + "word " * words}
+        for i in range(n)
+    ]
+
+
+def _tokens(window) -> int:
+    recent = sum(count_tokens(m["content"]) + MESSAGE_OVERHEAD for m in window.messages)
+    summary = count_tokens(window.summary) + MESSAGE_OVERHEAD if window.summary else 0
+    return recent + summary
+
+
+def test_clip():
+    assert clip("short text", 10) == "short text"
+    clipped = clip("one two three four five six seven eight", 3)
+    assert clipped == "one two…"
+    assert count_tokens("abcd") == 1 and count_tokens("abcde") == 2
+
+
+def test_history_that_fits_is_kept_whole():
+    history = _history(4)
+    window = ContextManager({"router": 1000}).fit(history, "router")
+    assert window.summary == ""
+    assert window.messages == history
+
+
+def test_agent_without_budget_gets_everything():
+    history = _history(50)
+    assert ContextManager({"router": 100}).fit(history, "conversation").messages == history
+
+
+def test_long_history_stays_within_budget():
+    manager = ContextManager({"router": 300}, summary_share=0.25)
+    history = _history(40)
+    window = manager.fit(history, "router")
+    recent = sum(count_tokens(m["content"]) + MESSAGE_OVERHEAD for m in window.messages)
+    assert recent <= 300 - int(300 * 0.25)
+    assert window.messages == history[-len(window.messages):]
+    assert _tokens(window) <= 300
+    assert window.summary.startswith(f"Summary of the {40 - len(window.messages)} earlier")
+    # Only the newest earlier messages fit; the rest are counted as omitted
+    assert "older messages omitted" in window.summary
+    assert f"message {39 - len(window.messages)} " in window.summary
+
+
+def test_latest_message_is_kept_even_if_over_budget():
+    history = [*_history(3), {"role": "user", "content": "long " * 500}]
+    window = ContextManager({"router": 100}).fit(history, "router")
+    assert window.messages == history[-1:]
+
+
+def test_growing_and_rewritten_history():
+    manager = ContextManager({"router": 300})
+    history = _history(40)
+    for n in range(1, 41):
+        assert _tokens(manager.fit(history[:n], "router")) <= 300
+    # A history that is not an extension of the cached one starts the caches over
+    rewritten = [*history[:-1], {"role": "user", "content": "changed " * 60}]
+    assert manager.fit(rewritten, "router") == ContextManager({"router": 300}).fit(
+        rewritten, "router"
+    )
@@ -0,0 +1,41 @@
+import json
+
+import config
+from agents.reflection_agent import ReflectionAgent
+
+
+def _reflection(turn_count: int, issues: list) -> dict:
+    return {
+        "is_confident": False,
+        "turn_count": turn_count,
+        "confident_issues": issues,
+        "uncertain_issues": [i for i in config.ISSUES if i not in issues],
+        "issue_details": [
+            {"issue_name": issue, "confidence_level": 1, "user_cares": True} for issue in issues
+        ],
+    }
+
+
+def test_scripted_reflections_apply_in_delta_mode(tmp_path, monkeypatch):
+    script = tmp_path / "reflections.json"
+    script.write_text(json.dumps([
+        _reflection(1, ["Inflation"]),
+        _reflection(2, ["Inflation", "Health care affordability"]),
+    ]))
+    monkeypatch.setattr(config, "FAKE_LLM_REFLECTIONS", str(script))
+    agent = ReflectionAgent(use_cache=False)
+    history = [
+        {"role": "assistant", "content": "What matters most to you?"},
+        {"role": "user", "content": "Prices keep going up."},
+    ]
+
+    first = agent.analyze(history, 1)
+    assert first.confident_issues == ["Inflation"]
+
+    new_messages = [
+        {"role": "assistant", "content": "Anything else?"},
+        {"role": "user", "content": "My prescriptions cost a fortune."},
+    ]
+    second = agent.analyze_delta(first, new_messages, 2)
+    assert agent.last_call_stats["mode"] == "delta"
+    assert set(second.confident_issues) == {"Inflation", "Health care affordability"}
@@ -0,0 +1,79 @@
+import asyncio
+
+import config
+from lib.issue_classifier import IssuePreclassifier, get_preclassifier
+from lib.telemetry import LocalCollector, TraceExporter
+from workflows.conversation_flow import ConversationFlow
+
+
+def _classify(text: str):
+    return IssuePreclassifier().classify([{"role": "user", "content": text}])
+
+
+def test_clear_single_issue_is_resolved_locally():
+    result = _classify("I worry about inflation every time I shop.")
+    assert not result.ambiguous
+    assert result.issues == ["Inflation"]
+
+
+def test_negated_issue_is_ambiguous():
+    result = _classify("I don't care about immigration")
+    # The phrase still scores, but the turn must not be tagged as caring about it
+    assert result.ambiguous
+    assert result.issues == ["Immigration"]
+
+
+def test_phrase_shared_between_issues_is_ambiguous():
+    # "washington" is listed under both dysfunction and corruption, half weight each
+    result = _classify("Washington is the problem.")
+    assert result.ambiguous
+    assert result.issues == []
+    assert (result.scores > 0).sum() == 2
+
+
+def test_no_match_is_ambiguous():
+    assert _classify("Hard to say, really.").ambiguous
+
+
+def test_only_user_messages_are_scored():
+    result = IssuePreclassifier().classify([
+        {"role": "assistant", "content": "Is immigration on your mind?"},
+        {"role": "user", "content": "Mostly the deficit."},
+    ])
+    assert result.issues == ["Federal budget deficit"]
+
+
+def test_get_preclassifier_is_cached():
+    assert get_preclassifier() is get_preclassifier()
+    assert get_preclassifier.cache_info().currsize == 1
+
+
+def test_preclassifier_is_off_unless_enabled(monkeypatch):
+    monkeypatch.setattr(config, "PRECLASSIFIER", False)
+    exporter = TraceExporter(LocalCollector())
+    assert ConversationFlow(trace_exporter=exporter).preclassifier is None
+    assert ConversationFlow(preclassify=True, trace_exporter=exporter).preclassifier \
+        is get_preclassifier()
+    exporter.shutdown()
+
+
+def _reflect(flow: ConversationFlow, history: list, turn_count: int):
+    return asyncio.run(flow._areflect(history, turn_count))
+
+
+def test_ambiguous_turns_go_to_the_llm():
+    exporter = TraceExporter(LocalCollector())
+    flow = ConversationFlow(preclassify=True, trace_exporter=exporter)
+    history = [{"role": "user", "content": "My insulin costs a fortune."}]
+    _reflect(flow, history, 1)
+    assert flow.reflection_counts == {"local": 1, "llm": 0}
+    assert flow.last_reflection.confident_issues == ["Health care affordability"]
+
+    history += [
+        {"role": "assistant", "content": "Anything else?"},
+        {"role": "user", "content": "I don't care about immigration"},
+    ]
+    _reflect(flow, history, 2)
+    assert flow.reflection_counts == {"local": 1, "llm": 1}
+    assert flow._reflection_call["mode"] != "local"
+    exporter.shutdown()
@@ -0,0 +1,42 @@
+import asyncio
+import gc
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from lib.llm import _PerLoopAsyncClient
+
+
+def _completion(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "test",
+        "choices": [{"index": 0, "finish_reason": "stop",
+                     "message": {"role": "assistant", "content": "hello"}}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    })
+
+
+def test_each_event_loop_gets_its_own_pool():
+    client = _PerLoopAsyncClient(transport=httpx.MockTransport(_completion))
+
+    async def pool_and_status():
+        response = await client.get("http://test/ping")
+        return client._pool(), client._pool(), response.status_code
+
+    first, same, status = asyncio.run(pool_and_status())
+    second, _, _ = asyncio.run(pool_and_status())
+    assert first is same
+    assert first is not second
+    assert status == 200
+    del first, same, second
+    gc.collect()
+    assert len(client._pools) == 0  # pools are released with their loops
+
+
+def test_chat_model_survives_successive_asyncio_runs():
+    model = ChatOpenAI(
+        model="test", api_key="test", base_url="http://test/v1",
+        http_async_client=_PerLoopAsyncClient(transport=httpx.MockTransport(_completion)),
+    )
+    for _ in range(2):
+        assert asyncio.run(model.ainvoke("hi")).content == "hello"
@@ -0,0 +1,139 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import config
+import lib.llm_cache
+from lib.fake_llm import FakeChatModel
+from lib.llm_cache import CachedChatModel, LLMCache, maybe_cached
+
+
+class CountingFake(FakeChatModel):
+    def __init__(self):
+        super().__init__(replies=["one two three"], latency=0, tokens_per_second=0)
+        self.calls = 0
+
+    def stream(self, messages, config=None):
+        self.calls += 1
+        yield from super().stream(messages, config)
+
+    async def astream(self, messages, config=None):
+        self.calls += 1
+        async for chunk in super().astream(messages, config):
+            yield chunk
+
+
+class CountingModel:
+    model_name = "counting"
+    temperature = 0
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages, config=None):
+        self.calls += 1
+        return AIMessage(content=f"reply {self.calls}")
+
+
+def test_hit_does_not_write(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), max_bytes=10_000)
+    cache.put("a", ["hello"])
+    changes = cache._conn.total_changes
+    assert cache.get("a") == ["hello"]
+    assert cache.get("missing") is None
+    assert cache._conn.total_changes == changes
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+
+def test_eviction_honours_pending_hits(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), max_bytes=30)
+    cache.put("old", ["x" * 8])
+    cache.put("new", ["y" * 8])
+    assert cache.get("old") == ["x" * 8]  # now the most recently used
+    cache.put("third", ["z" * 8])
+    assert cache.get("new") is None
+    assert cache.get("old") == ["x" * 8]
+    cache.close()
+
+
+def test_close_writes_pending_hits(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = LLMCache(path, max_bytes=10_000)
+    cache.put("a", ["hello"])
+    before = cache._conn.execute("SELECT last_used FROM responses").fetchone()[0]
+    cache.get("a")
+    cache.close()
+    reopened = LLMCache(path, max_bytes=10_000)
+    after = reopened._conn.execute("SELECT last_used FROM responses").fetchone()[0]
+    assert after > before
+    reopened.close()
+
+
+def test_cached_model_answers_repeat_prompts(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), max_bytes=10_000)
+    model = CountingModel()
+    cached = CachedChatModel(model, cache)
+    messages = [HumanMessage(content="hi")]
+    first = asyncio.run(cached.ainvoke(messages))
+    second = asyncio.run(cached.ainvoke(messages))
+    assert first.content == second.content == "reply 1"
+    assert model.calls == 1
+    cache.close()
+
+
+def test_running_total_tracks_replace_and_eviction(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = LLMCache(path, max_bytes=30)
+    cache.put("a", ["x" * 8])
+    cache.put("a", ["x" * 4])  # replacing an entry counts only its new size
+    cache.put("b", ["y" * 8])
+    cache.put("c", ["z" * 8])  # over the cap: "a" is evicted
+    on_disk = cache._conn.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+    assert cache.total_bytes() == on_disk == 24
+    cache.close()
+    assert LLMCache(path, max_bytes=30).total_bytes() == 24
+
+
+def test_stream_replays_recorded_chunks(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), max_bytes=10_000)
+    model = CountingFake()
+    cached = CachedChatModel(model, cache)
+    messages = [HumanMessage(content="hi")]
+    first = [chunk.content for chunk in cached.stream(messages)]
+    second = [chunk.content for chunk in cached.stream(messages)]
+    assert first == ["one ", "two ", "three", ""]
+    assert second == first
+    assert model.calls == 1
+    cache.close()
+
+
+def test_astream_replays_recorded_chunks(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), max_bytes=10_000)
+    model = CountingFake()
+    cached = CachedChatModel(model, cache)
+    messages = [HumanMessage(content="hi")]
+
+    async def collect():
+        return [chunk.content async for chunk in cached.astream(messages)]
+
+    first = asyncio.run(collect())
+    assert asyncio.run(collect()) == first == ["one ", "two ", "three", ""]
+    assert model.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+
+def test_maybe_cached_per_agent(tmp_path, monkeypatch):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), max_bytes=10_000)
+    monkeypatch.setattr(lib.llm_cache, "_cache", cache)
+    monkeypatch.setattr(config, "LLM_CACHE_AGENTS", {"router"})
+    model = CountingFake()
+
+    wrapped = maybe_cached(model, "router")
+    assert isinstance(wrapped, CachedChatModel) and wrapped.cache is cache
+    assert maybe_cached(model, "reflection") is model
+    # An explicit switch overrides LLM_CACHE_AGENTS either way
+    assert maybe_cached(model, "router", enabled=False) is model
+    assert isinstance(maybe_cached(model, "reflection", enabled=True), CachedChatModel)
+    cache.close()
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from lib.partial_json import StreamingJSONParser, repair_json
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": 1, "b": [true, null]}', {"a": 1, "b": [True, None]}),
+    ('```json\n{"a": [1, 2,], "b": None}\n```', {"a": [1, 2], "b": None}),
+    ('Sure, here it is:\n```\n{"a": 1}\n```\nAnything else? {"b": 2}', {"a": 1}),
+    ('{"is_confident": true, "confident_issues": ["Infl', {
+        "is_confident": True, "confident_issues": [],
+    }),
+    ('{"a": 12', {"a": 12}),
+    ('{"a": True, "b": ', {"a": True}),
+    ('{"a": "line\none"}', {"a": "line\none"}),
+    ('{"a": "x" "b": 2}', {"a": "x", "b": 2}),
+    ("no json here", None),
+    ("", None),
+])
+def test_repair_json(text, expected):
+    assert repair_json(text) == expected
+
+
+def test_snapshot_leaves_out_incomplete_values():
+    parser = StreamingJSONParser()
+    parser.feed('{"a": 12')
+    assert parser.snapshot() == {}  # the number may still grow
+    parser.feed(', "b": "par')
+    assert parser.snapshot() == {"a": 12}
+    parser.feed('tial", "c": [1')
+    assert parser.snapshot() == {"a": 12, "b": "partial", "c": []}
+
+
+def test_complete_keys_as_chunks_arrive():
+    reply = json.dumps({
+        "is_confident": False,
+        "confident_issues": ["Inflation"],
+        "uncertain_issues": [],
+        "issue_details": [{"issue_name": "Inflation", "confidence_level": 1}],
+    })
+    parser = StreamingJSONParser()
+    seen = []
+    for i in range(0, len(reply), 7):
+        parser.feed(reply[i:i + 7])
+        seen.append(set(parser.complete_keys))
+    assert seen[0] == set()
+    assert "is_confident" in seen[len(seen) // 2]
+    assert seen[-1] == {"is_confident", "confident_issues", "uncertain_issues", "issue_details"}
+    assert parser.done
+    assert parser.snapshot() == json.loads(reply)
+
+
+def test_fenced_stream_ignores_trailing_text():
+    parser = StreamingJSONParser()
+    for chunk in ["```js", "on\n{\"a\"", ": [1]}\n`", "``\n{\"b\": 2}"]:
+        parser.feed(chunk)
+    assert parser.done
+    assert parser.snapshot() == {"a": [1]}
@@ -0,0 +1,77 @@
+import json
+
+import config
+from agents import IssueConfidence, ReflectionOutput
+from agents.reflection_agent import ReflectionAgent
+
+
+def _previous(turn_count: int = 2) -> ReflectionOutput:
+    return ReflectionOutput(
+        is_confident=False, turn_count=turn_count,
+        confident_issues=["Inflation", "Cost of living"],
+        uncertain_issues=[i for i in config.ISSUES if i not in ("Inflation", "Cost of living")],
+        issue_details=[
+            IssueConfidence(issue_name="Inflation", confidence_level=2, user_cares=True),
+            IssueConfidence(issue_name="Cost of living", confidence_level=1, user_cares=True),
+        ],
+    )
+
+
+def _details(reflection: ReflectionOutput) -> dict:
+    return {d.issue_name: (d.confidence_level, d.user_cares) for d in reflection.issue_details}
+
+
+def _merge(updates: list, turn_count: int = 3) -> ReflectionOutput:
+    agent = ReflectionAgent(use_cache=False)
+    return agent._merge(_previous(), json.dumps({"issue_updates": updates}), turn_count)
+
+
+def test_totals_are_taken_as_given():
+    merged = _merge([{"issue_name": "Inflation", "confidence_level": 3, "user_cares": True}])
+    # "previous count plus new signals" is already summed by the model
+    assert _details(merged)["Inflation"] == (3, True)
+    assert _details(merged)["Cost of living"] == (1, True)
+
+
+def test_user_cares_false_removes_issue_from_confident():
+    merged = _merge([{"issue_name": "Inflation", "confidence_level": 2, "user_cares": False}])
+    assert merged.confident_issues == ["Cost of living"]
+    assert "Inflation" in merged.uncertain_issues
+    assert _details(merged)["Inflation"] == (2, False)
+
+
+def test_empty_or_unparseable_delta_keeps_previous_state():
+    agent = ReflectionAgent(use_cache=False)
+    for raw in ['{"issue_updates": []}', "not json at all"]:
+        merged = agent._merge(_previous(), raw, 3)
+        assert _details(merged) == _details(_previous())
+        assert merged.turn_count == 3
+
+
+def test_unknown_issues_and_bad_entries_are_ignored():
+    merged = _merge([
+        {"issue_name": "Space exploration", "confidence_level": 5, "user_cares": True},
+        {"issue_name": "Immigration", "confidence_level": "lots"},
+        {"issue_name": "Immigration", "confidence_level": 1, "user_cares": True},
+    ])
+    assert set(_details(merged)) == {"Inflation", "Cost of living", "Immigration"}
+    assert merged.confident_issues == [
+        i for i in config.ISSUES if i in ("Inflation", "Cost of living", "Immigration")
+    ]
+
+
+def test_confidence_waits_for_min_turns():
+    agent = ReflectionAgent(use_cache=False)
+    early = agent.apply_updates(_previous(), [], config.MIN_TURNS_FOR_CONFIDENCE - 1)
+    ready = agent.apply_updates(_previous(), [], config.MIN_TURNS_FOR_CONFIDENCE)
+    assert not early.is_confident
+    assert ready.is_confident
+
+
+def test_apply_updates_without_previous_state():
+    agent = ReflectionAgent(use_cache=False)
+    update = IssueConfidence(issue_name="Taxes and government spending", confidence_level=1,
+                             user_cares=True)
+    merged = agent.apply_updates(None, [update], 1)
+    assert merged.confident_issues == ["Taxes and government spending"]
+    assert merged.issue_details == [update]
@@ -0,0 +1,141 @@
+import asyncio
+
+import config
+from agents import ReflectionOutput
+from lib.telemetry import LocalCollector, TraceExporter
+from workflows.conversation_flow import ConversationFlow
+
+HISTORY = [
+    {"role": "assistant", "content": "What matters most to you?"},
+    {"role": "user", "content": "Prices keep going up."},
+    {"role": "assistant", "content": "Tell me more."},
+    {"role": "user", "content": "Rent mostly."},
+]
+
+
+def _reflection(turn_count: int, confident: list) -> ReflectionOutput:
+    return ReflectionOutput(
+        is_confident=False, turn_count=turn_count, confident_issues=confident,
+        uncertain_issues=[i for i in config.ISSUES if i not in confident], issue_details=[],
+    )
+
+
+class FakeRouter:
+    """Records each router call and whether it ran to the end or was cancelled"""
+
+    def __init__(self, chunk_delay: float = 0.01):
+        self.calls = []
+        self.chunk_delay = chunk_delay
+
+    async def aroute_streaming(self, reflection, conversation_history):
+        call = {"reflection": reflection, "cancelled": False, "finished": False}
+        self.calls.append(call)
+        try:
+            for word in ["Which ", "issue ", f"#{len(self.calls)}?"]:
+                await asyncio.sleep(self.chunk_delay)
+                yield word
+            call["finished"] = True
+        except (asyncio.CancelledError, GeneratorExit):
+            call["cancelled"] = True
+            raise
+
+
+def _flow(router: FakeRouter, previous: ReflectionOutput) -> ConversationFlow:
+    flow = ConversationFlow(
+        preclassify=False, trace_exporter=TraceExporter(LocalCollector(), flush_interval=0.01)
+    )
+    flow.router_agent = router
+    flow.last_reflection = previous
+    flow._reflected_upto = 2
+    return flow
+
+
+def _delta_reflection(flow, reflection: ReflectionOutput, delay: float):
+    async def aanalyze_delta(previous, new_messages, turn_count):
+        await asyncio.sleep(delay)
+        return reflection
+
+    flow.reflection_agent.aanalyze_delta = aanalyze_delta
+
+
+async def _run_turn(flow, turn_count: int) -> list:
+    return [r async for r in flow.aprocess_turn_streaming(HISTORY, turn_count)]
+
+
+def test_matching_reflection_commits_the_speculative_stream(monkeypatch):
+    monkeypatch.setattr(config, "INCREMENTAL_REFLECTION", True)
+    router = FakeRouter()
+    flow = _flow(router, _reflection(1, ["Inflation"]))
+    # The reflection finishes after the speculative router has streamed everything
+    _delta_reflection(flow, _reflection(2, ["Inflation"]), delay=0.1)
+
+    results = asyncio.run(_run_turn(flow, 2))
+
+    assert len(router.calls) == 1
+    assert router.calls[0]["finished"]
+    assert router.calls[0]["reflection"].turn_count == 2
+    assert "".join(r["message_chunk"] for r in results) == "Which issue #1?"
+    assert results[-1]["is_complete"] and not results[-1]["is_closing"]
+    assert results[-1]["reflection"] == _reflection(2, ["Inflation"])
+
+
+def test_mismatched_reflection_cancels_and_restarts_routing(monkeypatch):
+    monkeypatch.setattr(config, "INCREMENTAL_REFLECTION", True)
+    router = FakeRouter(chunk_delay=0.05)
+    flow = _flow(router, _reflection(1, ["Inflation"]))
+    fresh = _reflection(2, ["Inflation", "Cost of living"])
+    _delta_reflection(flow, fresh, delay=0.02)
+
+    results = asyncio.run(_run_turn(flow, 2))
+
+    assert len(router.calls) == 2
+    assert router.calls[0]["cancelled"] and not router.calls[0]["finished"]
+    assert router.calls[1]["reflection"] == fresh
+    assert router.calls[1]["finished"]
+    # Nothing buffered by the discarded speculation reaches the user
+    assert "".join(r["message_chunk"] for r in results) == "Which issue #2?"
+
+
+def test_no_speculation_without_a_routing_previous_reflection(monkeypatch):
+    monkeypatch.setattr(config, "INCREMENTAL_REFLECTION", True)
+    router = FakeRouter()
+    confident = _reflection(1, ["Inflation"]).model_copy(
+        update={"is_confident": True, "uncertain_issues": []}
+    )
+    flow = _flow(router, confident)
+    _delta_reflection(flow, _reflection(2, ["Inflation"]), delay=0.01)
+
+    asyncio.run(_run_turn(flow, 2))
+
+    assert len(router.calls) == 1
+    assert router.calls[0]["reflection"] == _reflection(2, ["Inflation"])
+
+
+def test_early_aclose_cancels_reflection_and_router(monkeypatch):
+    monkeypatch.setattr(config, "INCREMENTAL_REFLECTION", False)
+    router = FakeRouter()
+    flow = _flow(router, _reflection(1, ["Inflation"]))
+    reflection_state = {"cancelled": False}
+
+    async def aanalyze(history, turn_count, on_routing_fields=None):
+        # Routing fields arrive early; the rest of the reflection never does
+        on_routing_fields(_reflection(turn_count, ["Inflation"]))
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            reflection_state["cancelled"] = True
+            raise
+
+    flow.reflection_agent.aanalyze = aanalyze
+
+    async def consume_one():
+        turn = flow.aprocess_turn_streaming(HISTORY, 2)
+        first = await turn.__anext__()
+        await turn.aclose()
+        await asyncio.sleep(0.01)  # let the cancellations run
+        return first
+
+    first = asyncio.wait_for(consume_one(), timeout=5)
+    assert asyncio.run(first)["message_chunk"] == "Which "
+    assert reflection_state["cancelled"]
+    assert router.calls[0]["cancelled"] and not router.calls[0]["finished"]
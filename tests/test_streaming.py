@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from lib.streaming import acoalesce_chunks, coalesce_chunks
+
+
+def _turn(chunks: list, final: str = "") -> list:
+    results = [
+        {"reflection": None, "message_chunk": c, "is_complete": False, "should_confirm": False}
+        for c in chunks
+    ]
+    results.append(
+        {"reflection": "R", "message_chunk": final, "is_complete": True, "should_confirm": False}
+    )
+    return results
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+def _coalesce_async(results, **kwargs) -> list:
+    async def collect():
+        return [r async for r in acoalesce_chunks(_aiter(results), **kwargs)]
+
+    return asyncio.run(collect())
+
+
+def _coalesce_sync(results, **kwargs) -> list:
+    return list(coalesce_chunks(iter(results), **kwargs))
+
+
+@pytest.fixture(params=[_coalesce_sync, _coalesce_async], ids=["sync", "async"])
+def coalesce(request):
+    return request.param
+
+
+def test_first_chunk_then_batches(coalesce):
+    out = coalesce(_turn(["a", "b", "c", "d"]), interval=60, max_chars=2)
+    assert [r["message_chunk"] for r in out] == ["a", "bc", "d", ""]
+    assert [r["is_complete"] for r in out] == [False, False, False, True]
+
+
+def test_leftover_text_is_not_merged_into_final_result(coalesce):
+    out = coalesce(_turn(["Hello", " there", " friend"]), interval=60, max_chars=1000)
+    assert out[-2] == {"reflection": None, "message_chunk": " there friend",
+                       "is_complete": False, "should_confirm": False}
+    assert out[-1]["is_complete"] and out[-1]["message_chunk"] == ""
+    assert out[-1]["reflection"] == "R"
+    assert "".join(r["message_chunk"] for r in out) == "Hello there friend"
+
+
+def test_closing_message_passes_through(coalesce):
+    out = coalesce(_turn([], final="Thanks for sharing!"), interval=60, max_chars=1000)
+    assert out == _turn([], final="Thanks for sharing!")
+
+
+def test_zero_interval_releases_every_chunk(coalesce):
+    results = _turn(["a", "b", "c"])
+    assert coalesce(results, interval=0, max_chars=1000) == results
+
+
+def test_stops_after_final_result(coalesce):
+    results = _turn(["a"]) + _turn(["ignored"])
+    assert [r["message_chunk"] for r in coalesce(results, interval=0, max_chars=1)] == ["a", ""]
@@ -0,0 +1,134 @@
+import threading
+import time
+
+from lib.telemetry import LocalCollector, TraceExporter
+
+
+class GatedCollector(LocalCollector):
+    """LocalCollector whose exports wait until ``gate`` is set"""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+
+    def __call__(self, batch: list) -> None:
+        self.gate.wait()
+        super().__call__(batch)
+
+
+class FailingCollector(LocalCollector):
+    """LocalCollector that rejects its first ``failures`` batches"""
+
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    def __call__(self, batch: list) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("collector unavailable")
+        super().__call__(batch)
+
+
+def _wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_full_queue_drops_and_counts():
+    collector = GatedCollector()
+    exporter = TraceExporter(collector, max_queue=2, batch_size=1)
+    assert exporter.submit(0)
+    # The worker holds record 0 in a stalled export, leaving the queue empty
+    _wait_for(lambda: exporter.metrics()["queue_depth"] == 0)
+
+    assert [exporter.submit(i) for i in range(1, 5)] == [True, True, False, False]
+    collector.gate.set()
+    exporter.shutdown()
+
+    assert collector.traces == [0, 1, 2]
+    metrics = exporter.metrics()
+    assert metrics["submitted"] == 3
+    assert metrics["dropped"] == 2
+    assert metrics["exported"] == 3
+    assert metrics["max_queue_depth"] == 2
+
+
+def test_batches_fill_up_to_batch_size():
+    collector = LocalCollector()
+    exporter = TraceExporter(collector, batch_size=3, flush_interval=10.0)
+    for i in range(7):
+        exporter.submit(i)
+    _wait_for(lambda: len(collector.batches) == 2)
+    # The last record waits for more until the interval or shutdown
+    assert exporter.metrics()["exported"] == 6
+
+    exporter.shutdown()
+    assert collector.batches == [[0, 1, 2], [3, 4, 5], [6]]
+    assert exporter.metrics()["batches"] == 3
+
+
+def test_partial_batch_is_flushed_after_interval():
+    collector = LocalCollector()
+    exporter = TraceExporter(collector, batch_size=100, flush_interval=0.05)
+    exporter.submit("a")
+    _wait_for(lambda: collector.batches == [["a"]])
+    exporter.submit("b")
+    _wait_for(lambda: len(collector.batches) == 2)
+    assert collector.batches == [["a"], ["b"]]
+    exporter.shutdown()
+
+
+def test_shutdown_drains_queue_and_rejects_new_records():
+    collector = LocalCollector()
+    exporter = TraceExporter(collector, batch_size=2, flush_interval=10.0)
+    for i in range(5):
+        exporter.submit(i)
+    exporter.shutdown()
+
+    assert collector.traces == [0, 1, 2, 3, 4]
+    assert not exporter.submit(5)
+    exporter.shutdown()  # idempotent
+    metrics = exporter.metrics()
+    assert metrics["submitted"] == metrics["exported"] == 5
+    assert metrics["queue_depth"] == 0
+
+
+def test_failed_batch_is_counted_and_export_continues():
+    collector = FailingCollector(failures=1)
+    exporter = TraceExporter(collector, batch_size=2, flush_interval=10.0)
+    for i in range(4):
+        exporter.submit(i)
+    exporter.shutdown()
+
+    assert collector.traces == [2, 3]
+    metrics = exporter.metrics()
+    assert metrics["failed_batches"] == 1
+    assert metrics["batches"] == 1
+    assert metrics["exported"] == 2
+
+
+def test_every_accepted_record_is_exported_across_shutdown():
+    collector = LocalCollector()
+    exporter = TraceExporter(collector, max_queue=100_000, batch_size=50, flush_interval=0.01)
+    accepted = []
+
+    def producer(name):
+        count = 0
+        while exporter.submit((name, count)):
+            count += 1
+        accepted.append(count)
+
+    threads = [threading.Thread(target=producer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    _wait_for(lambda: exporter.metrics()["submitted"] > 100)
+    exporter.shutdown()
+    for t in threads:
+        t.join()
+
+    metrics = exporter.metrics()
+    assert metrics["submitted"] == sum(accepted)
+    assert metrics["exported"] == metrics["submitted"] == len(collector.traces)
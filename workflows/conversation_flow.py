@@ -1,117 +1,302 @@
-import opik
-from opik import opik_context
+import asyncio
+import datetime
+import threading
+from contextlib import suppress
 
 import config
+from agents import ReflectionOutput
 from agents.conversation_agent import ConversationAgent
 from agents.reflection_agent import ReflectionAgent
 from agents.router_agent import RouterAgent
+from lib.checkpoints import Checkpoint
+from lib.context import ContextManager
+from lib.issue_classifier import get_preclassifier
+from lib.telemetry import get_trace_exporter
+
+PROJECT_NAME = "Issue Discovery Chatbot"
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Process-wide event loop that drives the async flow for sync callers (Streamlit)"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="conversation-flow", daemon=True).start()
+        return _loop
+
+
+def _routing_key(reflection: ReflectionOutput) -> tuple:
+    """The reflection fields the router prompt depends on"""
+    return (
+        reflection.is_confident,
+        reflection.turn_count,
+        tuple(reflection.confident_issues),
+        tuple(reflection.uncertain_issues),
+    )
+
+
+class _SpeculativeRoute:
+    """Router stream started before the turn's reflection is known.
+
+    Chunks are buffered until the flow either commits to the stream (the fresh
+    reflection routes the same way) or cancels it.
+    """
+
+    def __init__(self, reflection: ReflectionOutput, chunks):
+        self.reflection = reflection
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task = asyncio.ensure_future(self._fill(chunks))
+
+    async def _fill(self, chunks):
+        try:
+            async for chunk in chunks:
+                self._queue.put_nowait(chunk)
+        finally:
+            self._queue.put_nowait(None)
+
+    def matches(self, reflection: ReflectionOutput) -> bool:
+        return _routing_key(self.reflection) == _routing_key(reflection)
+
+    async def stream(self):
+        while (chunk := await self._queue.get()) is not None:
+            yield chunk
+        await self._task  # re-raise a failed LLM call
+
+    async def cancel(self):
+        self._task.cancel()
+        # A discarded speculation's failure is irrelevant to the turn
+        with suppress(asyncio.CancelledError, Exception):
+            await self._task
 
 
 class ConversationFlow:
-    def __init__(self, opik_tracer=None, thread_id=None):
-        self.conversation_agent = ConversationAgent(opik_tracer)
-        self.reflection_agent = ReflectionAgent(opik_tracer)
-        self.router_agent = RouterAgent(opik_tracer)
+    def __init__(self, opik_tracer=None, thread_id=None, speculative_routing=True,
+                 preclassify=None, trace_exporter=None):
+        # One context manager per conversation, so the agents share its summary cache
+        self.context = ContextManager()
+        self.conversation_agent = ConversationAgent(opik_tracer, context=self.context)
+        self.reflection_agent = ReflectionAgent(opik_tracer, context=self.context)
+        self.router_agent = RouterAgent(opik_tracer, context=self.context)
         self.thread_id = thread_id
         self.opik_tracer = opik_tracer
+        self.speculative_routing = speculative_routing
+        self.last_reflection = None
+        # Number of history messages the last reflection has already seen
+        self._reflected_upto = 0
+        if preclassify is None:
+            preclassify = config.PRECLASSIFIER
+        self.preclassifier = get_preclassifier() if preclassify else None
+        # How each turn's reflection was produced, and the stats of the latest one
+        self.reflection_counts = {"local": 0, "llm": 0}
+        self._reflection_call = None
+        # Turn traces go to a background queue; see lib/telemetry.py
+        self.trace_exporter = trace_exporter or get_trace_exporter()
 
     def get_opening_message(self) -> str:
         return self.conversation_agent.get_opening_message()
 
-    @opik.track(project_name="Issue Discovery Chatbot")
-    def _process_turn_with_trace(self, conversation_history: list, turn_count: int, reflection):
-        """Process turn logic with Opik tracking"""
-        # Update trace with thread_id
-        if self.thread_id:
-            opik_context.update_current_trace(
-                thread_id=self.thread_id,
-                tags=["streaming", "chatbot", "issue-discovery"]
-            )
-        
-        # This method is just for creating the trace
-        # The actual work is done in process_turn_streaming
+    def checkpoint(self, messages: list, turn_count: int,
+                   conversation_complete: bool = False) -> Checkpoint:
+        """Snapshot of this conversation for a CheckpointStore"""
+        return Checkpoint(
+            thread_id=self.thread_id,
+            messages=list(messages),
+            turn_count=turn_count,
+            last_reflection=self.last_reflection,
+            conversation_complete=conversation_complete,
+            reflected_upto=self._reflected_upto,
+        )
+
+    def restore(self, checkpoint: Checkpoint) -> None:
+        """Continue the conversation saved in ``checkpoint``"""
+        self.thread_id = checkpoint.thread_id
+        self.last_reflection = checkpoint.last_reflection
+        self._reflected_upto = checkpoint.reflected_upto
+
+    def _turn_trace(self, conversation_history: list, turn_count: int, reflection,
+                    start_time: datetime.datetime) -> dict:
+        """Opik trace for one turn; the LLM calls inside it are logged by OpikTracer"""
         return {
-            "turn_count": turn_count,
-            "reflection": reflection,
-            "thread_id": self.thread_id
+            "name": "process_turn",
+            "project_name": PROJECT_NAME,
+            "start_time": start_time,
+            "end_time": datetime.datetime.now(datetime.timezone.utc),
+            "input": {"conversation_history": conversation_history, "turn_count": turn_count},
+            "output": {
+                "turn_count": turn_count,
+                "reflection": reflection.model_dump(),
+                "reflection_call": self._reflection_call,
+                "thread_id": self.thread_id,
+            },
+            "thread_id": self.thread_id,
+            "tags": ["streaming", "chatbot", "issue-discovery"] if self.thread_id else None,
         }
 
-    def process_turn_streaming(self, conversation_history: list, turn_count: int):
+    def _should_route(self, reflection: ReflectionOutput, turn_count: int) -> bool:
+        """True when the turn continues the conversation via the router"""
+        if turn_count >= config.MAX_TURNS:
+            return False
+        return not (reflection.is_confident and not reflection.uncertain_issues)
+
+    def _start_speculation(self, conversation_history: list, turn_count: int):
+        """Start routing on the previous reflection if it already implies the continue path"""
+        previous = self.last_reflection
+        if not self.speculative_routing or previous is None:
+            return None
+        guess = previous.model_copy(update={"turn_count": turn_count})
+        if not self._should_route(guess, turn_count):
+            return None
+        return _SpeculativeRoute(guess, self.router_agent.aroute_streaming(guess, conversation_history))
+
+    async def _areflect(
+        self, conversation_history: list, turn_count: int, on_routing_fields=None
+    ) -> ReflectionOutput:
+        """Local pre-classification when unambiguous, otherwise the reflection LLM.
+
+        The LLM does a full analysis on the first turn and delta updates on the
+        running state afterwards. A full analysis streams, and reports its routing
+        fields through ``on_routing_fields`` before the JSON is finished.
         """
-        Process one turn of the conversation with streaming.
-        Yields: {
-            'reflection': ReflectionOutput,
-            'message_chunk': str,
-            'is_complete': bool,
-            'should_confirm': bool
-        }
+        previous = self.last_reflection
+        new_messages = conversation_history[self._reflected_upto:]
+        local = self.preclassifier.classify(new_messages) if self.preclassifier else None
+        if local is not None and not local.ambiguous:
+            reflection = self.reflection_agent.apply_signals(previous, local.issues, turn_count)
+            self.reflection_counts["local"] += 1
+            self._reflection_call = {"mode": "local", "issues": local.issues}
+        else:
+            if config.INCREMENTAL_REFLECTION and previous is not None:
+                reflection = await self.reflection_agent.aanalyze_delta(
+                    previous, new_messages, turn_count
+                )
+            else:
+                reflection = await self.reflection_agent.aanalyze(
+                    conversation_history, turn_count, on_routing_fields
+                )
+            self.reflection_counts["llm"] += 1
+            self._reflection_call = self.reflection_agent.last_call_stats
+        self.last_reflection = reflection
+        self._reflected_upto = len(conversation_history)
+        return reflection
+
+    def _finish_turn(self, conversation_history: list, turn_count: int, reflection,
+                     start_time: datetime.datetime):
+        """Queue this turn's trace; export and flushing happen in the background"""
+        self.trace_exporter.submit(
+            self._turn_trace(conversation_history, turn_count, reflection, start_time)
+        )
+
+    async def aprocess_turn_streaming(self, conversation_history: list, turn_count: int):
+        """
+        Async version of process_turn_streaming.
+
+        When the previous turn's reflection already leads to the router, the router
+        call starts alongside this turn's reflection and its chunks are buffered. They
+        are released only if the fresh reflection gives the router the same input;
+        otherwise the speculative call is cancelled and routing restarts.
+
+        The branch is chosen as soon as the reflection's routing fields have streamed,
+        so routing overlaps the rest of the reflection (its issue_details). Only the
+        final (is_complete) result carries the reflection; message chunks before it
+        have ``reflection`` set to None.
         """
-        # Analyze conversation
-        reflection = self.reflection_agent.analyze(conversation_history, turn_count)
-        
-        # Create trace for this turn
-        self._process_turn_with_trace(conversation_history, turn_count, reflection)
+        start_time = datetime.datetime.now(datetime.timezone.utc)
+        conversation_history = list(conversation_history)
+        speculative = self._start_speculation(conversation_history, turn_count)
+        routing_fields = asyncio.get_running_loop().create_future()
+
+        def on_routing_fields(provisional):
+            if not routing_fields.done():
+                routing_fields.set_result(provisional)
+
+        reflect_task = asyncio.ensure_future(
+            self._areflect(conversation_history, turn_count, on_routing_fields)
+        )
+        try:
+            await asyncio.wait({reflect_task, routing_fields}, return_when=asyncio.FIRST_COMPLETED)
+            if reflect_task.done():
+                reflection = reflect_task.result()
+            else:
+                reflection = routing_fields.result()
+
+            if self._should_route(reflection, turn_count):
+                if speculative and speculative.matches(reflection):
+                    chunks = speculative.stream()
+                else:
+                    if speculative:
+                        await speculative.cancel()
+                    chunks = self.router_agent.aroute_streaming(reflection, conversation_history)
+
+                async for chunk in chunks:
+                    yield {
+                        'reflection': None,
+                        'message_chunk': chunk,
+                        'is_complete': False,
+                        'is_closing': False,
+                        'should_confirm': False
+                    }
+
+                reflection = await reflect_task
+                self._finish_turn(conversation_history, turn_count, reflection, start_time)
+                yield {
+                    'reflection': reflection,
+                    'message_chunk': "",
+                    'is_complete': True,
+                    'is_closing': False,
+                    'should_confirm': False
+                }
+                return
+
+            if speculative:
+                await speculative.cancel()
+            reflection = await reflect_task
+        finally:
+            if speculative:
+                await speculative.cancel()
+            if not reflect_task.done():
+                reflect_task.cancel()
 
-        # Decide next action
         if turn_count >= config.MAX_TURNS:
             # Max turns reached - end conversation
             if reflection.confident_issues:
                 next_message = f"Here is what we think the most important issues are to you: {', '.join(reflection.confident_issues)}"
             else:
                 next_message = "We weren't able to identify specific issues from our conversation."
-            should_confirm = False
-            
-            # Yield the complete message
-            yield {
-                'reflection': reflection,
-                'message_chunk': next_message,
-                'is_complete': True,
-                'should_confirm': should_confirm
-            }
-            
-            # Flush traces
-            if self.opik_tracer:
-                self.opik_tracer.flush()
-                
-        elif reflection.is_confident and not reflection.uncertain_issues:
+        else:
             # Confident and no uncertain issues left - end conversation
             next_message = f"Based on our conversation, you care about: {', '.join(reflection.confident_issues)}. Thanks for sharing your thoughts!"
-            should_confirm = False
-            
-            # Yield the complete message
-            yield {
-                'reflection': reflection,
-                'message_chunk': next_message,
-                'is_complete': True,
-                'should_confirm': should_confirm
-            }
-            
-            # Flush traces
-            if self.opik_tracer:
-                self.opik_tracer.flush()
-        else:
-            # Continue conversation - stream the response
-            should_confirm = False
-            message_buffer = ""
-            
-            for chunk in self.router_agent.route_streaming(reflection, conversation_history):
-                message_buffer += chunk
-                yield {
-                    'reflection': reflection,
-                    'message_chunk': chunk,
-                    'is_complete': False,
-                    'should_confirm': should_confirm
-                }
-            
-            # Final yield to indicate completion
-            yield {
-                'reflection': reflection,
-                'message_chunk': "",
-                'is_complete': True,
-                'should_confirm': should_confirm
-            }
-        
-        # Flush traces to ensure they're sent to Opik
-        if self.opik_tracer:
-            self.opik_tracer.flush()
 
+        self._finish_turn(conversation_history, turn_count, reflection, start_time)
+        yield {
+            'reflection': reflection,
+            'message_chunk': next_message,
+            'is_complete': True,
+            'is_closing': True,
+            'should_confirm': False
+        }
+
+    def process_turn_streaming(self, conversation_history: list, turn_count: int):
+        """
+        Process one turn of the conversation with streaming.
+        Yields: {
+            'reflection': ReflectionOutput on the final result, otherwise None,
+            'message_chunk': str,
+            'is_complete': bool,
+            'is_closing': bool,  # final result whose message_chunk ends the conversation
+            'should_confirm': bool
+        }
+        """
+        loop = _background_loop()
+        agen = self.aprocess_turn_streaming(conversation_history, turn_count)
+        try:
+            while True:
+                try:
+                    yield asyncio.run_coroutine_threadsafe(agen.__anext__(), loop).result()
+                except StopAsyncIteration:
+                    break
+        finally:
+            asyncio.run_coroutine_threadsafe(agen.aclose(), loop).result()